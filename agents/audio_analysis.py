@@ -4,21 +4,103 @@ Inputs:
     - source_merged.mp4
 Outputs:
     - audio_analysis.json (classification, correlation, RMS delta)
-    - work/left.wav, work/right.wav (extracted channels)
+    - work/left_channel.npy, work/right_channel.npy (extracted 16kHz int16 channels)
 Dependencies:
     - ffmpeg (channel extraction), ffprobe (stream info), numpy
+    - av / PyAV (optional — in-process probe + decode instead of subprocesses)
+    - numba (optional — fused stats kernel; falls back to blocked numpy)
 Config:
     - processing.max_channel_correlation, processing.max_channel_rms_ratio_delta
 """
 
-import json
+import math
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import numpy as np
 
 from agents.base import BaseAgent
-from lib.ffprobe import probe as ffprobe
+from lib.ffprobe import probe_audio as ffprobe
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional — _accumulate_stats_numpy is used instead
+    njit = None
+
+_STATS_BLOCK = 1 << 20  # samples per block in the numpy fallback (~4 MB as float32)
+
+
+def _accumulate_stats_numpy(left: np.ndarray, right: np.ndarray) -> tuple:
+    """Single blocked pass over both channels returning (sx, sy, sxx, syy, sxy).
+
+    Each block is cast to float32 on its own, so temporaries stay cache-sized
+    instead of materialising full-length float copies of the channels.
+    """
+    sx = sy = sxx = syy = sxy = 0.0
+    for start in range(0, left.size, _STATS_BLOCK):
+        x = left[start:start + _STATS_BLOCK].astype(np.float32, copy=False)
+        y = right[start:start + _STATS_BLOCK].astype(np.float32, copy=False)
+        sx += float(x.sum(dtype=np.float64))
+        sy += float(y.sum(dtype=np.float64))
+        sxx += float(np.dot(x, x))
+        syy += float(np.dot(y, y))
+        sxy += float(np.dot(x, y))
+    return sx, sy, sxx, syy, sxy
+
+
+if njit is not None:
+    # Signatures are pinned so the kernel compiles at import rather than on
+    # first call; cache=True persists the machine code under __pycache__, so
+    # after one warm-up (see start.sh) later runs skip compilation entirely.
+    # int16 is the extracted-channel dtype; float32 covers callers passing floats.
+    @njit(
+        [
+            "UniTuple(f8, 5)(i2[:], i2[:])",
+            "UniTuple(f8, 5)(f4[:], f4[:])",
+        ],
+        parallel=True, fastmath=True, cache=True,
+    )
+    def _accumulate_stats_numba(left, right):
+        """Fused parallel version of _accumulate_stats_numpy — one read of each sample."""
+        sx = 0.0
+        sy = 0.0
+        sxx = 0.0
+        syy = 0.0
+        sxy = 0.0
+        for i in prange(left.size):
+            a = np.float64(left[i])
+            b = np.float64(right[i])
+            sx += a
+            sy += b
+            sxx += a * a
+            syy += b * b
+            sxy += a * b
+        return sx, sy, sxx, syy, sxy
+
+    _accumulate_stats = _accumulate_stats_numba
+else:
+    _accumulate_stats = _accumulate_stats_numpy
+
+
+def _first_two_channels(av, frame, channels: int):
+    """Keep channels 0 and 1 of a decoded frame as a stereo frame.
+
+    Mirrors the ffmpeg path's pan=stereo|c0=c0|c1=c1: the resampler would
+    otherwise downmix every channel of a >2-channel source into L/R.
+    """
+    samples = frame.to_ndarray()
+    if frame.format.is_planar:
+        samples = samples[:2]
+    else:
+        samples = samples.reshape(-1, channels)[:, :2].reshape(1, -1)
+    stereo = av.AudioFrame.from_ndarray(
+        np.ascontiguousarray(samples), format=frame.format.name, layout="stereo"
+    )
+    stereo.sample_rate = frame.sample_rate
+    stereo.pts = frame.pts
+    stereo.time_base = frame.time_base
+    return stereo
 
 
 class AudioAnalysisAgent(BaseAgent):
@@ -29,16 +111,22 @@ class AudioAnalysisAgent(BaseAgent):
         work_dir = self.episode_dir / "work"
         work_dir.mkdir(exist_ok=True)
 
-        # Get channel info via ffprobe
-        probe = ffprobe(merged_path)
-        audio_stream = next(
-            (s for s in probe["streams"] if s["codec_type"] == "audio"), None
-        )
-        if not audio_stream:
-            raise RuntimeError("No audio stream found in source_merged.mp4")
+        # Probe + decode in-process with PyAV when available (one pass, no
+        # subprocesses); otherwise ffprobe now and ffmpeg for the decode.
+        decoded = self._decode_pyav(merged_path)
+        if decoded is not None:
+            channels, sample_rate, channel_data = decoded
+        else:
+            probe = ffprobe(merged_path)
+            audio_stream = next(
+                (s for s in probe["streams"] if s["codec_type"] == "audio"), None
+            )
+            if not audio_stream:
+                raise RuntimeError("No audio stream found in source_merged.mp4")
 
-        channels = int(audio_stream.get("channels", 2))
-        sample_rate = int(audio_stream.get("sample_rate", 48000))
+            channels = int(audio_stream.get("channels", 2))
+            sample_rate = int(audio_stream.get("sample_rate", 48000))
+            channel_data = None
 
         self.logger.info(f"Audio: {channels} channels, {sample_rate} Hz")
 
@@ -53,27 +141,16 @@ class AudioAnalysisAgent(BaseAgent):
                 "rms_delta_db": 0.0,
             }
 
-        # Extract L and R channels to separate mono WAV files
-        left_wav = work_dir / "left.wav"
-        right_wav = work_dir / "right.wav"
-
-        self._extract_channels(merged_path, left_wav, right_wav)
-
-        # Load WAV data
-        left_data = self._load_wav(left_wav)
-        right_data = self._load_wav(right_wav)
+        # Otherwise decode L and R straight from ffmpeg's stdout (no temp files)
+        left_data, right_data = channel_data or self._extract_channels(merged_path)
 
         # Ensure same length
         min_len = min(len(left_data), len(right_data))
         left_data = left_data[:min_len]
         right_data = right_data[:min_len]
 
-        # Compute Pearson correlation (subsample for speed — still millions of samples)
-        correlation = float(np.corrcoef(left_data[::10], right_data[::10])[0, 1])
-
-        # Compute RMS delta
-        left_rms = float(np.sqrt(np.mean(left_data.astype(np.float64) ** 2)))
-        right_rms = float(np.sqrt(np.mean(right_data.astype(np.float64) ** 2)))
+        # Pearson correlation + per-channel RMS from one set of dot products
+        correlation, left_rms, right_rms = self._channel_stats(left_data, right_data)
 
         if right_rms > 0 and left_rms > 0:
             rms_delta_db = 20 * np.log10(left_rms / right_rms)
@@ -94,9 +171,15 @@ class AudioAnalysisAgent(BaseAgent):
             f"(corr={correlation:.4f}, rms_delta={rms_delta_db:.2f}dB)"
         )
 
-        # Save as .npy for speaker_cut (much faster than re-reading WAV)
-        np.save(str(work_dir / "left_channel.npy"), left_data)
-        np.save(str(work_dir / "right_channel.npy"), right_data)
+        # Save as .npy for speaker_cut — both writes run concurrently (np.save
+        # releases the GIL while writing the buffer)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            saves = [
+                pool.submit(np.save, str(work_dir / f"{name}_channel.npy"), data, allow_pickle=False)
+                for name, data in (("left", left_data), ("right", right_data))
+            ]
+            for future in saves:
+                future.result()
 
         return {
             "channels": channels,
@@ -108,19 +191,80 @@ class AudioAnalysisAgent(BaseAgent):
             "rms_delta_db": round(float(rms_delta_db), 2),
         }
 
-    def _extract_channels(self, input_path: Path, left_out: Path, right_out: Path):
-        """Extract L and R channels as raw s16le PCM, downsampled to 16kHz."""
+    def _extract_channels(self, input_path: Path) -> tuple[np.ndarray, np.ndarray]:
+        """Decode L and R channels as 16kHz int16 PCM in a single ffmpeg pass.
+
+        ffmpeg writes interleaved s16le stereo to stdout; the channels are
+        de-interleaved with strided views instead of round-tripping via disk.
+        """
         cmd = [
             "ffmpeg", "-y",
             "-i", str(input_path),
-            "-filter_complex", "channelsplit=channel_layout=stereo[L][R]",
-            "-map", "[L]", "-ar", "16000", "-f", "s16le", "-acodec", "pcm_s16le", str(left_out),
-            "-map", "[R]", "-ar", "16000", "-f", "s16le", "-acodec", "pcm_s16le", str(right_out),
+            "-vn", "-af", "pan=stereo|c0=c0|c1=c1",
+            "-ar", "16000", "-f", "s16le", "-acodec", "pcm_s16le", "-",
         ]
-        subprocess.run(cmd, capture_output=True, text=True, check=True)
+        r = subprocess.run(cmd, capture_output=True)
+        if r.returncode != 0:
+            raise RuntimeError(f"Channel extraction failed: {r.stderr.decode()[:300]}")
+        # Stay int16: half the bytes of float32 for every downstream pass and
+        # .npy write. Consumers that need floats convert per block/frame.
+        stereo = np.frombuffer(r.stdout, dtype=np.int16)
+        return stereo[0::2], stereo[1::2]
 
     @staticmethod
-    def _load_wav(path: Path) -> np.ndarray:
-        """Load raw PCM s16le data as float32 array."""
-        return np.frombuffer(path.read_bytes(), dtype=np.int16).astype(np.float32)
+    def _decode_pyav(input_path: Path):
+        """Probe and decode the first audio stream in-process with PyAV.
+
+        Returns (channels, sample_rate, (left, right)) with 16kHz int16
+        channels, or (channels, sample_rate, None) for a mono source without
+        decoding. Returns None when PyAV is not installed.
+        """
+        try:
+            import av
+        except ImportError:
+            return None
+
+        with av.open(str(input_path)) as container:
+            if not container.streams.audio:
+                raise RuntimeError("No audio stream found in source_merged.mp4")
+            stream = container.streams.audio[0]
+            channels = stream.codec_context.channels
+            sample_rate = stream.codec_context.sample_rate
+            if channels < 2:
+                return channels, sample_rate, None
+
+            resampler = av.AudioResampler(format="s16", layout="stereo", rate=16000)
+            chunks = []
+            for frame in container.decode(stream):
+                if channels > 2:
+                    frame = _first_two_channels(av, frame, channels)
+                chunks.extend(f.to_ndarray().reshape(-1) for f in resampler.resample(frame))
+            chunks.extend(f.to_ndarray().reshape(-1) for f in resampler.resample(None))
+
+        # Packed s16 stereo is interleaved L/R, same as ffmpeg's s16le stdout
+        stereo = np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int16)
+        return channels, sample_rate, (stereo[0::2], stereo[1::2])
+
+    @staticmethod
+    def _channel_stats(left: np.ndarray, right: np.ndarray) -> tuple[float, float, float]:
+        """Return (pearson_correlation, left_rms, right_rms) for two equal-length channels.
+
+        All five accumulators come from one streaming pass over both channels
+        (see _accumulate_stats), so no stacked 2xN copy like np.corrcoef.
+        """
+        n = left.size
+        if n == 0:
+            return 0.0, 0.0, 0.0
+
+        if left.dtype != np.int16 or right.dtype != np.int16:
+            # Match the kernel's pinned signatures (int16 or float32 pairs)
+            left = left.astype(np.float32, copy=False)
+            right = right.astype(np.float32, copy=False)
+        sx, sy, sxx, syy, sxy = _accumulate_stats(left, right)
+
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        denom = math.sqrt(var_x * var_y) if var_x > 0 and var_y > 0 else 0.0
+        correlation = (sxy - sx * sy / n) / denom if denom > 0 else 0.0
 
+        return correlation, math.sqrt(sxx / n), math.sqrt(syy / n)
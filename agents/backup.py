@@ -11,11 +11,24 @@ Config:
 """
 
 import os
+import re
 import subprocess
 from pathlib import Path
 
 from agents.base import BaseAgent
 
+# rsync --stats line, e.g. "Total file size: 1,234,567 bytes"
+_TOTAL_SIZE_RE = re.compile(r"^Total file size: ([\d,]+) bytes", re.MULTILINE)
+
+
+def _humanize(num_bytes: int) -> str:
+    """Format a byte count like `du -h` (e.g. 512B, 4.0K, 1.2G)."""
+    size = float(num_bytes)
+    for unit in ("B", "K", "M", "G", "T"):
+        if size < 1024 or unit == "T":
+            return "%dB" % size if unit == "B" else "%.1f%s" % (size, unit)
+        size /= 1024
+
 
 class BackupAgent(BaseAgent):
     name = "backup"
@@ -45,14 +58,15 @@ class BackupAgent(BaseAgent):
         dest = backup_root / episode_id
 
         # rsync the episode directory to the backup drive
-        # --archive preserves permissions/timestamps, --delete keeps them in sync
+        # --archive preserves permissions/timestamps, --delete keeps them in sync,
+        # --stats reports the synced tree size (saves a separate du walk)
         src = str(self.episode_dir).rstrip("/") + "/"
         dst = str(dest).rstrip("/") + "/"
 
         self.logger.info("Backing up %s -> %s" % (src, dst))
 
         cmd = [
-            "rsync", "-a", "--delete",
+            "rsync", "-a", "--delete", "--stats",
             "--exclude", "work/",
             src, dst,
         ]
@@ -62,10 +76,9 @@ class BackupAgent(BaseAgent):
         if result.returncode != 0:
             raise RuntimeError("rsync failed: %s" % result.stderr[-500:])
 
-        # Calculate backup size
-        du_cmd = ["du", "-sh", dst]
-        du_result = subprocess.run(du_cmd, capture_output=True, text=True)
-        backup_size = du_result.stdout.split()[0] if du_result.returncode == 0 else "unknown"
+        # Backup size straight from rsync's stats — no second tree walk
+        match = _TOTAL_SIZE_RE.search(result.stdout)
+        backup_size = _humanize(int(match.group(1).replace(",", ""))) if match else "unknown"
 
         self.logger.info("Backup complete: %s (%s)" % (dst, backup_size))
 
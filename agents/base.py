@@ -5,10 +5,11 @@ import logging
 import subprocess
 import time
 from abc import ABC, abstractmethod
+from collections import deque
 from pathlib import Path
 from typing import Optional
 
-from lib.atomic_write import atomic_write_json
+from lib.atomic_write import atomic_write_json, read_json
 
 logger = logging.getLogger("cascade")
 
@@ -26,6 +27,40 @@ def timed_ffmpeg(cmd: list, agent_logger=None, **kwargs) -> subprocess.Completed
     return result
 
 
+def stream_ffmpeg(
+    cmd: list, agent_logger=None, tail_lines: int = 40, on_progress=None
+) -> None:
+    """Run ffmpeg, streaming its stderr to the logger at DEBUG instead of
+    buffering it all in memory. Raises CalledProcessError with the last
+    `tail_lines` of stderr on a nonzero exit.
+
+    With `on_progress`, pass `-progress pipe:2` in cmd: each `out_time_us=`
+    line is handed to the callback as seconds of output encoded so far.
+    """
+    log = agent_logger or logger
+    tail = deque(maxlen=tail_lines)
+    start = time.time()
+    with subprocess.Popen(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, bufsize=1 << 20
+    ) as proc:
+        for raw in proc.stderr:
+            line = raw.decode("utf-8", errors="replace").rstrip()
+            if on_progress and line.startswith("out_time_us="):
+                try:
+                    on_progress(int(line[12:]) / 1e6)
+                except ValueError:  # "N/A" before the first frame
+                    pass
+                continue
+            if line:
+                tail.append(line)
+                log.debug(line)
+        returncode = proc.wait()
+    elapsed = time.time() - start
+    log.info(f"  {Path(cmd[0]).name} ({elapsed:.1f}s)")
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd, stderr="\n".join(tail))
+
+
 class BaseAgent(ABC):
     """Abstract base class for pipeline agents.
 
@@ -101,17 +136,13 @@ class BaseAgent(ABC):
             raise
 
         # Write agent output JSON
-        out_path = self.episode_dir / f"{self.name}.json"
-        with open(out_path, "w") as f:
-            json.dump(result, f, indent=2, default=str)
+        atomic_write_json(self.episode_dir / f"{self.name}.json", result)
 
         return result
 
     def load_json(self, filename: str) -> dict:
         """Load a JSON file from the episode directory."""
-        path = self.episode_dir / filename
-        with open(path) as f:
-            return json.load(f)
+        return read_json(self.episode_dir / filename)
 
     def load_json_safe(self, filename: str, default: dict | None = None) -> dict:
         """Load a JSON file, returning default (empty dict) on missing/invalid file."""
@@ -10,6 +10,7 @@ Dependencies:
     - anthropic SDK (Claude API)
 Config:
     - clip_mining.llm_model, clip_mining.llm_temperature
+    - clip_mining.use_batch_api, clip_mining.batch_poll_seconds
     - clip_mining.boundary_snap_tolerance_seconds
     - processing.clip_count, processing.clip_min_seconds, processing.clip_max_seconds
 Environment:
@@ -18,8 +19,12 @@ Environment:
 
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from agents.base import BaseAgent
+from lib.atomic_write import read_json
+from lib.llm import anthropic_client, parse_json_response
 
 
 class ClipMinerAgent(BaseAgent):
@@ -76,15 +81,18 @@ class ClipMinerAgent(BaseAgent):
         if not api_key:
             raise RuntimeError("ANTHROPIC_API_KEY not set in environment")
 
-        import anthropic
-
-        client = anthropic.Anthropic(api_key=api_key)
+        client = anthropic_client(api_key)
 
         model = self.get_config("clip_mining", "llm_model", default="claude-opus-4-6")
         temperature = self.get_config("clip_mining", "llm_temperature", default=0.3)
 
-        # Single combined API call for episode info + clip mining
-        prompt = f"""You are an expert podcast clip editor. Analyze this transcript and:
+        # Single combined API call for episode info + clip mining, laid out
+        # for Anthropic's prompt cache (prefix order: system, then messages):
+        #   1. instructions (system) — identical across episodes for a given
+        #      clip config, so consecutive episodes share the cached prefix
+        #   2. transcript — cached, so re-runs on the same episode hit
+        #   3. per-episode directive — small, uncached
+        instructions = f"""You are an expert podcast clip editor. You will be given a podcast transcript. Analyze it and:
 
 1. Extract guest/episode information from the opening
 2. Identify the {clip_count} best clips for short-form video (YouTube Shorts, TikTok, Instagram Reels)
@@ -97,11 +105,6 @@ Each clip should be {clip_min}-{clip_max} seconds long and should:
 
 CONTENT PRIORITY: This is a Bay Area / San Francisco local podcast. While you should always prioritize the most engaging and viral content first, ensure that at least 2-3 of the {clip_count} clips focus on Bay Area, San Francisco, Oakland, or local community themes when the conversation touches on those topics. Local-focused content helps build a dedicated regional audience.
 
-The total episode duration is {total_duration:.1f} seconds.
-
-TRANSCRIPT (with timestamps and speaker labels):
-{transcript_text}
-
 Return EXACTLY a JSON object with two keys:
 
 1. "episode_info": object with:
@@ -119,25 +122,52 @@ Return EXACTLY a JSON object with two keys:
    - "virality_score": number (1-10, how viral this clip could be)
 
 Return ONLY the JSON object, no other text."""
-
-        self.logger.info(f"Calling {model} for clip mining + episode info...")
-        response = client.messages.create(
-            model=model,
-            max_tokens=4096,
-            temperature=temperature,
-            messages=[{"role": "user", "content": prompt}],
+        transcript_block = f"""TRANSCRIPT (with timestamps and speaker labels):
+{transcript_text}"""
+        prompt = (
+            f"The total episode duration is {total_duration:.1f} seconds. "
+            "Analyze the transcript above and return the JSON object."
         )
 
-        # Parse response
-        response_text = response.content[0].text.strip()
-        # Handle markdown code blocks
-        if response_text.startswith("```"):
-            response_text = response_text.split("\n", 1)[1]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
+        self.logger.info(f"Calling {model} for clip mining + episode info...")
+        # Stream the response and load the RMS energy for boundary snapping
+        # on a worker thread meanwhile, overlapping disk I/O with generation.
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            energy_future = pool.submit(self._load_rms_energy)
+            params = {
+                "model": model,
+                "max_tokens": 4096,
+                "temperature": temperature,
+                "system": [
+                    {
+                        "type": "text",
+                        "text": instructions,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ],
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": transcript_block,
+                                "cache_control": {"type": "ephemeral"},
+                            },
+                            {"type": "text", "text": prompt},
+                        ],
+                    }
+                ],
+            }
+            if self.get_config("clip_mining", "use_batch_api", default=False):
+                response_text = self._run_batch(client, params)
+            else:
+                with client.messages.stream(**params) as stream:
+                    response_text = "".join(stream.text_stream)
+            energy = energy_future.result()
 
-        parsed = json.loads(response_text)
+        # Parse response, unwrapping a markdown code fence if present
+        parsed = parse_json_response(response_text)
 
         # Extract episode info
         episode_info = parsed.get(
@@ -151,30 +181,36 @@ Return ONLY the JSON object, no other text."""
         )
         self.save_json("episode_info.json", episode_info)
 
-        # Update episode.json with extracted info
+        # Update episode.json with extracted info (skip the rewrite if unchanged).
+        # The same fields are returned top-level so the pipeline can merge them
+        # into its in-memory episode (see EPISODE_MERGE_KEYS).
+        updates = {
+            "guest_name": episode_info.get("guest_name", ""),
+            "guest_title": episode_info.get("guest_title", ""),
+            "episode_name": episode_info.get("episode_title", ""),
+            "episode_description": episode_info.get("episode_description", ""),
+        }
         episode = self.load_json_safe("episode.json")
         if episode:
-            episode["guest_name"] = episode_info.get("guest_name", "")
-            episode["guest_title"] = episode_info.get("guest_title", "")
-            episode["episode_name"] = episode_info.get("episode_title", "")
-            episode["episode_description"] = episode_info.get("episode_description", "")
-            self.save_json("episode.json", episode)
+            changed = {k: v for k, v in updates.items() if episode.get(k) != v}
+            if changed:
+                episode.update(changed)
+                self.save_json("episode.json", episode)
 
         # Extract clips
         clips = parsed.get("clips", [])
 
         # Snap clip boundaries to silence
-        clips = self._snap_to_silence(clips, segments_data)
+        clips = self._snap_to_silence(clips, segments_data, energy=energy)
 
         # Determine dominant speaker per clip
         segments = segments_data.get("segments", [])
+        speakers = self._get_dominant_speakers(clips, segments)
         for i, clip in enumerate(clips):
             clip["id"] = f"clip_{i + 1:02d}"
             clip["rank"] = i + 1
             clip["duration"] = round(clip["end_seconds"] - clip["start_seconds"], 1)
-            clip["speaker"] = self._get_dominant_speaker(
-                clip["start_seconds"], clip["end_seconds"], segments
-            )
+            clip["speaker"] = speakers[i]
             clip["status"] = "pending"
             clip["manual"] = False
 
@@ -184,88 +220,207 @@ Return ONLY the JSON object, no other text."""
             "model_used": model,
         }
         self.save_json("clips.json", result)
-        return result
+        return {**result, **updates}
+
+    def _run_batch(self, client, params: dict) -> str:
+        """Submit params as a one-request Message Batches job and return its text.
+
+        Batches are billed at half price but may take minutes to complete, so
+        this is opt-in via clip_mining.use_batch_api.
+        """
+        poll = self.get_config("clip_mining", "batch_poll_seconds", default=10)
+        batch = client.messages.batches.create(
+            requests=[{"custom_id": "clip_mining", "params": params}]
+        )
+        self.logger.info(f"Submitted message batch {batch.id}, polling every {poll}s...")
+        while batch.processing_status != "ended":
+            time.sleep(poll)
+            batch = client.messages.batches.retrieve(batch.id)
+
+        for entry in client.messages.batches.results(batch.id):
+            if entry.custom_id != "clip_mining":
+                continue
+            if entry.result.type != "succeeded":
+                raise RuntimeError(f"Message batch {batch.id} request {entry.result.type}")
+            return "".join(
+                block.text for block in entry.result.message.content if block.type == "text"
+            )
+        raise RuntimeError(f"Message batch {batch.id} returned no result for clip_mining")
 
     def _format_transcript(self, diarized: dict) -> str:
-        lines = []
-        for utt in diarized.get("utterances", []):
-            speaker = utt.get("speaker", "?")
-            start = utt.get("start", 0)
-            end = utt.get("end", 0)
-            text = utt.get("text", "")
-            lines.append(f"[{start:.1f}s - {end:.1f}s] Speaker {speaker}: {text}")
-        return "\n".join(lines)
-
-    def _snap_to_silence(self, clips: list, segments_data: dict) -> list:
-        """Snap clip boundaries to nearest low-energy point."""
+        utts = diarized.get("utterances") or ()
+        # transcribe always writes all four keys, so index directly in one
+        # comprehension (a list, since join would build one from a generator
+        # anyway); hand-edited transcripts missing a key take the .get path.
+        try:
+            return "\n".join([
+                f"[{u['start']:.1f}s - {u['end']:.1f}s] Speaker {u['speaker']}: {u['text']}"
+                for u in utts
+            ])
+        except KeyError:
+            return "\n".join([
+                f"[{u.get('start', 0):.1f}s - {u.get('end', 0):.1f}s] "
+                f"Speaker {u.get('speaker', '?')}: {u.get('text', '')}"
+                for u in utts
+            ])
+
+    def _snap_to_silence(self, clips: list, segments_data: dict, energy=None) -> list:
+        """Snap clip boundaries to nearest low-energy point.
+
+        energy is an optional pre-loaded (combined, frame_seconds) pair from
+        _load_rms_energy(); it is loaded here when not supplied.
+        """
         tolerance = self.get_config(
             "clip_mining", "boundary_snap_tolerance_seconds", default=3.0
         )
 
         import numpy as np
 
-        # Try .npy format first (from optimized speaker_cut), fall back to JSON
-        left_npy = self.episode_dir / "work" / "left_rms_db.npy"
-        right_npy = self.episode_dir / "work" / "right_rms_db.npy"
-        meta_path = self.episode_dir / "work" / "rms_meta.json"
+        if energy is None:
+            energy = self._load_rms_energy()
+        if energy is None:
+            return clips
+        combined, frame_sec = energy
+
+        n_frames = len(combined)
+        if n_frames == 0 or not clips:
+            return clips
+
+        # Snap every boundary at once: one (boundaries x window) gather of the
+        # combined energy, padded with +inf past each window's end, then a
+        # single argmin along axis 1. Only the window frames are read.
+        keys = ("start_seconds", "end_seconds")
+        ts = np.array([clip[key] for clip in clips for key in keys], dtype=np.float64)
+        lo = np.clip(((ts - tolerance) / frame_sec).astype(np.int64), 0, n_frames)
+        hi = np.clip(((ts + tolerance) / frame_sec).astype(np.int64), 0, n_frames)
+        valid = lo < hi
+        if not valid.any():
+            return clips
+
+        width = int((hi - lo)[valid].max())
+        idx = lo[:, None] + np.arange(width)
+        in_window = idx < hi[:, None]
+        idx = np.minimum(idx, n_frames - 1)
+        window_energy = np.where(in_window, combined[idx], np.inf)
+        snapped = lo + window_energy.argmin(axis=1)
+
+        for i, clip in enumerate(clips):
+            for j, key in enumerate(keys):
+                k = 2 * i + j
+                if valid[k]:
+                    clip[key] = round(int(snapped[k]) * frame_sec, 2)
+
+        return clips
+
+    def _load_rms_energy(self):
+        """Load combined per-frame RMS energy for silence snapping.
+
+        Returns (combined, frame_seconds), or None when no RMS data exists.
+        """
+        import numpy as np
+
+        # Prefer speaker_cut's precomputed combined energy (.npy), then legacy
+        # per-channel .npy files, then legacy JSON
+        work = self.episode_dir / "work"
+        combined_npy = work / "combined_rms_db.npy"
+        left_npy = work / "left_rms_db.npy"
+        right_npy = work / "right_rms_db.npy"
+        meta_path = work / "rms_meta.json"
 
-        if left_npy.exists() and right_npy.exists() and meta_path.exists():
+        has_npy = combined_npy.exists() or (left_npy.exists() and right_npy.exists())
+        if has_npy and meta_path.exists():
             try:
-                left_rms = np.load(str(left_npy))
-                right_rms = np.load(str(right_npy))
-                with open(meta_path) as f:
-                    meta = json.load(f)
+                meta = read_json(meta_path)
                 frame_sec = meta.get("frame_seconds", 0.1)
+                if combined_npy.exists():
+                    # mmap: only the frames inside each snap window get paged in
+                    combined = np.load(str(combined_npy), mmap_mode="r")
+                else:
+                    left_rms = np.load(str(left_npy), mmap_mode="r")
+                    right_rms = np.load(str(right_npy), mmap_mode="r")
+                    n = min(len(left_rms), len(right_rms))
+                    combined = np.add(left_rms[:n], right_rms[:n], dtype=np.float32)
             except (OSError, ValueError):
-                return clips
+                return None
         else:
             # Fall back to legacy JSON format
-            rms_path = self.episode_dir / "work" / "rms_data.json"
+            rms_path = work / "rms_data.json"
             if not rms_path.exists():
-                return clips
+                return None
             try:
-                with open(rms_path) as f:
-                    rms_data = json.load(f)
+                rms_data = read_json(rms_path)
             except (json.JSONDecodeError, OSError):
-                return clips
+                return None
             frame_sec = rms_data.get("frame_seconds", 0.1)
             left_rms = np.array(rms_data.get("left_rms_db", []))
             right_rms = np.array(rms_data.get("right_rms_db", []))
+            n = min(len(left_rms), len(right_rms))
+            combined = np.add(left_rms[:n], right_rms[:n], dtype=np.float32)
 
-        if len(left_rms) == 0 or len(right_rms) == 0:
-            return clips
-
-        # Combined energy
-        combined = left_rms + right_rms
-
-        for clip in clips:
-            for key in ("start_seconds", "end_seconds"):
-                t = clip[key]
-                lo = max(0, int((t - tolerance) / frame_sec))
-                hi = min(len(combined), int((t + tolerance) / frame_sec))
-                if lo >= hi:
-                    continue
-                window = combined[lo:hi]
-                min_idx = lo + int(np.argmin(window))
-                clip[key] = round(min_idx * frame_sec, 2)
+            # Migrate to the binary layout speaker_cut writes, so later runs
+            # mmap the .npy instead of re-parsing two float lists from JSON
+            try:
+                np.save(str(combined_npy), combined.astype(np.float16), allow_pickle=False)
+                if not meta_path.exists():
+                    self.save_json("work/rms_meta.json", {"frame_seconds": frame_sec, "n_frames": n})
+            except OSError:
+                pass
 
-        return clips
+        return combined, frame_sec
 
     def _get_dominant_speaker(self, start: float, end: float, segments: list) -> str:
         """Determine dominant speaker for a time range from segments."""
-        speaker_time = {}
+        return self._get_dominant_speakers(
+            [{"start_seconds": start, "end_seconds": end}], segments
+        )[0]
+
+    def _get_dominant_speakers(self, clips: list, segments: list) -> list:
+        """Dominant speaker per clip, from one (clips x segments) overlap matrix.
+
+        Overlap seconds are summed per speaker with a one-hot matmul; a clip
+        with no overlapping segment gets "BOTH". Ties go to the speaker whose
+        first overlapping segment comes earliest within that clip.
+        """
+        if not clips:
+            return []
+        if not segments:
+            return ["BOTH"] * len(clips)
+
+        import numpy as np
+
+        seg_starts = np.fromiter((s["start"] for s in segments), dtype=np.float64, count=len(segments))
+        seg_ends = np.fromiter((s["end"] for s in segments), dtype=np.float64, count=len(segments))
+        # Speaker labels as-is, one column each
+        columns = {}
         for seg in segments:
-            seg_start = seg["start"]
-            seg_end = seg["end"]
-            overlap_start = max(start, seg_start)
-            overlap_end = min(end, seg_end)
-            if overlap_start < overlap_end:
-                speaker = seg["speaker"]
-                speaker_time[speaker] = speaker_time.get(speaker, 0) + (
-                    overlap_end - overlap_start
-                )
-
-        if not speaker_time:
-            return "BOTH"
-
-        return max(speaker_time, key=speaker_time.get)
+            columns.setdefault(seg["speaker"], len(columns))
+        labels = list(columns)
+        spk_idx = np.fromiter(
+            (columns[s["speaker"]] for s in segments), dtype=np.intp, count=len(segments)
+        )
+        onehot = (spk_idx[:, None] == np.arange(len(labels))).astype(np.float64)
+
+        starts = np.fromiter((c["start_seconds"] for c in clips), dtype=np.float64, count=len(clips))
+        ends = np.fromiter((c["end_seconds"] for c in clips), dtype=np.float64, count=len(clips))
+        overlap = np.maximum(
+            0.0,
+            np.minimum(ends[:, None], seg_ends[None, :])
+            - np.maximum(starts[:, None], seg_starts[None, :]),
+        )
+        per_speaker = overlap @ onehot
+
+        # Index of each speaker's first overlapping segment per clip (the
+        # tie-break); len(segments) where the speaker doesn't overlap
+        n_segs = len(segments)
+        seg_order = np.where(overlap > 0, np.arange(n_segs), n_segs)
+        first_overlap = np.stack(
+            [seg_order[:, spk_idx == k].min(axis=1) for k in range(len(labels))], axis=1
+        )
+        best = per_speaker.max(axis=1)
+        tied = per_speaker == best[:, None]
+        dominant = np.where(tied, first_overlap, n_segs).argmin(axis=1)
+        has_overlap = best > 0
+        return [
+            labels[d] if ok else "BOTH"
+            for d, ok in zip(dominant, has_overlap)
+        ]
@@ -6,36 +6,46 @@ Inputs:
 Outputs:
     - longform.mp4 (final 16:9 render with speaker crops + subtitles)
 Dependencies:
-    - ffmpeg (render + concat), ffprobe (dimensions + validation)
+    - ffmpeg (single filter_complex render), ffprobe (dimensions + validation)
 Config:
     - processing.video_crf, processing.audio_bitrate
 """
 
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-from agents.base import BaseAgent, timed_ffmpeg
+from agents.base import BaseAgent, stream_ffmpeg
 from lib.audio_mix import generate_audio_mix
 from lib.crop import compute_crop, resolve_speaker
 from lib.loudness import measure_loudness
 from lib.encoding import (
     get_video_encoder_args,
+    get_hwaccel_input_args,
     get_color_metadata_args,
     get_lut_filter,
     get_scale_filter,
     get_video_polish_filters,
 )
-from lib.ffprobe import probe as ffprobe
+from lib.ffprobe import probe_cached as ffprobe
 from lib.srt import fmt_timecode, escape_srt_path
+from lib.transcript_index import load_word_index, words_in_range
 
 
 class LongformRenderAgent(BaseAgent):
     name = "longform_render"
 
+    # libass force_style for burned-in captions
+    SUBTITLE_STYLE = (
+        "FontSize=14,FontName=Arial,Bold=1,"
+        "PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,"
+        "BackColour=&H80000000,BorderStyle=4,Outline=2,"
+        "Shadow=1,ShadowColour=&HA0000000,MarginV=30,"
+        "Alignment=2"
+    )
+
     def execute(self) -> dict:
         segments_data = self.load_json("segments.json")
-        diarized = self.load_json("diarized_transcript.json")
+        word_index = load_word_index(self.episode_dir)
         segments = segments_data["segments"]
 
         # Apply longform edits (cuts/trims) if present
@@ -114,121 +124,74 @@ class LongformRenderAgent(BaseAgent):
                 f"LUT enabled: {self.config['processing'].get('lut_path')}"
             )
 
-        # Pre-generate per-segment SRT files
-        self.logger.info("Generating per-segment subtitles...")
-        for i, seg in enumerate(segments):
-            srt_path = srt_dir / f"seg_{i:04d}.srt"
-            self._generate_segment_srt(diarized, seg["start"], seg["end"], srt_path)
-
-        # Render each segment with appropriate crop + subtitles
-        segment_files = []
-        self.logger.info(f"Rendering {len(segments)} segments with speaker crops...")
-
-        # Resume support: skip segments that are already rendered (non-zero size)
-        skipped = 0
-        to_render = []
-        for i, seg in enumerate(segments):
-            seg_path = work_dir / f"longform_seg_{i:04d}.mp4"
-            if seg_path.exists() and seg_path.stat().st_size > 0:
-                segment_files.append((i, seg_path))
-                skipped += 1
-            else:
-                to_render.append((i, seg))
-        if skipped:
-            self.logger.info(
-                f"Resuming: {skipped} segments already rendered, {len(to_render)} remaining"
-            )
+        # One subtitle file on the output timeline, burned in after concat
+        self.logger.info("Generating subtitles...")
+        srt_path = srt_dir / "longform.srt"
+        self._generate_timeline_srt(word_index, segments, srt_path)
 
-        with ThreadPoolExecutor(max_workers=min(os.cpu_count() // 2, 6)) as executor:
-            futures = {}
-            for i, seg in to_render:
-                seg_path = work_dir / f"longform_seg_{i:04d}.mp4"
-                srt_path = srt_dir / f"seg_{i:04d}.srt"
-                future = executor.submit(
-                    self._render_segment,
-                    merged_path,
-                    seg_path,
-                    seg,
-                    src_w,
-                    src_h,
-                    crop_config,
-                    srt_path,
-                    encoder_args,
-                    lut_filter,
-                    source_fps_int,
-                    out_w,
-                    out_h,
-                )
-                futures[future] = (i, seg_path)
-
-            for future in as_completed(futures):
-                i, seg_path = futures[future]
-                future.result()  # Raise any exception
-                segment_files.append((i, seg_path))
-                self.report_progress(
-                    len(segment_files), len(segments), f"Rendered segment {i}"
-                )
-                self.logger.info(f"  Segment {i} rendered")
-
-        # Sort by index
-        segment_files.sort(key=lambda x: x[0])
-
-        # Concat all segments
-        concat_list = work_dir / "longform_concat.txt"
-        with open(concat_list, "w") as f:
-            for _, seg_path in segment_files:
-                safe_path = str(seg_path).replace("'", "'\\''")
-                f.write(f"file '{safe_path}'\n")
-
-        output_path = self.episode_dir / "longform.mp4"
-        raw_concat = work_dir / "longform_raw.mp4"
-        self.logger.info("Concatenating segments into longform.mp4...")
-
-        # Step 1: Concat all segments (stream-copy, fast)
-        concat_cmd = [
-            "ffmpeg",
-            "-y",
-            "-f",
-            "concat",
-            "-safe",
-            "0",
-            "-i",
-            str(concat_list),
-            "-c",
-            "copy",
-            str(raw_concat),
-        ]
-        timed_ffmpeg(
-            concat_cmd,
-            agent_logger=self.logger,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-
-        # Step 2: Mux video with audio_mix.wav directly.
-        # Per-segment audio encoding is skipped entirely — each AAC segment
-        # adds ~21ms of padding (1024 samples at 48kHz) which accumulates
-        # to seconds of drift over hundreds of segments. Using audio_mix.wav
-        # as a single audio source eliminates this completely.
         audio_source = (
             audio_mix_path
             if (audio_mix_path and audio_mix_path.exists())
             else merged_path
         )
-        mux_cmd = [
+
+        # The graph's output is exactly the concatenated trims, so the
+        # duration follows from the segments — no need to re-probe the file
+        output_duration = sum(seg["end"] - seg["start"] for seg in segments)
+
+        if not segments:
+            raise ValueError(
+                "No segments to render: segments.json is empty or "
+                "longform_edits cut every segment."
+            )
+
+        # Render every segment in ONE ffmpeg process: a single demux/decode of
+        # the source feeds per-segment trim → crop/scale branches, which are
+        # concatenated and encoded once. Audio is trimmed from audio_mix.wav
+        # over contiguous spans inside the same graph — a single AAC encode,
+        # so there's no per-segment padding drift.
+        t0 = segments[0]["start"]
+        # Back-to-back segments with the same speaker share a crop, so they
+        # render as one trim branch instead of several
+        runs = self._coalesce_segments(segments)
+        filter_graph = self._build_filter_graph(
+            runs, src_w, src_h, crop_config, lut_filter, out_w, out_h, srt_path, t0
+        )
+        # Hundreds of segments exceed comfortable argv sizes — use a script file
+        filter_script = work_dir / "longform_filter.txt"
+        filter_script.write_text(filter_graph)
+
+        output_path = self.episode_dir / "longform.mp4"
+        cmd = [
             "ffmpeg",
             "-y",
+            "-nostats",
+            # Machine-readable progress on stderr, parsed by stream_ffmpeg
+            "-progress",
+            "pipe:2",
+            # One encode gets the whole machine; without this the graph's
+            # filters (lut3d, scale, libass) run on a single thread
+            "-filter_complex_threads",
+            str(os.cpu_count() or 4),
+            *get_hwaccel_input_args(self.config),
+            "-ss",
+            str(t0),
             "-i",
-            str(raw_concat),
+            str(merged_path),
+            "-ss",
+            str(t0),
             "-i",
             str(audio_source),
+            "-filter_complex_script",
+            str(filter_script),
             "-map",
-            "0:v",
+            "[vout]",
             "-map",
-            "1:a",
-            "-c:v",
-            "copy",
+            "[aout]",
+            *encoder_args,
+            *get_color_metadata_args(),
+            "-r",
+            str(source_fps_int),
             "-c:a",
             "aac",
             "-b:a",
@@ -240,26 +203,22 @@ class LongformRenderAgent(BaseAgent):
             "+faststart",
             str(output_path),
         ]
-        timed_ffmpeg(
-            mux_cmd,
-            agent_logger=self.logger,
-            capture_output=True,
-            text=True,
-            check=True,
+        self.logger.info(
+            f"Rendering {len(segments)} segments ({len(runs)} crop runs) with speaker crops..."
         )
-        raw_concat.unlink(missing_ok=True)
+        total = round(output_duration)
+        detail = f"Rendering {len(segments)} segments"
+        self.report_progress(0, total, detail)
+
+        def on_progress(out_time):
+            self.report_progress(min(round(out_time), total), total, detail)
 
-        # Clean up intermediate segment files (~400+ files, gigabytes)
-        for f in work_dir.glob("longform_seg_*.mp4"):
-            f.unlink(missing_ok=True)
-        for f in srt_dir.glob("seg_*.srt"):
-            f.unlink(missing_ok=True)
-        concat_list.unlink(missing_ok=True)
-        self.logger.info("Cleaned up intermediate segment files")
+        # No stdout; stderr streams to the DEBUG log, progress lines to the UI
+        stream_ffmpeg(cmd, agent_logger=self.logger, on_progress=on_progress)
+        self.report_progress(total, total, "Render complete")
 
-        # Validate
-        probe = ffprobe(output_path)
-        output_duration = float(probe["format"]["duration"])
+        filter_script.unlink(missing_ok=True)
+        srt_path.unlink(missing_ok=True)
 
         # Measure loudness of the final muxed file.
         # ebur128 on a 90-min file takes 30-60 seconds — run it here so the
@@ -292,94 +251,101 @@ class LongformRenderAgent(BaseAgent):
             result["audio_loudness"] = audio_loudness
         return result
 
-    def _render_segment(
+    @staticmethod
+    def _coalesce_segments(segments: list) -> list:
+        """Merge contiguous segments that share a speaker into single runs."""
+        runs = []
+        for seg in segments:
+            prev = runs[-1] if runs else None
+            if (
+                prev is not None
+                and prev["speaker"] == seg["speaker"]
+                and abs(seg["start"] - prev["end"]) < 1e-3
+            ):
+                prev["end"] = seg["end"]
+            else:
+                runs.append({"start": seg["start"], "end": seg["end"], "speaker": seg["speaker"]})
+        return runs
+
+    def _build_filter_graph(
         self,
-        source: Path,
-        output: Path,
-        segment: dict,
+        segments: list,
         src_w: int,
         src_h: int,
         crop_config: dict,
-        srt_path: Path = None,
-        encoder_args: list = None,
         lut_filter: str = "",
-        fps: int = 30,
         out_w: int = 1920,
         out_h: int = 1080,
-    ):
-        """Render a single video-only segment with speaker-appropriate crop and subtitles."""
-        start = segment["start"]
-        duration = segment["end"] - segment["start"]
-        speaker = segment["speaker"]
-
-        # Build video filter:
-        # LUT (10-bit) → crop → scale (lanczos+dither) → format=yuv420p →
-        # hqdn3d (denoise) → cas (sharpen) → eq (polish) → subtitles
-        #
-        # LUT runs at source bit depth for accurate color math, then dither to
-        # 8-bit during scale, then polish, then burn subtitles last so they
-        # aren't affected by sharpening/grading.
-        vf_parts = []
-        if lut_filter:
-            vf_parts.append(lut_filter)
-        vf_parts.append(
-            self._get_crop_filter(speaker, src_w, src_h, crop_config, out_w, out_h)
-        )
-        vf_parts.append("format=yuv420p")
+        srt_path: Path | None = None,
+        t0: float = 0.0,
+    ) -> str:
+        """Build the filter_complex graph that renders all segments in one pass.
+
+        Input 0 is the source video and input 1 the audio source, both seeked
+        to t0. The LUT (10-bit) runs once on the source before split, so
+        there's a single lut3d instance and table. Per-segment branch: trim →
+        crop → scale (lanczos+dither). After concat: format=yuv420p → polish → subtitles,
+        so captions aren't affected by sharpening/grading.
+        """
+        n = len(segments)
+        # Only a handful of distinct speakers across hundreds of segments —
+        # build each speaker's crop/scale tail once.
+        tails = {}
+        lut = f"{lut_filter}," if lut_filter else ""
+        parts = [f"[0:v]{lut}split={n}" + "".join(f"[s{i}]" for i in range(n))]
+        for i, seg in enumerate(segments):
+            speaker = seg["speaker"]
+            tail = tails.get(speaker)
+            if tail is None:
+                tail = tails[speaker] = self._get_crop_filter(
+                    speaker, src_w, src_h, crop_config, out_w, out_h
+                )
+            parts.append(
+                f"[s{i}]trim=start={seg['start'] - t0:.6f}:end={seg['end'] - t0:.6f},"
+                f"setpts=PTS-STARTPTS,{tail}[v{i}]"
+            )
+
+        post = ["format=yuv420p"]
         polish = get_video_polish_filters(self.config)
         if polish:
-            vf_parts.append(polish)
-        vf = ",".join(vf_parts)
-
-        # Append subtitle burn-in if SRT has content
+            post.append(polish)
         if srt_path and srt_path.exists() and srt_path.stat().st_size > 0:
             srt_escaped = escape_srt_path(srt_path)
-            vf += (
-                f",subtitles='{srt_escaped}':force_style="
-                f"'FontSize=14,FontName=Arial,Bold=1,"
-                f"PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,"
-                f"BackColour=&H80000000,BorderStyle=4,Outline=2,"
-                f"Shadow=1,ShadowColour=&HA0000000,MarginV=30,"
-                f"Alignment=2'"
-            )
-
-        # Render VIDEO ONLY — no per-segment audio encoding.
-        # Audio is muxed once at the end from audio_mix.wav to avoid
-        # AAC frame padding accumulation (21ms per segment = seconds of drift).
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-ss",
-            str(start),
-            "-i",
-            str(source),
-            "-t",
-            str(duration),
-            "-an",  # no audio
-            "-vf",
-            vf,
-            *encoder_args,
-            *get_color_metadata_args(),
-            "-r",
-            str(fps),
-            "-g",
-            str(fps),
-            "-bf",
-            "0",
-            "-vsync",
-            "cfr",
-            "-video_track_timescale",
-            str(fps * 1000),
-            "-use_editlist",
-            "0",
-            "-movflags",
-            "+faststart",
-            str(output),
-        ]
-        timed_ffmpeg(
-            cmd, agent_logger=self.logger, capture_output=True, text=True, check=True
+            post.append(f"subtitles='{srt_escaped}':force_style='{self.SUBTITLE_STYLE}'")
+        parts.append(
+            "".join(f"[v{i}]" for i in range(n))
+            + f"concat=n={n}:v=1:a=0,"
+            + ",".join(post)
+            + "[vout]"
         )
 
+        # Audio: merge back-to-back segments into spans so an unedited episode
+        # is a single atrim; only cuts introduce extra branches.
+        spans = []
+        for seg in segments:
+            if spans and abs(seg["start"] - spans[-1][1]) < 1e-3:
+                spans[-1][1] = seg["end"]
+            else:
+                spans.append([seg["start"], seg["end"]])
+        if len(spans) == 1:
+            a_start, a_end = spans[0]
+            parts.append(
+                f"[1:a]atrim=start={a_start - t0:.6f}:end={a_end - t0:.6f},"
+                "asetpts=PTS-STARTPTS[aout]"
+            )
+        else:
+            m = len(spans)
+            parts.append(f"[1:a]asplit={m}" + "".join(f"[as{j}]" for j in range(m)))
+            for j, (a_start, a_end) in enumerate(spans):
+                parts.append(
+                    f"[as{j}]atrim=start={a_start - t0:.6f}:end={a_end - t0:.6f},"
+                    f"asetpts=PTS-STARTPTS[a{j}]"
+                )
+            parts.append(
+                "".join(f"[a{j}]" for j in range(m)) + f"concat=n={m}:v=0:a=1[aout]"
+            )
+        return ";\n".join(parts)
+
     def _get_crop_filter(
         self, speaker, src_w, src_h, crop_config, out_w=1920, out_h=1080
     ):
@@ -393,38 +359,42 @@ class LongformRenderAgent(BaseAgent):
         x, y, crop_w, crop_h = compute_crop(src_w, src_h, cx, cy, zoom, mode)
         return f"crop={crop_w}:{crop_h}:{x}:{y},{scale}"
 
-    def _generate_segment_srt(self, diarized, start, end, srt_path):
-        """Generate an SRT file for a segment, with times offset to segment-relative."""
-        words = []
-        last_end = -1.0
-        for utt in diarized.get("utterances", []):
-            for w in utt.get("words", []):
-                w_start = w.get("start", 0)
-                w_end = w.get("end", 0)
-                if w_start >= start and w_end <= end:
-                    # Skip overlapping words from other channels (multichannel bleed)
-                    if w_start < last_end - 0.05:
-                        continue
-                    words.append(w)
-                    last_end = w_end
-
-        srt_lines = []
-        idx = 1
-        i = 0
-        while i < len(words):
-            chunk = words[i : i + 4]
-            t_start = chunk[0]["start"] - start
-            t_end = chunk[-1]["end"] - start
-            text = " ".join(w.get("word", "") for w in chunk)
-
-            srt_lines.append(
-                f"{idx}\n{fmt_timecode(t_start)} --> {fmt_timecode(t_end)}\n{text}\n"
-            )
-            idx += 1
-            i += 4
-
-        with open(srt_path, "w") as f:
-            f.write("\n".join(srt_lines))
+    def _generate_timeline_srt(self, index, segments, srt_path):
+        """Generate one SRT for the rendered output, mapping each segment's words
+        from source time onto the concatenated timeline."""
+        def cues():
+            idx = 1
+            offset = 0.0
+            for seg in segments:
+                start, end = seg["start"], seg["end"]
+                for t_start, t_end, text in self._segment_cues(index, start, end):
+                    # Blank line *before* every cue but the first == "\n".join
+                    sep = "\n" if idx > 1 else ""
+                    yield (
+                        f"{sep}{idx}\n{fmt_timecode(t_start + offset)} --> "
+                        f"{fmt_timecode(t_end + offset)}\n{text}\n"
+                    ).encode("utf-8")
+                    idx += 1
+                offset += end - start
+
+        # Binary mode: no newline translation, cues stream straight to disk
+        with open(srt_path, "wb") as f:
+            f.writelines(cues())
+
+    def _segment_cues(self, index, start, end):
+        """Caption cues for one segment as (start, end, text), segment-relative,
+        four words per cue."""
+        starts, ends, texts = index
+        keep = words_in_range(index, start, end)
+        cues = []
+        for k in range(0, len(keep), 4):
+            chunk = keep[k : k + 4]
+            cues.append((
+                float(starts[chunk[0]]) - start,
+                float(ends[chunk[-1]]) - start,
+                " ".join(texts[i] for i in chunk),
+            ))
+        return cues
 
     def _apply_edits(self, segments: list, edits: list) -> list:
         """Apply longform edits (cuts/trims) to the segment list.
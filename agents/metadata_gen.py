@@ -12,10 +12,13 @@ Environment:
     - ANTHROPIC_API_KEY
 """
 
+import bisect
+import itertools
 import json
 import os
 
 from agents.base import BaseAgent
+from lib.llm import anthropic_client, parse_json_response
 
 
 class MetadataGenAgent(BaseAgent):
@@ -79,19 +82,18 @@ class MetadataGenAgent(BaseAgent):
         if not api_key:
             raise RuntimeError("ANTHROPIC_API_KEY not set in environment")
 
-        import anthropic
-
-        client = anthropic.Anthropic(api_key=api_key)
+        client = anthropic_client(api_key)
         model = self.get_config(
             "clip_mining", "metadata_model", default="claude-sonnet-4-20250514"
         )
 
         # Build context: clips + transcript excerpts
+        utt_index = self._utterance_index(diarized)
         clip_summaries = []
         for clip in clips:
             # Get transcript excerpt for this clip
             excerpt = self._get_excerpt(
-                diarized, clip["start_seconds"], clip["end_seconds"]
+                diarized, clip["start_seconds"], clip["end_seconds"], index=utt_index
             )
             clip_summaries.append(
                 {
@@ -100,7 +102,7 @@ class MetadataGenAgent(BaseAgent):
                     "hook_text": clip["hook_text"],
                     "duration": clip["duration"],
                     "virality_score": clip["virality_score"],
-                    "transcript_excerpt": excerpt[:500],
+                    "transcript_excerpt": self._trim_excerpt(excerpt),
                 }
             )
 
@@ -144,8 +146,11 @@ IMPORTANT RULES:
 {f"- Threads and Bluesky should include the YouTube link: {youtube_longform_url}" if youtube_longform_url else ""}
 """
 
-        prompt = f"""You are a social media strategist for a podcast. Generate metadata for these clips and the longform episode.
-{guest_context}
+        # Static instructions go in a cached system block (stable across
+        # episodes for a given podcast config); only the episode context and
+        # clip list vary per call.
+        instructions = f"""You are a social media strategist for a podcast. Generate metadata for the clips and the longform episode described in the user message, following its EPISODE CONTEXT rules.
+
 PLATFORM AUDIENCE GUIDANCE — each platform MUST have unique, tailored content:
 - YouTube Shorts: Searchable titles with keywords. Include "Full episode on {channel_handle}".
 - TikTok: Casual, trend-aware. Hook in first line. Mix trending + niche hashtags. Include link-in-bio CTA.
@@ -161,13 +166,10 @@ CRITICAL: Do NOT copy the same text across platforms. Each must feel native to t
 
 LOCAL CONTENT: This is a Bay Area / San Francisco local podcast. When clips touch on Bay Area themes (neighborhoods, culture, community, local issues), lean into local hashtags and references (#BayArea, #SanFrancisco, #Oakland, #local) to build regional audience.
 
-CLIPS:
-{json.dumps(clip_summaries, indent=2)}
-
 Generate a JSON object with these sections:
 
 1. "longform": object with:
-   - "title": YouTube episode title (max 100 chars{f', format: "{guest_name} | {podcast_title}"' if guest_name else ""})
+   - "title": YouTube episode title (max 100 chars, in the format required by the episode rules if one is given)
    - "description": YouTube description (2-3 paragraphs, include timestamps, call to action)
    - "tags": array of 10-15 relevant tags
 
@@ -193,11 +195,23 @@ Schedule rules: 1 clip/day Mon-Thu, 2 clips/day Fri-Sun. Stagger platforms. Prio
 
 Return ONLY the JSON object, no other text."""
 
+        # Compact separators: indent=2 roughly doubles the clip list's tokens
+        prompt = f"""{guest_context}
+CLIPS:
+{json.dumps(clip_summaries, separators=(",", ":"))}"""
+
         self.logger.info("Generating metadata via Claude...")
         response = client.messages.create(
             model=model,
             max_tokens=16384,
             temperature=0.4,
+            system=[
+                {
+                    "type": "text",
+                    "text": instructions,
+                    "cache_control": {"type": "ephemeral"},
+                }
+            ],
             messages=[{"role": "user", "content": prompt}],
         )
 
@@ -207,14 +221,7 @@ Return ONLY the JSON object, no other text."""
                 f"Used {response.usage.output_tokens} output tokens."
             )
 
-        response_text = response.content[0].text.strip()
-        if response_text.startswith("```"):
-            response_text = response_text.split("\n", 1)[1]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-
-        metadata = json.loads(response_text)
+        metadata = parse_json_response(response.content[0].text)
 
         # Save metadata
         metadata_dir = self.episode_dir / "metadata"
@@ -236,11 +243,7 @@ Return ONLY the JSON object, no other text."""
 
     def _write_longform_to_episode(self, metadata: dict, episode_info: dict):
         """Copy longform title/description/tags and guest info into episode.json."""
-        episode_file = self.episode_dir / "episode.json"
-        episode_data = {}
-        if episode_file.exists():
-            with open(episode_file) as f:
-                episode_data = json.load(f)
+        episode_data = self.load_json_safe("episode.json")
 
         longform = metadata.get("longform", {})
         if longform.get("title"):
@@ -261,8 +264,7 @@ Return ONLY the JSON object, no other text."""
             if val and not episode_data.get(field):
                 episode_data[field] = val
 
-        with open(episode_file, "w") as f:
-            json.dump(episode_data, f, indent=2)
+        self.save_json("episode.json", episode_data)
 
         self.logger.info(
             "Wrote longform metadata to episode.json: title=%s",
@@ -275,8 +277,7 @@ Return ONLY the JSON object, no other text."""
         if not clips_file.exists():
             return
 
-        with open(clips_file) as f:
-            clips_data = json.load(f)
+        clips_data = self.load_json("clips.json")
         clips = (
             clips_data.get("clips", clips_data)
             if isinstance(clips_data, dict)
@@ -308,18 +309,36 @@ Return ONLY the JSON object, no other text."""
                     clip_meta[platform] = mc[platform]
             clip["metadata"] = clip_meta
 
-        with open(clips_file, "w") as f:
-            json.dump({"clips": clips}, f, indent=2)
+        self.save_json("clips.json", {"clips": clips})
 
         self.logger.info(
             "Synced platform metadata into clips.json for %d clips", len(meta_clips)
         )
 
-    def _get_excerpt(self, diarized: dict, start: float, end: float) -> str:
-        lines = []
-        for utt in diarized.get("utterances", []):
-            utt_start = utt.get("start", 0)
-            utt_end = utt.get("end", 0)
-            if utt_end > start and utt_start < end:
-                lines.append(utt.get("text", ""))
-        return " ".join(lines)
+    @staticmethod
+    def _trim_excerpt(excerpt: str, keep: int = 150) -> str:
+        """Keep the hook (start) and payoff (end) of a long excerpt."""
+        if len(excerpt) <= 2 * keep:
+            return excerpt
+        return f"{excerpt[:keep]} ... {excerpt[-keep:]}"
+
+    @staticmethod
+    def _utterance_index(diarized: dict) -> tuple:
+        """Sort utterances by start once for bisection in _get_excerpt.
+
+        Returns (utts, starts, reach) where reach[i] is the latest end among
+        utts[:i + 1] — monotone even when multichannel utterances overlap, so
+        everything before bisect_right(reach, t) ends at or before t.
+        """
+        utts = sorted(diarized.get("utterances", []), key=lambda u: u.get("start", 0))
+        starts = [u.get("start", 0) for u in utts]
+        reach = list(itertools.accumulate((u.get("end", 0) for u in utts), max))
+        return utts, starts, reach
+
+    def _get_excerpt(self, diarized: dict, start: float, end: float, index=None) -> str:
+        utts, starts, reach = index or self._utterance_index(diarized)
+        lo = bisect.bisect_right(reach, start)
+        hi = bisect.bisect_left(starts, end)
+        return " ".join(
+            utt.get("text", "") for utt in utts[lo:hi] if utt.get("end", 0) > start
+        )
@@ -1,15 +1,20 @@
 """Pipeline orchestrator — DAG-based parallel agent execution, updates episode.json."""
 
+import copy
+import functools
+import hashlib
 import json
 import logging
 import re
 import threading
+import tomllib
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime, timezone
 from pathlib import Path
 
 from agents import AGENT_REGISTRY, PIPELINE_ORDER
-from lib.atomic_write import atomic_write_json
+from lib.atomic_write import atomic_write_bytes, dumps_json, read_json
 from lib.paths import resolve_path
 
 logger = logging.getLogger("cascade")
@@ -34,16 +39,30 @@ AGENT_DEPS = {
 
 NON_CRITICAL_AGENTS = {"podcast_feed", "publish", "backup", "thumbnail_gen"}
 
+# Top-level result keys an agent may return to have merged straight into
+# episode.json (clip_miner's extracted guest/episode info).
+EPISODE_MERGE_KEYS = ("guest_name", "guest_title", "episode_name", "episode_description")
 
-def load_config() -> dict:
-    """Load config.toml from project root."""
-    config_path = Path(__file__).resolve().parent.parent / "config" / "config.toml"
-    import tomllib
 
-    with open(config_path, "rb") as f:
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "config" / "config.toml"
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_config(path: str, mtime_ns: int, size: int) -> dict:
+    with open(path, "rb") as f:
         return tomllib.load(f)
 
 
+def load_config() -> dict:
+    """Load config.toml from project root.
+
+    Parsed once per (mtime, size); edits to the file are picked up on the
+    next call. Returns a copy so callers can't mutate the cached dict.
+    """
+    st = CONFIG_PATH.stat()
+    return copy.deepcopy(_parse_config(str(CONFIG_PATH), st.st_mtime_ns, st.st_size))
+
+
 def run_pipeline(
     source_path: str,
     audio_path: str = None,
@@ -68,10 +87,11 @@ def run_pipeline(
     output_dir = resolve_path(config["paths"]["output_dir"], "episodes")
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Create or load episode
+    # Create or load episode. One timestamp serves the generated id,
+    # created_at and started_at so they always agree.
+    now = datetime.now(timezone.utc)
     if episode_id is None:
-        now = datetime.now(timezone.utc)
-        episode_id = f"ep_{now.strftime('%Y-%m-%d')}_{now.strftime('%H%M%S')}"
+        episode_id = now.strftime("ep_%Y-%m-%d_%H%M%S")
 
     episode_dir = output_dir / episode_id
     episode_dir.mkdir(parents=True, exist_ok=True)
@@ -82,8 +102,7 @@ def run_pipeline(
 
     episode_file = episode_dir / "episode.json"
     if episode_file.exists():
-        with open(episode_file) as f:
-            episode = json.load(f)
+        episode = read_json(episode_file)
     else:
         episode = {
             "episode_id": episode_id,
@@ -93,10 +112,10 @@ def run_pipeline(
             "audio_path": audio_path,
             "speaker_count": speaker_count,
             "duration_seconds": None,
-            "created_at": datetime.now(timezone.utc).isoformat(),
+            "created_at": now.isoformat(),
             "clips": [],
             "pipeline": {
-                "started_at": datetime.now(timezone.utc).isoformat(),
+                "started_at": now.isoformat(),
                 "completed_at": None,
                 "agents_completed": [],
             },
@@ -117,14 +136,14 @@ def run_pipeline(
     # Save initial episode state
     _save_episode(episode_file, episode)
 
-    logger.info(f"Pipeline: running {len(agent_names)} agents for {episode_id}")
+    logger.info("Pipeline: running %d agents for %s", len(agent_names), episode_id)
 
     # Build dependency graph filtered to requested agents
     requested_set = set(agent_names)
     deps = {}
     for name in agent_names:
         if name not in AGENT_REGISTRY:
-            logger.warning(f"Unknown agent: {name}, skipping")
+            logger.warning("Unknown agent: %s, skipping", name)
             continue
         # Only include dependencies that are also in the requested set
         deps[name] = AGENT_DEPS.get(name, set()) & requested_set
@@ -140,19 +159,28 @@ def run_pipeline(
         "episode_file": episode_file,
     }
 
-    def _get_ready():
-        """Return agents whose dependencies are all satisfied."""
-        return [
-            name
-            for name in deps
-            if name not in completed and name not in failed and deps[name] <= completed
-        ]
+    # Kahn's algorithm: count unmet dependencies per agent and queue each one
+    # as its count reaches zero, instead of rescanning the graph every loop.
+    dependents = {name: [] for name in deps}
+    for name, needs in deps.items():
+        for dep in needs:
+            if dep in dependents:
+                dependents[dep].append(name)
+    unmet = {name: len(needs) for name, needs in deps.items()}
+    ready = deque(name for name in deps if unmet[name] == 0)
+
+    def _mark_completed(agent_name):
+        """Record completion and queue dependents whose deps are now all met."""
+        completed.add(agent_name)
+        for name in dependents[agent_name]:
+            unmet[name] -= 1
+            if unmet[name] == 0:
+                ready.append(name)
 
     def _run_agent(agent_name):
         """Execute a single agent and return (name, result_or_exception)."""
         with episode_lock:
             ed = mutable["episode_dir"]
-            ef = mutable["episode_file"]
 
         agent_cls = AGENT_REGISTRY[agent_name]
         agent = agent_cls(ed, config)
@@ -161,10 +189,6 @@ def run_pipeline(
             agent.source_path = source_path
             agent.audio_path = audio_path or episode.get("audio_path")
 
-        with episode_lock:
-            episode["pipeline"]["current_agent"] = agent_name
-            _save_episode(ef, episode)
-
         result = agent.run()
         return result
 
@@ -208,6 +232,7 @@ def run_pipeline(
                 episode["source_properties"] = result["source_properties"]
             if "audio_loudness" in result:
                 episode["audio_loudness"] = result["audio_loudness"]
+            episode.update({k: result[k] for k in EPISODE_MERGE_KEYS if k in result})
             _save_episode(mutable["episode_file"], episode)
 
         # After stitch, remove source/ directory to reclaim ~20GB
@@ -219,29 +244,13 @@ def run_pipeline(
 
                 try:
                     shutil.rmtree(source_dir)
-                    logger.info(f"Cleaned up source/ directory after stitch")
+                    logger.info("Cleaned up source/ directory after stitch")
                 except OSError as e:
-                    logger.warning(f"Failed to clean source/ directory: {e}")
+                    logger.warning("Failed to clean source/ directory: %s", e)
 
         # After clip_miner, rename episode dir if guest_name was extracted
         if agent_name == "clip_miner":
             with episode_lock:
-                ef = mutable["episode_file"]
-                with open(ef) as f:
-                    ep_data = json.load(f)
-                # Merge any updates clip_miner wrote directly
-                episode.update(
-                    {
-                        k: ep_data[k]
-                        for k in (
-                            "guest_name",
-                            "guest_title",
-                            "episode_name",
-                            "episode_description",
-                        )
-                        if k in ep_data
-                    }
-                )
                 guest_name = episode.get("guest_name", "")
                 if guest_name and not _has_name_slug(mutable["episode_id"]):
                     slug = _slugify(guest_name)
@@ -266,9 +275,9 @@ def run_pipeline(
                                 pass
 
                         _save_episode(mutable["episode_file"], episode)
-                        logger.info(f"Renamed episode dir to {new_id}")
+                        logger.info("Renamed episode dir to %s", new_id)
                     except OSError as e:
-                        logger.warning(f"Failed to rename episode dir: {e}")
+                        logger.warning("Failed to rename episode dir: %s", e)
 
     # --- DAG execution loop ---
     # Special handling: pause for crop setup if crop_config isn't set and we're about
@@ -298,7 +307,7 @@ def run_pipeline(
         while len(completed) + len(failed) < len(deps):
             # Check cancellation
             if _is_cancelled(mutable["episode_id"]):
-                logger.info(f"Pipeline cancelled for {mutable['episode_id']}")
+                logger.info("Pipeline cancelled for %s", mutable["episode_id"])
                 # Cancel pending futures
                 for f in pending_futures:
                     f.cancel()
@@ -308,22 +317,21 @@ def run_pipeline(
                 return episode
 
             # Submit ready agents that aren't already running
-            running_names = set(pending_futures.values())
-            for name in _get_ready():
-                if name in running_names:
-                    continue
+            submitted = None
+            while ready:
+                name = ready.popleft()
                 # If crop setup needed, pause before running crop-dependent agents
                 if stitch_pause_needed and name in crop_dependent_agents:
                     # Check if crop_config has been set since we started
                     with episode_lock:
-                        with open(mutable["episode_file"]) as f:
-                            ep_check = json.load(f)
+                        ep_check = read_json(mutable["episode_file"])
                         if "crop_config" not in ep_check:
                             episode["status"] = "awaiting_crop_setup"
                             episode["pipeline"].pop("current_agent", None)
                             _save_episode(mutable["episode_file"], episode)
                             logger.info(
-                                f"Pipeline paused for {mutable['episode_id']}: awaiting crop setup"
+                                "Pipeline paused for %s: awaiting crop setup",
+                                mutable["episode_id"],
                             )
                             # Cancel any pending futures
                             for fut in pending_futures:
@@ -341,14 +349,14 @@ def run_pipeline(
                     and "longform_render" in completed
                 ):
                     with episode_lock:
-                        with open(mutable["episode_file"]) as f:
-                            ep_check = json.load(f)
+                        ep_check = read_json(mutable["episode_file"])
                         if not ep_check.get("longform_approved"):
                             episode["status"] = "awaiting_longform_approval"
                             episode["pipeline"].pop("current_agent", None)
                             _save_episode(mutable["episode_file"], episode)
                             logger.info(
-                                f"Pipeline paused for {mutable['episode_id']}: awaiting longform approval"
+                                "Pipeline paused for %s: awaiting longform approval",
+                                mutable["episode_id"],
                             )
                             for fut in pending_futures:
                                 fut.cancel()
@@ -360,14 +368,14 @@ def run_pipeline(
                 # If backup is ready but not approved, pause for user confirmation
                 if backup_pause_needed and name == "backup":
                     with episode_lock:
-                        with open(mutable["episode_file"]) as f:
-                            ep_check = json.load(f)
+                        ep_check = read_json(mutable["episode_file"])
                         if not ep_check.get("backup_approved"):
                             episode["status"] = "awaiting_backup_approval"
                             episode["pipeline"].pop("current_agent", None)
                             _save_episode(mutable["episode_file"], episode)
                             logger.info(
-                                f"Pipeline paused for {mutable['episode_id']}: awaiting backup approval"
+                                "Pipeline paused for %s: awaiting backup approval",
+                                mutable["episode_id"],
                             )
                             for fut in pending_futures:
                                 fut.cancel()
@@ -378,6 +386,15 @@ def run_pipeline(
 
                 future = executor.submit(_run_agent, name)
                 pending_futures[future] = name
+                submitted = name
+
+            # One write per batch of submissions: agents that become ready
+            # together (e.g. after stitch) would otherwise each rewrite
+            # episode.json just to update current_agent.
+            if submitted:
+                with episode_lock:
+                    episode["pipeline"]["current_agent"] = submitted
+                    _save_episode(mutable["episode_file"], episode)
 
             if not pending_futures:
                 # No agents running and none ready — check for deadlock
@@ -391,34 +408,36 @@ def run_pipeline(
                 try:
                     result = future.result()
                     _on_agent_complete(agent_name, result)
-                    completed.add(agent_name)
+                    _mark_completed(agent_name)
                     logger.info(
-                        f"Agent {agent_name} completed for {mutable['episode_id']}"
+                        "Agent %s completed for %s", agent_name, mutable["episode_id"]
                     )
                 except Exception as e:
                     logger.error(
-                        f"Agent {agent_name} failed for {mutable['episode_id']}: {e}"
+                        "Agent %s failed for %s: %s", agent_name, mutable["episode_id"], e
                     )
+                    critical = agent_name not in NON_CRITICAL_AGENTS
                     with episode_lock:
                         episode["pipeline"]["current_agent"] = None
                         episode["pipeline"].setdefault("errors", {})[agent_name] = str(
                             e
                         )
+                        if critical:
+                            episode["status"] = "error"
                         _save_episode(mutable["episode_file"], episode)
 
-                    if agent_name in NON_CRITICAL_AGENTS:
+                    if not critical:
                         logger.info(
-                            f"Skipping non-critical agent {agent_name}, continuing pipeline"
+                            "Skipping non-critical agent %s, continuing pipeline",
+                            agent_name,
                         )
                         # Mark as completed so dependents can still check
-                        completed.add(agent_name)
+                        _mark_completed(agent_name)
                     else:
                         failed.add(agent_name)
                         # Cancel remaining futures
                         for f in pending_futures:
                             f.cancel()
-                        episode["status"] = "error"
-                        _save_episode(mutable["episode_file"], episode)
                         return episode
 
     # Pipeline complete. The "done" status depends on where we actually
@@ -448,46 +467,77 @@ def run_pipeline(
         agent_json = ed / f"{name}.json"
         if agent_json.exists():
             try:
-                with open(agent_json) as f:
-                    data = json.load(f)
+                data = read_json(agent_json)
                 elapsed = data.get("_elapsed_seconds", "?")
                 summary_parts.append(f"{name}: {elapsed}s")
             except (json.JSONDecodeError, OSError):
                 pass
     if summary_parts:
-        logger.info(f"Pipeline timing: {', '.join(summary_parts)}")
+        logger.info("Pipeline timing: %s", ", ".join(summary_parts))
 
-    logger.info(f"Pipeline complete for {mutable['episode_id']}")
+    logger.info("Pipeline complete for %s", mutable["episode_id"])
     return episode
 
 
-def _is_cancelled(episode_id: str) -> bool:
-    """Check if a pipeline cancellation has been requested."""
+@functools.lru_cache(maxsize=1)
+def _cancel_set():
+    """The API server's set of episode ids with a pending cancel, or None when
+    the server isn't importable (CLI runs). Resolved once, on first use — a
+    module-level import would pull FastAPI into every CLI run."""
     try:
         from server.routes.pipeline import _cancel_requested
-
-        if episode_id in _cancel_requested:
-            _cancel_requested.discard(episode_id)
-            return True
     except ImportError:
-        pass
+        return None
+    return _cancel_requested
+
+
+def _is_cancelled(episode_id: str) -> bool:
+    """Check if a pipeline cancellation has been requested."""
+    cancel_set = _cancel_set()
+    if cancel_set is not None and episode_id in cancel_set:
+        cancel_set.discard(episode_id)
+        return True
     return False
 
 
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+# Auto-generated episode IDs before a guest-name slug is appended
+_BASE_EPISODE_ID_RE = re.compile(r"ep_\d{4}-\d{2}-\d{2}_\d{6}")
+
+
 def _slugify(name: str) -> str:
     """Convert a name to a URL-safe slug (e.g. 'John Smith' -> 'john-smith')."""
-    slug = name.lower().strip()
-    slug = re.sub(r"[^a-z0-9]+", "-", slug)
-    return slug.strip("-")
+    return _SLUG_RE.sub("-", name.lower().strip()).strip("-")
 
 
 def _has_name_slug(episode_id: str) -> bool:
-    """Check if episode_id already has a name slug appended."""
-    # Format is ep_YYYY-MM-DD_HHMMSS with optional _slug
-    # Count underscores: base has 2 (ep_, date_, time), slug adds more
-    parts = episode_id.split("_")
-    return len(parts) > 3
+    """Check if episode_id already has a name slug appended.
+
+    Only a bare ep_YYYY-MM-DD_HHMMSS ID is eligible for renaming; anything
+    else (slugged or custom) is left alone.
+    """
+    return _BASE_EPISODE_ID_RE.fullmatch(episode_id) is None
+
+
+# episode.json path -> (st_mtime_ns, st_size, digest) of this process's last write
+_last_saved: dict[str, tuple[int, int, bytes]] = {}
 
 
 def _save_episode(path: Path, episode: dict):
-    atomic_write_json(path, episode)
+    """Atomically write episode.json, skipping the write when the content is
+    unchanged since our last save and nothing else has rewritten the file."""
+    path = Path(path)
+    data = dumps_json(episode)
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    key = str(path)
+    prev = _last_saved.get(key)
+    if prev is not None and prev[2] == digest:
+        try:
+            st = path.stat()
+            if (st.st_mtime_ns, st.st_size) == prev[:2]:
+                return
+        except OSError:
+            pass
+    atomic_write_bytes(path, data)
+    st = path.stat()
+    _last_saved[key] = (st.st_mtime_ns, st.st_size, digest)
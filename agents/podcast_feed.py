@@ -7,24 +7,136 @@ Outputs:
     - feed.xml (RSS feed, also uploaded to R2)
     - podcast_feed.json (URLs, sizes, duration)
 Dependencies:
-    - ffmpeg (audio extraction), ffprobe (duration), httpx (R2 upload)
+    - ffmpeg (audio extraction), ffprobe (longform duration), httpx (R2 upload),
+      boto3 (optional multipart R2 upload)
 Config:
     - podcast.* (title, author, artwork, etc.)
     - podcast.r2.bucket, podcast.r2.public_url
 Environment:
     - CLOUDFLARE_ACCOUNT_ID, CLOUDFLARE_API_TOKEN
+    - R2_ACCESS_KEY_ID, R2_SECRET_ACCESS_KEY (optional: multipart MP3 upload
+      via R2's S3 endpoint)
 """
 
+import functools
 import json
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from email.utils import formatdate
 from pathlib import Path
-from xml.etree.ElementTree import Element, SubElement, tostring
-from xml.dom import minidom
+from xml.sax.saxutils import escape, quoteattr
 
 from agents.base import BaseAgent
+from lib.atomic_write import atomic_write_json, read_json
+from lib.ffprobe import get_duration, probe_cached as ffprobe
+
+_UPLOAD_CHUNK = 1024 * 1024  # bytes per read when streaming uploads from disk
+_MULTIPART_THRESHOLD = 16 * 1024 * 1024  # S3 multipart part size / cutover
+
+# Per-episode feed entries from _collect_all_episodes, persisted in the
+# episodes root and keyed on each episode dir name. An entry is reused while
+# that episode's podcast_feed.json / episode.json / metadata.json mtimes are
+# unchanged, so a publish only re-parses episodes that changed since the last.
+FEED_INDEX_NAME = "feed_index.json"
+
+# RSS 2.0 feed skeleton. Canonical iTunes namespace — itunes.com NOT
+# itunes.apple.com: Spotify validators are strict; apple.com fails their
+# ingester. Values are XML-escaped by the caller (_xml_text / _xml_attr).
+_CHANNEL_TPL = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:itunes="http://www.itunes.com/dtds/podcast-1.0.dtd" \
+xmlns:content="http://purl.org/rss/1.0/modules/content/" \
+xmlns:atom="http://www.w3.org/2005/Atom">
+  <channel>
+    <title>{title}</title>
+    <link>{link}</link>
+    <description>{description}</description>
+    <language>{language}</language>
+{atom_link}\
+    <lastBuildDate>{last_build_date}</lastBuildDate>
+    <itunes:author>{author}</itunes:author>
+    <itunes:image href={artwork_url} />
+    <itunes:category text={category} />
+    <itunes:explicit>{explicit}</itunes:explicit>
+    <itunes:type>episodic</itunes:type>
+    <itunes:owner>
+      <itunes:name>{author}</itunes:name>
+{owner_email}\
+    </itunes:owner>
+{items}\
+  </channel>
+</rss>
+"""
+
+# One <item> per episode. episodeType is always "full" (the pipeline only
+# produces full episodes); itunes:title mirrors <title> for Apple listings.
+_ITEM_TPL = """\
+    <item>
+      <title>{title}</title>
+      <description>{description}</description>
+      <enclosure url={audio_url} length={audio_size} type="audio/mpeg" />
+      <guid isPermaLink="false">{guid}</guid>
+      <pubDate>{pub_date}</pubDate>
+      <itunes:duration>{duration}</itunes:duration>
+      <itunes:explicit>{explicit}</itunes:explicit>
+      <itunes:episodeType>full</itunes:episodeType>
+      <itunes:title>{title}</itunes:title>
+    </item>
+"""
+
+# Whitespace in attribute values is escaped so parsers don't normalize it away
+_ATTR_ENTITIES = {"\n": "&#10;", "\r": "&#13;", "\t": "&#09;"}
+
+
+def _xml_text(value):
+    # type: (str) -> str
+    """Escape a value for use as element text."""
+    return escape(value)
+
+
+def _xml_attr(value):
+    # type: (str) -> str
+    """Escape and double-quote a value for use as an attribute."""
+    return quoteattr(value, _ATTR_ENTITIES)
+
+
+@functools.lru_cache(maxsize=1)
+def _r2_client():
+    """One httpx client for every R2 upload in the process, so the feed PUT
+    reuses the MP3 upload's TLS connection. HTTP/2 when h2 is installed."""
+    import httpx
+
+    try:
+        import h2  # noqa: F401
+
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.Client(http2=http2, timeout=600.0)
+
+
+def _mtime_ns(path):
+    # type: (Path) -> int
+    """st_mtime_ns of path, or 0 if it doesn't exist."""
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return 0
+
+
+def _feed_index_key(ep_dir):
+    # type: (Path) -> Optional[List[int]]
+    """mtimes of the files a feed entry is built from, or None without podcast_feed.json."""
+    feed_mtime = _mtime_ns(ep_dir / "podcast_feed.json")
+    if not feed_mtime:
+        return None
+    return [
+        feed_mtime,
+        _mtime_ns(ep_dir / "episode.json"),
+        _mtime_ns(ep_dir / "metadata" / "metadata.json"),
+    ]
 
 
 class PodcastFeedAgent(BaseAgent):
@@ -38,6 +150,22 @@ class PodcastFeedAgent(BaseAgent):
         episode = self.load_json("episode.json")
         episode_id = episode.get("episode_id", self.episode_dir.name)
 
+        # Require episode_name before publishing to RSS
+        ep_title = episode.get("episode_name", "") or episode.get("title", "")
+        if not ep_title:
+            raise RuntimeError(
+                "Episode name is required before publishing to podcast feed. "
+                "Set it in the UI or episode.json."
+            )
+
+        bucket = r2_cfg.get("bucket", "")
+        public_url = r2_cfg.get("public_url", "").rstrip("/")
+
+        if not bucket:
+            raise RuntimeError("podcast.r2.bucket not set in config.toml")
+        if not public_url:
+            raise RuntimeError("podcast.r2.public_url not set in config.toml")
+
         # --- Step 1: Extract audio from longform video ---
         longform_path = self.episode_dir / "longform.mp4"
         audio_path = self.episode_dir / "podcast_audio.mp3"
@@ -47,47 +175,35 @@ class PodcastFeedAgent(BaseAgent):
                 "longform.mp4 not found in episode directory: %s" % self.episode_dir
             )
 
-        if audio_path.exists():
-            self.logger.info("podcast_audio.mp3 already exists, skipping extraction")
-        else:
-            self.logger.info("Extracting audio from longform.mp4...")
-            self._extract_audio(longform_path, audio_path)
+        # ffmpeg runs in the background while the other episodes' feed
+        # entries are collected (JSON reads, independent of the new MP3)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            extraction = None
+            if audio_path.exists():
+                self.logger.info("podcast_audio.mp3 already exists, skipping extraction")
+            else:
+                self.logger.info("Extracting audio from longform.mp4...")
+                extraction = pool.submit(self._extract_audio, longform_path, audio_path)
+
+            self.logger.info("Collecting episodes for the RSS feed...")
+            episodes_root = self.episode_dir.parent  # Parent dir contains all episodes
+            all_episodes = self._collect_all_episodes(episodes_root, podcast_cfg)
+
+            if extraction is not None:
+                extraction.result()
 
         audio_size = audio_path.stat().st_size
-        audio_duration = self._get_duration(audio_path)
+        # The MP3 is a straight transcode of longform's audio, so its duration
+        # is the source's — no second probe of the freshly written MP3
+        audio_duration = get_duration(longform_path)
         self.logger.info(
-            "Audio: %.1f MB, %d seconds" % (audio_size / 1e6, audio_duration)
+            "Audio: %.1f MB, %d seconds", audio_size / 1e6, audio_duration
         )
 
-        # --- Step 2: Upload MP3 to R2 ---
+        # --- Step 2: Upload MP3 to R2 (in the background while the feed builds) ---
         self.logger.info("Uploading MP3 to Cloudflare R2...")
-        bucket = r2_cfg.get("bucket", "")
-        public_url = r2_cfg.get("public_url", "").rstrip("/")
-
-        if not bucket:
-            raise RuntimeError("podcast.r2.bucket not set in config.toml")
-        if not public_url:
-            raise RuntimeError("podcast.r2.public_url not set in config.toml")
-
         audio_key = "audio/%s.mp3" % episode_id
-        self._upload_file_to_r2(
-            bucket, audio_path, audio_key, content_type="audio/mpeg"
-        )
         audio_url = "%s/%s" % (public_url, audio_key)
-        self.logger.info("MP3 uploaded: %s" % audio_url)
-
-        # --- Step 3: Build and upload RSS feed ---
-        self.logger.info("Building RSS feed with all episodes...")
-        episodes_root = self.episode_dir.parent  # Parent dir contains all episodes
-        all_episodes = self._collect_all_episodes(episodes_root, podcast_cfg)
-
-        # Require episode_name before publishing to RSS
-        ep_title = episode.get("episode_name", "") or episode.get("title", "")
-        if not ep_title:
-            raise RuntimeError(
-                "Episode name is required before publishing to podcast feed. "
-                "Set it in the UI or episode.json."
-            )
 
         # Update/add the current episode's podcast data
         current_ep = {
@@ -103,34 +219,30 @@ class PodcastFeedAgent(BaseAgent):
             ),
         }
 
-        # Replace existing entry for this episode or append
-        found = False
-        for i, ep in enumerate(all_episodes):
-            if ep["episode_id"] == episode_id:
-                all_episodes[i] = current_ep
-                found = True
-                break
-        if not found:
-            all_episodes.append(current_ep)
-
-        # Sort by pub_date descending (newest first)
-        all_episodes.sort(key=lambda e: e.get("pub_date", ""), reverse=True)
-
-        feed_url = "%s/feed.xml" % public_url
-        feed_xml = self._build_feed_xml(podcast_cfg, all_episodes, feed_url=feed_url)
-
-        # Write feed locally for reference
-        local_feed = self.episode_dir / "feed.xml"
-        local_feed.write_text(feed_xml, encoding="utf-8")
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            audio_upload = pool.submit(
+                self._upload_file_to_r2,
+                bucket,
+                audio_path,
+                audio_key,
+                content_type="audio/mpeg",
+            )
+            feed_url = "%s/feed.xml" % public_url
+            feed_xml = self._build_feed(
+                podcast_cfg, all_episodes, current_ep, feed_url=feed_url
+            )
+            # The feed must never point at an MP3 that isn't there yet
+            audio_upload.result()
+        self.logger.info("MP3 uploaded: %s", audio_url)
 
-        # Upload feed.xml to R2
+        # --- Step 3: Upload RSS feed ---
         self._upload_to_r2(
             bucket,
             "feed.xml",
-            feed_xml.encode("utf-8"),
+            feed_xml,
             content_type="application/rss+xml; charset=utf-8",
         )
-        self.logger.info("Feed uploaded: %s" % feed_url)
+        self.logger.info("Feed uploaded: %s", feed_url)
 
         # --- Step 4: Save podcast_feed.json in episode directory ---
         result = {
@@ -144,22 +256,51 @@ class PodcastFeedAgent(BaseAgent):
 
         return result
 
+    # ---- RSS feed assembly ----
+
+    def _build_feed(self, podcast_cfg, all_episodes, current_ep, *, feed_url):
+        # type: (dict, List[Dict], dict, str) -> bytes
+        """Merge current_ep into all_episodes (in place, newest first) and
+        build feed.xml from them, writing a local copy."""
+        self.logger.info("Building RSS feed with all episodes...")
+
+        # Replace existing entry for this episode or append
+        found = False
+        for i, ep in enumerate(all_episodes):
+            if ep["episode_id"] == current_ep["episode_id"]:
+                all_episodes[i] = current_ep
+                found = True
+                break
+        if not found:
+            all_episodes.append(current_ep)
+
+        # Sort by pub_date descending (newest first)
+        all_episodes.sort(key=lambda e: e.get("pub_date", ""), reverse=True)
+
+        feed_xml = self._build_feed_xml(podcast_cfg, all_episodes, feed_url=feed_url)
+
+        # Write feed locally for reference
+        local_feed = self.episode_dir / "feed.xml"
+        local_feed.write_bytes(feed_xml)
+
+        return feed_xml
+
     # ---- Audio extraction ----
 
     def _extract_audio(self, video_path, audio_path):
         # type: (Path, Path) -> None
+        if self._can_copy_audio(video_path):
+            # Already MP3 at podcast quality: remux instead of re-encoding
+            codec_args = ["-c:a", "copy", "-f", "mp3"]
+        else:
+            codec_args = ["-c:a", "libmp3lame", "-b:a", "192k", "-ar", "44100"]
         cmd = [
             "ffmpeg",
             "-y",
             "-i",
             str(video_path),
             "-vn",
-            "-c:a",
-            "libmp3lame",
-            "-b:a",
-            "192k",
-            "-ar",
-            "44100",
+            *codec_args,
             str(audio_path),
         ]
         result = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
@@ -168,31 +309,35 @@ class PodcastFeedAgent(BaseAgent):
                 "ffmpeg audio extraction failed: %s" % result.stderr[-500:]
             )
 
-    def _get_duration(self, audio_path):
-        # type: (Path) -> float
-        cmd = [
-            "ffprobe",
-            "-v",
-            "quiet",
-            "-print_format",
-            "json",
-            "-show_format",
-            str(audio_path),
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-        info = json.loads(result.stdout)
-        return float(info.get("format", {}).get("duration", 0))
+    def _can_copy_audio(self, video_path):
+        # type: (Path) -> bool
+        """True if the first audio stream is MP3 at >= 160 kbps (stream-copyable)."""
+        try:
+            streams = ffprobe(video_path).get("streams", [])
+        except subprocess.CalledProcessError:
+            return False
+        audio = next((st for st in streams if st.get("codec_type") == "audio"), None)
+        if not audio or audio.get("codec_name") != "mp3":
+            return False
+        try:
+            return int(audio.get("bit_rate", 0)) >= 160_000
+        except (TypeError, ValueError):
+            return False
 
     # ---- Cloudflare R2 REST API helpers ----
 
-    def _upload_to_r2(self, bucket, key, data, content_type="application/octet-stream"):
-        # type: (str, str, bytes, str) -> None
-        """Upload bytes to Cloudflare R2 via the Cloudflare REST API.
+    def _upload_to_r2(
+        self, bucket, key, data, content_type="application/octet-stream", content_length=None
+    ):
+        # type: (str, str, Union[bytes, Iterator[bytes]], str, Optional[int]) -> None
+        """Upload bytes (or an iterator of byte chunks) to Cloudflare R2 via
+        the Cloudflare REST API.
 
         Uses: PUT /client/v4/accounts/{account_id}/r2/buckets/{bucket}/objects/{key}
-        """
-        import httpx
 
+        Pass content_length with an iterator so the request is sent with a
+        Content-Length rather than chunked transfer encoding.
+        """
         account_id = os.getenv("CLOUDFLARE_ACCOUNT_ID", "")
         api_token = os.getenv("CLOUDFLARE_API_TOKEN", "")
 
@@ -214,15 +359,14 @@ class PodcastFeedAgent(BaseAgent):
             )
         )
 
-        resp = httpx.put(
-            url,
-            content=data,
-            headers={
-                "Authorization": "Bearer %s" % api_token,
-                "Content-Type": content_type,
-            },
-            timeout=600.0,
-        )
+        headers = {
+            "Authorization": "Bearer %s" % api_token,
+            "Content-Type": content_type,
+        }
+        if content_length is not None:
+            headers["Content-Length"] = str(content_length)
+
+        resp = _r2_client().put(url, content=data, headers=headers)
 
         if resp.status_code not in (200, 201):
             raise RuntimeError(
@@ -233,60 +377,151 @@ class PodcastFeedAgent(BaseAgent):
         self, bucket, local_path, key, content_type="application/octet-stream"
     ):
         # type: (str, Path, str, str) -> None
-        """Upload a file to R2 by reading it into memory."""
-        data = Path(local_path).read_bytes()
-        self._upload_to_r2(bucket, key, data, content_type)
+        """Upload a file to R2.
+
+        With R2 S3 credentials set, large files go through the S3-compatible
+        endpoint as a parallel multipart upload. Otherwise the file is
+        streamed from disk in fixed-size chunks to the REST API (one PUT).
+        """
+        local_path = Path(local_path)
+        if os.getenv("R2_ACCESS_KEY_ID") and os.getenv("R2_SECRET_ACCESS_KEY"):
+            self._upload_file_to_r2_s3(bucket, local_path, key, content_type)
+            return
+        size = local_path.stat().st_size
+        with open(local_path, "rb") as f:
+            chunks = iter(functools.partial(f.read, _UPLOAD_CHUNK), b"")
+            self._upload_to_r2(bucket, key, chunks, content_type, content_length=size)
+
+    def _upload_file_to_r2_s3(self, bucket, local_path, key, content_type):
+        # type: (str, Path, str, str) -> None
+        """Multipart upload via R2's S3 endpoint (parts sent concurrently)."""
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+
+        account_id = os.getenv("CLOUDFLARE_ACCOUNT_ID", "")
+        if not account_id:
+            raise RuntimeError("CLOUDFLARE_ACCOUNT_ID not set in .env")
+
+        s3 = boto3.client(
+            "s3",
+            endpoint_url="https://%s.r2.cloudflarestorage.com" % account_id,
+            aws_access_key_id=os.getenv("R2_ACCESS_KEY_ID"),
+            aws_secret_access_key=os.getenv("R2_SECRET_ACCESS_KEY"),
+            region_name="auto",
+        )
+        s3.upload_file(
+            str(local_path),
+            bucket,
+            key,
+            ExtraArgs={"ContentType": content_type},
+            Config=TransferConfig(
+                multipart_threshold=_MULTIPART_THRESHOLD,
+                multipart_chunksize=_MULTIPART_THRESHOLD,
+                max_concurrency=8,
+            ),
+        )
 
     # ---- Episode collection ----
 
     def _collect_all_episodes(self, episodes_root, podcast_cfg):
         # type: (Path, dict) -> List[Dict]
-        """Scan all episode directories for podcast_feed.json to build the full feed."""
+        """Scan all episode directories for podcast_feed.json to build the full feed.
+
+        Parsed entries are cached in episodes_root/feed_index.json, so
+        unchanged episodes cost a few stats instead of two JSON parses.
+        """
         episodes = []
 
         if not episodes_root.is_dir():
             return episodes
 
-        for ep_dir in sorted(episodes_root.iterdir()):
-            if not ep_dir.is_dir():
-                continue
+        index_path = episodes_root / FEED_INDEX_NAME
+        index = self._load_feed_index(index_path)
+        fresh_index = {}
+
+        # Unsorted scan: execute() orders the feed by pub_date anyway, and
+        # DirEntry.is_dir() comes from the directory listing without a stat
+        with os.scandir(episodes_root) as entries:
+            ep_dirs = [Path(e.path) for e in entries if e.is_dir(follow_symlinks=False)]
+
+        for ep_dir in ep_dirs:
 
             # Skip the current episode (we'll add it fresh)
             if ep_dir == self.episode_dir:
                 continue
 
             # Check for existing podcast_feed.json (from a prior run)
-            feed_json = ep_dir / "podcast_feed.json"
-            if feed_json.exists():
-                try:
-                    data = json.loads(feed_json.read_text())
-                    ep_json_path = ep_dir / "episode.json"
-                    ep_data = {}
-                    if ep_json_path.exists():
-                        ep_data = json.loads(ep_json_path.read_text())
-
-                    episodes.append(
-                        {
-                            "episode_id": data.get("episode_id", ep_dir.name),
-                            "title": ep_data.get("episode_name", "")
-                            or ep_data.get("title", "")
-                            or ep_dir.name,
-                            "description": ep_data.get("episode_description", "")
-                            or self._get_episode_description(ep_data),
-                            "audio_url": data.get("audio_url", ""),
-                            "audio_size": data.get("audio_size_bytes", 0),
-                            "duration_seconds": data.get("duration_seconds", 0),
-                            "pub_date": ep_data.get("created_at", ""),
-                        }
-                    )
-                except (json.JSONDecodeError, KeyError):
-                    self.logger.warning(
-                        "Skipping malformed podcast_feed.json in %s" % ep_dir.name
-                    )
-                    continue
+            key = _feed_index_key(ep_dir)
+            if key is None:
+                continue
 
+            # Reuse the indexed entry while none of its source files changed
+            cached = index.get(ep_dir.name)
+            if isinstance(cached, dict) and cached.get("key") == key:
+                fresh_index[ep_dir.name] = cached
+                episodes.append(dict(cached["entry"]))
+                continue
+
+            entry = self._read_feed_entry(ep_dir, has_episode_json=bool(key[1]))
+            if entry is None:
+                continue
+            fresh_index[ep_dir.name] = {"key": key, "entry": entry}
+            episodes.append(dict(entry))
+
+        self._save_feed_index(index_path, index, fresh_index)
         return episodes
 
+    @staticmethod
+    def _load_feed_index(index_path):
+        # type: (Path) -> dict
+        """Read feed_index.json, treating a missing or malformed file as empty."""
+        try:
+            index = read_json(index_path)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return {}
+        return index if isinstance(index, dict) else {}
+
+    def _save_feed_index(self, index_path, index, fresh_index):
+        # type: (Path, dict, dict) -> None
+        """Rewrite feed_index.json only when this scan changed it."""
+        # The current episode is never indexed (it's rebuilt every run), so
+        # keep its stale entry, if any, out of the comparison
+        index.pop(self.episode_dir.name, None)
+        if fresh_index == index:
+            return
+        try:
+            atomic_write_json(index_path, fresh_index, indent=0)
+        except OSError as e:
+            self.logger.warning("Could not update %s: %s", FEED_INDEX_NAME, e)
+
+    def _read_feed_entry(self, ep_dir, has_episode_json):
+        # type: (Path, bool) -> Optional[Dict]
+        """Build a feed entry from an episode's podcast_feed.json and episode.json.
+
+        Returns None (and logs) when podcast_feed.json is malformed.
+        """
+        try:
+            data = read_json(ep_dir / "podcast_feed.json")
+            ep_data = read_json(ep_dir / "episode.json") if has_episode_json else {}
+
+            return {
+                "episode_id": data.get("episode_id", ep_dir.name),
+                "title": ep_data.get("episode_name", "")
+                or ep_data.get("title", "")
+                or ep_dir.name,
+                "description": ep_data.get("episode_description", "")
+                or self._get_episode_description(ep_data),
+                "audio_url": data.get("audio_url", ""),
+                "audio_size": data.get("audio_size_bytes", 0),
+                "duration_seconds": data.get("duration_seconds", 0),
+                "pub_date": ep_data.get("created_at", ""),
+            }
+        except (json.JSONDecodeError, KeyError, FileNotFoundError):
+            self.logger.warning(
+                "Skipping malformed podcast_feed.json in %s", ep_dir.name
+            )
+            return None
+
     def _get_episode_description(self, episode):
         # type: (dict) -> str
         """Extract a description from episode metadata if available."""
@@ -299,7 +534,7 @@ class PodcastFeedAgent(BaseAgent):
                 )
                 if meta_path.exists():
                     try:
-                        meta = json.loads(meta_path.read_text())
+                        meta = read_json(meta_path)
                         desc = meta.get("longform", {}).get("description", "")
                         if desc:
                             return desc
@@ -311,22 +546,8 @@ class PodcastFeedAgent(BaseAgent):
     # ---- RSS feed generation ----
 
     def _build_feed_xml(self, podcast_cfg, episodes, *, feed_url=""):
-        # type: (dict, List[Dict], str) -> str
-        """Generate an Apple Podcasts + Spotify compliant RSS XML feed."""
-        # Canonical iTunes namespace — itunes.com NOT itunes.apple.com.
-        # Spotify validators are strict; apple.com fails their ingester.
-        ITUNES_NS = "http://www.itunes.com/dtds/podcast-1.0.dtd"
-        CONTENT_NS = "http://purl.org/rss/1.0/modules/content/"
-        ATOM_NS = "http://www.w3.org/2005/Atom"
-
-        rss = Element("rss")
-        rss.set("version", "2.0")
-        rss.set("xmlns:itunes", ITUNES_NS)
-        rss.set("xmlns:content", CONTENT_NS)
-        rss.set("xmlns:atom", ATOM_NS)
-
-        channel = SubElement(rss, "channel")
-
+        # type: (dict, List[Dict], str) -> bytes
+        """Generate an Apple Podcasts + Spotify compliant RSS XML feed as UTF-8 bytes."""
         # Channel metadata from config
         title = podcast_cfg.get("title", "My Podcast")
         description = podcast_cfg.get("description", "")
@@ -334,102 +555,50 @@ class PodcastFeedAgent(BaseAgent):
         artwork_url = podcast_cfg.get("artwork_url", "")
         language = podcast_cfg.get("language", "en")
         category = podcast_cfg.get("category", "Technology")
-        explicit = str(podcast_cfg.get("explicit", "false")).lower()
+        explicit = _xml_text(str(podcast_cfg.get("explicit", "false")).lower())
         link = podcast_cfg.get("link", "")
+        owner_email = podcast_cfg.get("owner_email", "")
+
+        items = [
+            _ITEM_TPL.format(
+                title=_xml_text(ep.get("title", "")),
+                description=_xml_text(ep.get("description", "")),
+                audio_url=_xml_attr(ep.get("audio_url", "")),
+                audio_size=_xml_attr(str(ep.get("audio_size", 0))),
+                guid=_xml_text(ep.get("episode_id", "")),
+                pub_date=self._format_rfc2822(ep.get("pub_date", "")),
+                duration=_xml_text(str(ep.get("duration_seconds", 0))),
+                explicit=explicit,
+            )
+            for ep in episodes
+        ]
 
-        self._add_text_element(channel, "title", title)
-        self._add_text_element(channel, "link", link)
-        self._add_text_element(channel, "description", description)
-        self._add_text_element(channel, "language", language)
-
-        # Canonical feed self-link — lets podcatchers discover the feed URL for updates
-        if feed_url:
-            atom_link = SubElement(channel, "atom:link")
-            atom_link.set("href", feed_url)
-            atom_link.set("rel", "self")
-            atom_link.set("type", "application/rss+xml")
-
-        # lastBuildDate — required by many validators
-        self._add_text_element(channel, "lastBuildDate", formatdate(usegmt=True))
-
-        itunes_author = SubElement(channel, "itunes:author")
-        itunes_author.text = author
-
-        itunes_image = SubElement(channel, "itunes:image")
-        itunes_image.set("href", artwork_url)
-
-        itunes_category = SubElement(channel, "itunes:category")
-        itunes_category.set("text", category)
-
-        itunes_explicit = SubElement(channel, "itunes:explicit")
-        itunes_explicit.text = explicit
-
-        # episodic type — Spotify treats newest as latest (not a serial sequence)
-        itunes_type = SubElement(channel, "itunes:type")
-        itunes_type.text = "episodic"
-
-        itunes_owner = SubElement(channel, "itunes:owner")
-        owner_name = SubElement(itunes_owner, "itunes:name")
-        owner_name.text = author
-        owner_email_val = podcast_cfg.get("owner_email", "")
-        if owner_email_val:
-            owner_email = SubElement(itunes_owner, "itunes:email")
-            owner_email.text = owner_email_val
-
-        # Episodes
-        for ep in episodes:
-            item = SubElement(channel, "item")
-
-            ep_title = ep.get("title", "")
-            self._add_text_element(item, "title", ep_title)
-            self._add_text_element(item, "description", ep.get("description", ""))
-
-            enclosure = SubElement(item, "enclosure")
-            enclosure.set("url", ep.get("audio_url", ""))
-            enclosure.set("length", str(ep.get("audio_size", 0)))
-            enclosure.set("type", "audio/mpeg")
-
-            guid = SubElement(item, "guid")
-            guid.set("isPermaLink", "false")
-            guid.text = ep.get("episode_id", "")
-
-            # Format pub_date as RFC 2822
-            pub_date_str = ep.get("pub_date", "")
-            pub_date = self._format_rfc2822(pub_date_str)
-            self._add_text_element(item, "pubDate", pub_date)
-
-            itunes_dur = SubElement(item, "itunes:duration")
-            itunes_dur.text = str(ep.get("duration_seconds", 0))
-
-            item_explicit = SubElement(item, "itunes:explicit")
-            item_explicit.text = explicit
-
-            # itunes:episodeType — pipeline only produces full episodes
-            item_ep_type = SubElement(item, "itunes:episodeType")
-            item_ep_type.text = "full"
-
-            # itunes:title — used in Apple Podcasts episode listings
-            item_itunes_title = SubElement(item, "itunes:title")
-            item_itunes_title.text = ep_title
-
-        # Serialize via minidom for pretty-printing
-        rough_string = tostring(rss, encoding="unicode")
-        reparsed = minidom.parseString(rough_string)
-        xml_str = reparsed.toprettyxml(indent="  ", encoding=None)
-
-        # Normalise declaration to exactly: <?xml version="1.0" encoding="UTF-8"?>
-        # (minidom may produce version="1.0" without encoding, or with extra whitespace)
-        lines = xml_str.split("\n")
-        lines[0] = '<?xml version="1.0" encoding="UTF-8"?>'
-        xml_str = "\n".join(lines)
-
-        return xml_str
-
-    def _add_text_element(self, parent, tag, text):
-        # type: (Element, str, str) -> Element
-        el = SubElement(parent, tag)
-        el.text = text
-        return el
+        feed = _CHANNEL_TPL.format(
+            title=_xml_text(title),
+            link=_xml_text(link),
+            description=_xml_text(description),
+            language=_xml_text(language),
+            # Canonical feed self-link — lets podcatchers discover the feed URL for updates
+            atom_link=(
+                '    <atom:link href=%s rel="self" type="application/rss+xml" />\n'
+                % _xml_attr(feed_url)
+                if feed_url
+                else ""
+            ),
+            # lastBuildDate — required by many validators
+            last_build_date=formatdate(usegmt=True),
+            author=_xml_text(author),
+            artwork_url=_xml_attr(artwork_url),
+            category=_xml_attr(category),
+            explicit=explicit,
+            owner_email=(
+                "      <itunes:email>%s</itunes:email>\n" % _xml_text(owner_email)
+                if owner_email
+                else ""
+            ),
+            items="".join(items),
+        )
+        return feed.encode("utf-8")
 
     def _format_rfc2822(self, iso_str):
         # type: (str) -> str
@@ -9,6 +9,7 @@ Dependencies:
     - curl (Upload-Post REST API — httpx can't handle repeated platform[] fields)
 Config:
     - platforms.youtube.enabled, platforms.tiktok.enabled, platforms.instagram.enabled
+    - publish.concurrency (parallel short uploads, default 4)
     - schedule.timezone, schedule.shorts_per_day_weekday, schedule.shorts_per_day_weekend
 Environment:
     - UPLOAD_POST_API_KEY, UPLOAD_POST_USER
@@ -17,6 +18,7 @@ Environment:
 import json
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 
 from agents.base import BaseAgent
@@ -24,6 +26,13 @@ from agents.base import BaseAgent
 UPLOAD_POST_URL = "https://api.upload-post.com/api/upload"
 STATUS_URL = "https://api.upload-post.com/api/uploadposts/status"
 
+# Upload-Post platforms this agent can target, in submission order; each is
+# sent only when platforms.<name>.enabled is set
+UPLOAD_PLATFORMS = ("youtube", "tiktok", "instagram", "x")
+
+# Schedule time slots -> hour of day
+TIME_SLOT_HOURS = {"morning": 9, "afternoon": 14, "evening": 18}
+
 
 def _build_first_comment(youtube_url, spotify_url="", channel_handle=""):
     """Build the YouTube first-comment text that funnels viewers to the full episode.
@@ -74,50 +83,73 @@ class PublishAgent(BaseAgent):
         longform_meta = metadata.get("longform", {})
 
         # Determine platforms from config
-        platforms = []
-        platform_cfg = self.config.get("platforms", {})
-        if platform_cfg.get("youtube", {}).get("enabled"):
-            platforms.append("youtube")
-        if platform_cfg.get("tiktok", {}).get("enabled"):
-            platforms.append("tiktok")
-        if platform_cfg.get("instagram", {}).get("enabled"):
-            platforms.append("instagram")
-        if platform_cfg.get("x", {}).get("enabled"):
-            platforms.append("x")
+        platform_cfg = self.config.get("platforms") or {}
+        platforms = [
+            p for p in UPLOAD_PLATFORMS if (platform_cfg.get(p) or {}).get("enabled")
+        ]
 
         if not platforms:
             raise RuntimeError("No platforms enabled in config")
 
-        tz_name = self.get_config("schedule", "timezone", default="America/Los_Angeles")
-        shorts_weekday = self.get_config(
-            "schedule", "shorts_per_day_weekday", default=1
-        )
-        shorts_weekend = self.get_config(
-            "schedule", "shorts_per_day_weekend", default=2
-        )
+        sched_cfg = self.config.get("schedule") or {}
+        tz_name = sched_cfg.get("timezone", "America/Los_Angeles")
+        shorts_weekday = sched_cfg.get("shorts_per_day_weekday", 1)
+        shorts_weekend = sched_cfg.get("shorts_per_day_weekend", 2)
 
-        results = []
+        uploads = []  # (clip_id, short_path, curl cmd, scheduled)
+        # One reference time for the generated schedule and every clip's slot
+        now = datetime.now(timezone.utc)
 
         # === Publish shorts ===
         self.logger.info("Publishing %d shorts to %s..." % (len(clips), platforms))
 
         # Build schedule if metadata didn't provide one
         if not schedule:
-            schedule = self._generate_schedule(clips, shorts_weekday, shorts_weekend)
+            schedule = self._generate_schedule(
+                clips, shorts_weekday, shorts_weekend, now=now
+            )
 
-        # Group schedule by clip_id for lookup
+        # Rejected clips never upload, so drop them before any file checks
+        active_clips = [c for c in clips if c.get("status") != "rejected"]
+        if len(active_clips) < len(clips):
+            self.logger.info(
+                "  Skipping %d rejected clips" % (len(clips) - len(active_clips))
+            )
+        active_ids = {c.get("id", "") for c in active_clips}
+
+        # Group schedule by clip_id for lookup (first entry per clip wins)
         clip_schedules = {}
         for entry in schedule:
             cid = entry.get("clip_id")
-            if cid not in clip_schedules:
-                clip_schedules[cid] = entry
+            if cid in active_ids:
+                clip_schedules.setdefault(cid, entry)
+
+        # Fields shared by every short's upload, built once: auth, user and
+        # the repeated platform[] fields
+        base_cmd = [
+            "curl",
+            "-s",
+            "--max-time",
+            "600",
+            "-H",
+            "Authorization: Apikey %s" % api_key,
+            "-F",
+            "user=%s" % user,
+            "-F",
+            "async_upload=true",
+        ]
+        for p in platforms:
+            base_cmd.extend(["-F", "platform[]=%s" % p])
+
+        # YouTube first-comment funnel — highest-CTR path from Short to longform
+        first_comment = ""
+        if youtube_longform_url:
+            first_comment = _build_first_comment(
+                youtube_longform_url, spotify_longform_url, channel_handle
+            )
 
-        for i, clip in enumerate(clips):
+        for clip in active_clips:
             clip_id = clip.get("id", "")
-            if clip.get("status") == "rejected":
-                self.logger.info("  Skipping rejected clip %s" % clip_id)
-                continue
-
             short_path = self.episode_dir / "shorts" / ("%s.mp4" % clip_id)
             if not short_path.exists():
                 self.logger.warning("  Short not found: %s" % clip_id)
@@ -128,28 +160,13 @@ class PublishAgent(BaseAgent):
             cmeta = clip.get("metadata", {}) or clip_metadata.get(clip_id, {})
             title = clip.get("title", "Clip %s" % clip_id)
 
-            # Build curl command with repeated platform[] fields
-            cmd = [
-                "curl",
-                "-s",
-                "--max-time",
-                "600",
-                "-H",
-                "Authorization: Apikey %s" % api_key,
+            cmd = base_cmd + [
                 "-F",
                 "video=@%s" % str(short_path),
                 "-F",
-                "user=%s" % user,
-                "-F",
                 "title=%s" % title,
-                "-F",
-                "async_upload=true",
             ]
 
-            # Add platforms (repeated platform[] fields)
-            for p in platforms:
-                cmd.extend(["-F", "platform[]=%s" % p])
-
             # Platform-specific captions
             yt = cmeta.get("youtube", {})
             tt = cmeta.get("tiktok", {})
@@ -204,106 +221,32 @@ class PublishAgent(BaseAgent):
             # Scheduling
             sched = clip_schedules.get(clip_id)
             if sched:
-                scheduled_dt = self._schedule_to_datetime(sched, tz_name)
+                scheduled_dt = self._schedule_to_datetime(sched, tz_name, now=now)
                 cmd.extend(["-F", "scheduled_date=%s" % scheduled_dt.isoformat()])
                 cmd.extend(["-F", "timezone=%s" % tz_name])
 
-            # YouTube first-comment funnel — highest-CTR path from Short to longform
-            if youtube_longform_url:
-                first_comment = _build_first_comment(
-                    youtube_longform_url, spotify_longform_url, channel_handle
-                )
+            if first_comment:
                 cmd.extend(["-F", "youtube_first_comment=%s" % first_comment])
 
             cmd.extend(["-X", "POST", UPLOAD_POST_URL])
-
-            size_mb = short_path.stat().st_size / 1e6
-            self.logger.info("  Uploading %s (%.1f MB)..." % (clip_id, size_mb))
-            self.report_progress(i + 1, len(clips), "Uploading %s" % clip_id)
-
-            try:
-                proc = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
-                if proc.returncode != 0:
-                    results.append(
-                        {
-                            "clip_id": clip_id,
-                            "status": "failed",
-                            "error": "curl error: %s" % proc.stderr[:500],
-                            "stdout": proc.stdout,
-                        }
-                    )
-                    self.logger.error(
-                        "  %s curl failed: %s" % (clip_id, proc.stderr[:200])
-                    )
-                    continue
-
-                try:
-                    resp_data = json.loads(proc.stdout)
-                except json.JSONDecodeError:
-                    results.append(
-                        {
-                            "clip_id": clip_id,
-                            "status": "failed",
-                            "error": "non-JSON response from Upload-Post: %s"
-                            % proc.stdout[:200],
-                        }
-                    )
-                    self.logger.error("  %s non-JSON response" % clip_id)
-                    continue
-
-                request_id = resp_data.get("request_id", resp_data.get("job_id"))
-                if request_id:
-                    results.append(
-                        {
-                            "clip_id": clip_id,
-                            "status": "submitted",
-                            "platforms": platforms,
-                            "request_id": request_id,
-                            "scheduled": sched is not None,
-                            "response": resp_data,
-                        }
-                    )
-                    self.logger.info("  %s submitted (id: %s)" % (clip_id, request_id))
-                elif "error" in resp_data:
-                    results.append(
-                        {
-                            "clip_id": clip_id,
-                            "status": "failed",
-                            "error": resp_data["error"],
-                            "response": resp_data,
-                        }
-                    )
-                    self.logger.error(
-                        "  %s API error: %s" % (clip_id, resp_data["error"])
-                    )
-                else:
-                    results.append(
-                        {
-                            "clip_id": clip_id,
-                            "status": "failed",
-                            "response": resp_data,
-                        }
+            uploads.append((clip_id, short_path, cmd, sched is not None))
+
+        # Uploads are network-bound, so run several curl processes at once
+        # (publish.concurrency); results keep the clips' order
+        concurrency = max(1, int(self.get_config("publish", "concurrency", default=4)))
+        results = [None] * len(uploads)
+        if uploads:
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(uploads))) as pool:
+                futures = {
+                    pool.submit(self._upload_short, *upload, platforms): i
+                    for i, upload in enumerate(uploads)
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    i = futures[future]
+                    results[i] = future.result()
+                    self.report_progress(
+                        done, len(uploads), "Uploaded %s" % uploads[i][0]
                     )
-                    self.logger.error("  %s missing request_id in response" % clip_id)
-
-            except subprocess.TimeoutExpired:
-                results.append(
-                    {
-                        "clip_id": clip_id,
-                        "status": "failed",
-                        "error": "Upload timed out (600s)",
-                    }
-                )
-                self.logger.error("  %s upload timed out" % clip_id)
-            except Exception as e:
-                results.append(
-                    {
-                        "clip_id": clip_id,
-                        "status": "failed",
-                        "error": str(e),
-                    }
-                )
-                self.logger.error("  %s failed: %s" % (clip_id, e))
 
         # === Publish longform to YouTube ===
         longform_path = self.episode_dir / "longform.mp4"
@@ -425,10 +368,77 @@ class PublishAgent(BaseAgent):
             "platforms": platforms,
         }
 
-    def _generate_schedule(self, clips, weekday_per_day, weekend_per_day):
+    def _upload_short(self, clip_id, short_path, cmd, scheduled, platforms):
+        """Run one short's Upload-Post curl command and return its result entry."""
+        size_mb = short_path.stat().st_size / 1e6
+        self.logger.info("  Uploading %s (%.1f MB)..." % (clip_id, size_mb))
+
+        try:
+            proc = subprocess.run(cmd, capture_output=True, text=True, timeout=600)
+        except subprocess.TimeoutExpired:
+            self.logger.error("  %s upload timed out" % clip_id)
+            return {
+                "clip_id": clip_id,
+                "status": "failed",
+                "error": "Upload timed out (600s)",
+            }
+        except Exception as e:
+            self.logger.error("  %s failed: %s" % (clip_id, e))
+            return {
+                "clip_id": clip_id,
+                "status": "failed",
+                "error": str(e),
+            }
+
+        if proc.returncode != 0:
+            self.logger.error("  %s curl failed: %s" % (clip_id, proc.stderr[:200]))
+            return {
+                "clip_id": clip_id,
+                "status": "failed",
+                "error": "curl error: %s" % proc.stderr[:500],
+                "stdout": proc.stdout,
+            }
+
+        try:
+            resp_data = json.loads(proc.stdout)
+        except json.JSONDecodeError:
+            self.logger.error("  %s non-JSON response" % clip_id)
+            return {
+                "clip_id": clip_id,
+                "status": "failed",
+                "error": "non-JSON response from Upload-Post: %s" % proc.stdout[:200],
+            }
+
+        request_id = resp_data.get("request_id", resp_data.get("job_id"))
+        if request_id:
+            self.logger.info("  %s submitted (id: %s)" % (clip_id, request_id))
+            return {
+                "clip_id": clip_id,
+                "status": "submitted",
+                "platforms": platforms,
+                "request_id": request_id,
+                "scheduled": scheduled,
+                "response": resp_data,
+            }
+        if "error" in resp_data:
+            self.logger.error("  %s API error: %s" % (clip_id, resp_data["error"]))
+            return {
+                "clip_id": clip_id,
+                "status": "failed",
+                "error": resp_data["error"],
+                "response": resp_data,
+            }
+        self.logger.error("  %s missing request_id in response" % clip_id)
+        return {
+            "clip_id": clip_id,
+            "status": "failed",
+            "response": resp_data,
+        }
+
+    def _generate_schedule(self, clips, weekday_per_day, weekend_per_day, now=None):
         """Generate a simple schedule: assign clips to upcoming days."""
         schedule = []
-        now = datetime.now(timezone.utc)
+        now = now or datetime.now(timezone.utc)
         day_offset = 1  # Start scheduling from tomorrow
         clip_idx = 0
 
@@ -456,16 +466,18 @@ class PublishAgent(BaseAgent):
 
         return schedule
 
-    def _schedule_to_datetime(self, sched, tz_name):
-        """Convert a schedule entry to an ISO datetime."""
-        now = datetime.now(timezone.utc)
+    def _schedule_to_datetime(self, sched, tz_name, now=None):
+        """Convert a schedule entry to an ISO datetime.
+
+        Pass the publish run's `now` so every clip is scheduled against the
+        same reference time.
+        """
+        now = now or datetime.now(timezone.utc)
         day_offset = sched.get("day_offset", 0)
         time_slot = sched.get("time_slot", "morning")
 
         target_date = now + timedelta(days=day_offset)
 
-        # Map time slots to hours
-        hour_map = {"morning": 9, "afternoon": 14, "evening": 18}
-        hour = hour_map.get(time_slot, 12)
+        hour = TIME_SLOT_HOURS.get(time_slot, 12)
 
         return target_date.replace(hour=hour, minute=0, second=0, microsecond=0)
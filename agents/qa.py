@@ -5,33 +5,86 @@ Inputs:
     - subtitles/transcript.srt, metadata/metadata.json
 Outputs:
     - qa/qa.json (checks, warnings, overall pass/fail)
+    - qa/.ffprobe_cache.json (probe results reused by later QA runs)
 Dependencies:
     - ffprobe (media validation)
 Config:
     - processing.clip_min_seconds, processing.clip_max_seconds
 """
 
-import json
+import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
+
 from agents.base import BaseAgent
+from lib.atomic_write import read_json
 from lib.ffprobe import probe as ffprobe
 
+PROBE_CACHE_NAME = "qa/.ffprobe_cache.json"
+
+
+def _probe_summary(path: Path) -> dict:
+    """The slice of ffprobe output QA reads: format duration and stream types."""
+    data = ffprobe(path)
+    return {
+        "format": {"duration": data.get("format", {}).get("duration", 0)},
+        "streams": [
+            {"codec_type": s.get("codec_type")} for s in data.get("streams", [])
+        ],
+    }
+
 
 class QAAgent(BaseAgent):
     name = "qa"
 
+    def _probe_media(self, paths: list) -> dict:
+        """Probe summaries for paths, reusing qa/.ffprobe_cache.json entries for
+        files whose (path, mtime_ns, size) is unchanged since an earlier QA run.
+
+        Misses are probed at once: each probe is mostly ffprobe process
+        startup, so two in parallel cost about as much as one.
+        """
+        cache = self.load_json_safe(PROBE_CACHE_NAME)
+        keys = {}
+        for path in paths:
+            st = path.stat()
+            keys[path] = f"{path.resolve()}|{st.st_mtime_ns}|{st.st_size}"
+
+        probes = {p: cache[k] for p, k in keys.items() if k in cache}
+        misses = [p for p in paths if p not in probes]
+        if misses:
+            with ThreadPoolExecutor(max_workers=len(misses)) as pool:
+                probes.update(zip(misses, pool.map(_probe_summary, misses)))
+            # Only the current files' entries are kept, so the cache can't grow
+            self.save_json(PROBE_CACHE_NAME, {keys[p]: probes[p] for p in paths})
+        return probes
+
     def execute(self) -> dict:
         checks = []
         warnings = []
 
         # === Hard checks (must pass) ===
 
-        # 1. source_merged.mp4 exists and has audio
         merged = self.episode_dir / "source_merged.mp4"
-        if merged.exists():
-            probe = ffprobe(merged)
+        longform = self.episode_dir / "longform.mp4"
+        clips_file = self.episode_dir / "clips.json"
+        metadata_file = self.episode_dir / "metadata" / "metadata.json"
+
+        # Probe the media in the background while the JSON inputs are read
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            probing = pool.submit(
+                self._probe_media, [p for p in (merged, longform) if p.exists()]
+            )
+            clips_data = read_json(clips_file) if clips_file.exists() else None
+            meta = read_json(metadata_file) if metadata_file.exists() else None
+            probes = probing.result()
+
+        # 1. source_merged.mp4 exists and has audio
+        if merged in probes:
+            probe = probes[merged]
             duration = float(probe.get("format", {}).get("duration", 0))
             has_audio = any(
                 s["codec_type"] == "audio" for s in probe.get("streams", [])
@@ -59,9 +112,8 @@ class QAAgent(BaseAgent):
             })
 
         # 2. longform.mp4 exists
-        longform = self.episode_dir / "longform.mp4"
-        if longform.exists():
-            probe = ffprobe(longform)
+        if longform in probes:
+            probe = probes[longform]
             lf_duration = float(probe.get("format", {}).get("duration", 0))
             checks.append({
                 "name": "longform_exists",
@@ -76,18 +128,22 @@ class QAAgent(BaseAgent):
             })
 
         # 3. All shorts rendered
-        clips_file = self.episode_dir / "clips.json"
-        if clips_file.exists():
-            clips_data = json.loads(clips_file.read_text())
+        if clips_data is not None:
             clips = clips_data.get("clips", [])
             shorts_dir = self.episode_dir / "shorts"
 
+            # One directory listing instead of a stat per clip
+            try:
+                with os.scandir(shorts_dir) as entries:
+                    present = {e.name for e in entries if e.name.endswith(".mp4")}
+            except FileNotFoundError:
+                present = set()
+
             rendered = []
             missing = []
             for clip in clips:
                 clip_id = clip["id"]
-                short_path = shorts_dir / f"{clip_id}.mp4"
-                if short_path.exists():
+                if f"{clip_id}.mp4" in present:
                     rendered.append(clip_id)
                 else:
                     missing.append(clip_id)
@@ -104,13 +160,16 @@ class QAAgent(BaseAgent):
             # Clip durations in range
             clip_min = self.get_config("processing", "clip_min_seconds", default=30)
             clip_max = self.get_config("processing", "clip_max_seconds", default=90)
-            for clip in clips:
-                dur = clip.get("duration", 0)
-                if dur < clip_min or dur > clip_max:
-                    warnings.append({
-                        "name": f"clip_duration_{clip['id']}",
-                        "detail": f"{dur:.1f}s (expected {clip_min}-{clip_max}s)",
-                    })
+            durations = np.fromiter(
+                (c.get("duration", 0) for c in clips), dtype=np.float64, count=len(clips)
+            )
+            out_of_range = (durations < clip_min) | (durations > clip_max)
+            for i in np.flatnonzero(out_of_range).tolist():
+                clip, dur = clips[i], durations[i]
+                warnings.append({
+                    "name": f"clip_duration_{clip['id']}",
+                    "detail": f"{dur:.1f}s (expected {clip_min}-{clip_max}s)",
+                })
         else:
             checks.append({
                 "name": "clips_json_exists",
@@ -128,9 +187,7 @@ class QAAgent(BaseAgent):
         })
 
         # 5. Metadata exists
-        metadata_file = self.episode_dir / "metadata" / "metadata.json"
-        if metadata_file.exists():
-            meta = json.loads(metadata_file.read_text())
+        if meta is not None:
             has_longform = "longform" in meta
             has_clips = len(meta.get("clips", [])) > 0
             has_schedule = len(meta.get("schedule", [])) > 0
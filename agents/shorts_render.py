@@ -9,17 +9,18 @@ Outputs:
 Dependencies:
     - ffmpeg (render + concat), ffprobe (dimensions)
 Config:
-    - processing.shorts_crf, processing.shorts_audio_bitrate
+    - processing.shorts_crf, processing.shorts_audio_bitrate, processing.parallel_encodes
 """
 
-import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from agents.base import BaseAgent, timed_ffmpeg
+from agents.base import BaseAgent, stream_ffmpeg
 from lib.audio_mix import generate_audio_mix
 from lib.crop import compute_crop, resolve_speaker
 from lib.encoding import (
     get_video_encoder_args,
+    get_encode_concurrency,
+    get_hwaccel_input_args,
     get_color_metadata_args,
     get_lut_filter,
     get_scale_filter,
@@ -27,15 +28,22 @@ from lib.encoding import (
 )
 from lib.ffprobe import probe as ffprobe
 from lib.srt import fmt_timecode, escape_srt_path
+from lib.transcript_index import load_word_index, words_in_range
 
 
 class ShortsRenderAgent(BaseAgent):
     name = "shorts_render"
 
+    # libass force_style for burned-in captions
+    SUBTITLE_STYLE = (
+        "FontSize=12,PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,"
+        "BorderStyle=3,Outline=1,Shadow=0,MarginV=80"
+    )
+
     def execute(self) -> dict:
         clips_data = self.load_json("clips.json")
         segments_data = self.load_json("segments.json")
-        diarized = self.load_json("diarized_transcript.json")
+        word_index = load_word_index(self.episode_dir)
         merged_path = self.episode_dir / "source_merged.mp4"
 
         # Load crop config from episode.json
@@ -104,6 +112,9 @@ class ShortsRenderAgent(BaseAgent):
             "shorts_audio_bitrate", "192k"
         )
         encoder_args = get_video_encoder_args(self.config, crf_key="shorts_crf")
+        workers, threads = get_encode_concurrency(self.config, encoder_args)
+        if threads:
+            encoder_args = [*encoder_args, "-threads", str(threads)]
         lut_filter = get_lut_filter(self.config)
         if lut_filter:
             self.logger.info(
@@ -114,7 +125,7 @@ class ShortsRenderAgent(BaseAgent):
         rendered = []
         self.logger.info(f"Rendering {len(clips)} shorts...")
 
-        with ThreadPoolExecutor(max_workers=min(os.cpu_count() // 2, 6)) as executor:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
             futures = {}
             for clip in clips:
                 clip_id = clip["id"]
@@ -123,7 +134,7 @@ class ShortsRenderAgent(BaseAgent):
 
                 # Generate per-clip SRT
                 srt_path = subtitles_dir / f"{clip_id}.srt"
-                self._generate_clip_srt(diarized, start, end, srt_path)
+                self._generate_clip_srt(word_index, start, end, srt_path)
 
                 output_path = shorts_dir / f"{clip_id}.mp4"
                 future = executor.submit(
@@ -142,6 +153,7 @@ class ShortsRenderAgent(BaseAgent):
                     lut_filter,
                     audio_mix_path,
                     source_fps_int,
+                    threads,
                 )
                 futures[future] = clip_id
 
@@ -217,6 +229,7 @@ class ShortsRenderAgent(BaseAgent):
         lut_filter="",
         audio_mix_path=None,
         fps=30,
+        threads=None,
     ):
         """Render a 9:16 short with per-segment dynamic speaker crops."""
         clip_segs = self._get_clip_segments(segments, start, end)
@@ -265,6 +278,12 @@ class ShortsRenderAgent(BaseAgent):
         cmd_video = [
             "ffmpeg",
             "-y",
+            "-nostats",
+            # libass and the polish filters run single-threaded by default;
+            # give them the libx264 per-encode budget (hardware encoders run
+            # many clips at once, so they keep ffmpeg's default)
+            *(["-filter_threads", str(threads)] if threads else []),
+            *get_hwaccel_input_args(self.config),
             "-ss",
             str(coarse_seek),
             "-i",
@@ -286,17 +305,11 @@ class ShortsRenderAgent(BaseAgent):
             str(fps * 1000),
             "-use_editlist",
             "0",
-            "-movflags",
-            "+faststart",
+            # No +faststart: the mux below rewrites this file anyway, and
+            # faststart would cost a second full pass over the temp video
             str(temp_video),
         ]
-        timed_ffmpeg(
-            cmd_video,
-            agent_logger=self.logger,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        stream_ffmpeg(cmd_video, agent_logger=self.logger)
 
         if not temp_video.exists() or temp_video.stat().st_size == 0:
             raise RuntimeError(f"Video render produced empty file: {temp_video}")
@@ -308,6 +321,7 @@ class ShortsRenderAgent(BaseAgent):
         cmd_mux = [
             "ffmpeg",
             "-y",
+            "-nostats",
             "-i",
             str(temp_video),
             "-ss",
@@ -331,13 +345,7 @@ class ShortsRenderAgent(BaseAgent):
             "+faststart",
             str(output),
         ]
-        timed_ffmpeg(
-            cmd_mux,
-            agent_logger=self.logger,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
+        stream_ffmpeg(cmd_mux, agent_logger=self.logger)
         temp_video.unlink(missing_ok=True)
 
     def _generate_segment_srt(
@@ -446,43 +454,25 @@ class ShortsRenderAgent(BaseAgent):
         chain = f"crop={crop_w}:{crop_h}:{x}:{y},{scale},format=yuv420p"
         if polish:
             chain += f",{polish}"
-        chain += (
-            f",subtitles='{srt_escaped}':force_style="
-            f"'FontSize=12,PrimaryColour=&H00FFFFFF,OutlineColour=&H00000000,"
-            f"BorderStyle=3,Outline=1,Shadow=0,MarginV=80'"
-        )
+        chain += f",subtitles='{srt_escaped}':force_style='{self.SUBTITLE_STYLE}'"
         return chain
 
-    def _generate_clip_srt(self, diarized, start, end, srt_path):
+    def _generate_clip_srt(self, index, start, end, srt_path):
         """Slice word-level transcript to clip range and write SRT."""
-        words = []
-        last_end = -1.0
-        for utt in diarized.get("utterances", []):
-            for w in utt.get("words", []):
-                w_start = w.get("start", 0)
-                w_end = w.get("end", 0)
-                if w_start >= start and w_end <= end:
-                    # Skip overlapping words from other channels (multichannel bleed)
-                    if w_start < last_end - 0.05:
-                        continue
-                    words.append(w)
-                    last_end = w_end
+        starts, ends, texts = index
+        keep = words_in_range(index, start, end)
 
         # Group into ~4-word subtitle blocks, offset times to clip-relative
         srt_lines = []
-        idx = 1
-        i = 0
-        while i < len(words):
-            chunk = words[i : i + 4]
-            t_start = chunk[0]["start"] - start
-            t_end = chunk[-1]["end"] - start
-            text = " ".join(w.get("word", "") for w in chunk)
+        for idx, k in enumerate(range(0, len(keep), 4), start=1):
+            chunk = keep[k : k + 4]
+            t_start = float(starts[chunk[0]]) - start
+            t_end = float(ends[chunk[-1]]) - start
+            text = " ".join(texts[i] for i in chunk)
 
             srt_lines.append(
                 f"{idx}\n{fmt_timecode(t_start)} --> {fmt_timecode(t_end)}\n{text}\n"
             )
-            idx += 1
-            i += 4
 
         with open(srt_path, "w") as f:
             f.write("\n".join(srt_lines))
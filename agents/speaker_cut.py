@@ -114,7 +114,11 @@ class SpeakerCutAgent(BaseAgent):
         self.logger.info(f"{mode} cut: {len(segments)} segments, {n_frames} frames, {n_spk} speakers")
         work = self.episode_dir / "work"
         for i, s in enumerate(smoothed):
-            np.save(str(work / f"speaker_{i}_rms_db.npy"), s)
+            np.save(str(work / f"speaker_{i}_rms_db.npy"), s, allow_pickle=False)
+        # Summed energy across speakers — clip_miner mmaps this for silence snapping.
+        # Only relative minima matter there, so float16 (~0.25 dB steps) is plenty.
+        combined = np.sum(smoothed, axis=0).astype(np.float16)
+        np.save(str(work / "combined_rms_db.npy"), combined, allow_pickle=False)
         self.save_json("work/rms_meta.json", {"frame_seconds": frame_sec, "n_frames": int(n_frames)})
 
         result = {"segments": segments, "segment_count": len(segments),
@@ -163,7 +167,7 @@ class SpeakerCutAgent(BaseAgent):
                     arrays.append(np.load(str(npy)))
                 else:
                     data = self._extract_track(path, offset)
-                    np.save(str(npy), data)
+                    np.save(str(npy), data, allow_pickle=False)
                     arrays.append(data)
             if arrays is not None:
                 return arrays, "n_speaker"
@@ -178,7 +182,7 @@ class SpeakerCutAgent(BaseAgent):
             npy = work / f"{name}_channel.npy"
             if not npy.exists():
                 wav_data = self._load_wav(work / f"{name}.wav")
-                np.save(str(npy), wav_data)
+                np.save(str(npy), wav_data, allow_pickle=False)
         return [np.load(str(work / f"{n}_channel.npy")) for n in ("left", "right")], "lr"
 
     def _extract_track(self, path: Path, offset: float) -> np.ndarray:
@@ -190,17 +194,17 @@ class SpeakerCutAgent(BaseAgent):
         r = subprocess.run(cmd, capture_output=True)
         if r.returncode != 0:
             raise RuntimeError(f"Track extraction failed: {r.stderr.decode()[:300]}")
-        data = np.frombuffer(r.stdout, dtype=np.int16).astype(np.float32)
+        data = np.frombuffer(r.stdout, dtype=np.int16)
         # For negative offset (camera started first), prepend silence so
         # timestamps align to video time, not H6E time
         if offset < 0:
-            pad = np.zeros(int(abs(offset) * sr), dtype=np.float32)
+            pad = np.zeros(int(abs(offset) * sr), dtype=np.int16)
             data = np.concatenate([pad, data])
         return data
 
     @staticmethod
     def _load_wav(path: Path) -> np.ndarray:
-        return np.frombuffer(path.read_bytes(), dtype=np.int16).astype(np.float32)
+        return np.frombuffer(path.read_bytes(), dtype=np.int16)
 
     # -- Segment helpers ---------------------------------------------------------
 
@@ -18,13 +18,13 @@ Environment:
     - OPENAI_API_KEY
 """
 
-import json
 import os
 from pathlib import Path
 
 import httpx
 
 from agents.base import BaseAgent
+from lib.llm import anthropic_client, parse_json_response
 
 
 class ThumbnailGenAgent(BaseAgent):
@@ -84,9 +84,7 @@ class ThumbnailGenAgent(BaseAgent):
         if not openai_key:
             raise RuntimeError("OPENAI_API_KEY not set in environment")
 
-        import anthropic
-
-        client = anthropic.Anthropic(api_key=anthropic_key)
+        client = anthropic_client(anthropic_key)
         model = self.get_config(
             "clip_mining", "llm_model", default="claude-sonnet-4-20250514"
         )
@@ -134,14 +132,7 @@ Return ONLY the JSON object, no other text."""
             messages=[{"role": "user", "content": analysis_prompt}],
         )
 
-        response_text = response.content[0].text.strip()
-        if response_text.startswith("```"):
-            response_text = response_text.split("\n", 1)[1]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            response_text = response_text.strip()
-
-        analysis = json.loads(response_text)
+        analysis = parse_json_response(response.content[0].text)
         image_prompt = analysis["image_prompt"]
 
         self.logger.info(
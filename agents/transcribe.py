@@ -4,6 +4,7 @@ Two modes: multichannel (H6E per-speaker tracks, perfect attribution) or
 mono fallback (camera audio with diarize=true).
 """
 
+import functools
 import os
 import subprocess
 from pathlib import Path
@@ -12,8 +13,10 @@ import httpx
 
 from agents.base import BaseAgent
 from lib.srt import fmt_timecode
+from lib.transcript_index import write_word_index
 
 DEEPGRAM_URL = "https://api.deepgram.com/v1/listen"
+UPLOAD_CHUNK = 1024 * 1024  # bytes per read when streaming audio to Deepgram
 
 
 class TranscribeAgent(BaseAgent):
@@ -74,16 +77,20 @@ class TranscribeAgent(BaseAgent):
             url = f"{DEEPGRAM_URL}?{urlencode(params)}&" + "&".join(f"keyterm={k}" for k in keyterms)
             params = None
 
-        with open(audio_path, "rb") as f:
-            audio_data = f.read()
-
+        # Stream the audio from disk in 1 MiB chunks (with a Content-Length,
+        # so no chunked encoding) instead of reading the whole file into memory
         self.logger.info("Sending to Deepgram Nova-3...")
-        resp = httpx.post(
-            url, params=params,
-            headers={"Authorization": f"Token {api_key}",
-                     "Content-Type": "audio/flac" if multichannel else "audio/mp4"},
-            content=audio_data, timeout=600.0,
-        )
+        with open(audio_path, "rb") as f:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            resp = httpx.post(
+                url, params=params,
+                headers={"Authorization": f"Token {api_key}",
+                         "Content-Type": "audio/flac" if multichannel else "audio/mp4",
+                         "Content-Length": str(audio_path.stat().st_size)},
+                content=iter(functools.partial(f.read, UPLOAD_CHUNK), b""),
+                timeout=600.0,
+            )
         resp.raise_for_status()
         raw = resp.json()
 
@@ -91,6 +98,7 @@ class TranscribeAgent(BaseAgent):
 
         diarized = self._build_diarized_transcript(raw, multichannel, channel_map)
         self.save_json("diarized_transcript.json", diarized)
+        write_word_index(self.episode_dir, diarized)
 
         self._generate_srt(raw, multichannel)
 
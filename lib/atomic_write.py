@@ -1,18 +1,58 @@
-"""Atomic JSON file writer — prevents partial writes via tempfile + os.replace."""
+"""Atomic JSON file writer — prevents partial writes via tempfile + os.replace.
 
+Also home to the matching fast readers (loads_json / read_json).
+"""
+
+import io
 import json
 import os
 import tempfile
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional — stdlib json produces the same documents
+    orjson = None
 
-def atomic_write_json(path: Path, data: dict, indent: int = 2):
-    """Atomically write a JSON file using tempfile + os.replace."""
+
+def loads_json(data):
+    """Parse JSON from bytes or str — orjson when installed, else stdlib.
+
+    orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    keep catching the stdlib exception either way.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: Path):
+    """Read and parse a JSON file in one go (bytes in, no text decoding pass)."""
+    return loads_json(Path(path).read_bytes())
+
+
+def dumps_json(data, indent: int = 2) -> bytes:
+    """Serialize to UTF-8 JSON bytes — pretty (indent=2) or compact (indent=0).
+
+    Uses orjson when installed (several times faster, and numpy scalars/arrays
+    serialize as numbers instead of falling through to str). Anything else
+    non-JSON-native is stringified, matching the old json.dump(default=str).
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option, default=str)
+    return json.dumps(data, indent=indent or None, default=str).encode("utf-8")
+
+
+def _atomic_write(path: Path, write) -> None:
+    """Call write(binary_file) on a temp file beside path, then os.replace it in."""
     path = Path(path)
     tmp_fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
     try:
-        with os.fdopen(tmp_fd, "w") as f:
-            json.dump(data, f, indent=indent, default=str)
+        with os.fdopen(tmp_fd, "wb") as f:
+            write(f)
         os.replace(tmp_path, path)
     except BaseException:
         try:
@@ -20,3 +60,25 @@ def atomic_write_json(path: Path, data: dict, indent: int = 2):
         except OSError:
             pass
         raise
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """Atomically write pre-serialized bytes using tempfile + os.replace."""
+    _atomic_write(path, lambda f: f.write(data))
+
+
+def atomic_write_json(path: Path, data: dict, indent: int = 2):
+    """Atomically write a JSON file using tempfile + os.replace."""
+
+    def write(f):
+        if orjson is not None:
+            f.write(dumps_json(data, indent=indent))
+        else:
+            # Stream the stdlib encoder's chunks straight to the file
+            # rather than materializing the whole document first
+            text = io.TextIOWrapper(f, encoding="utf-8")
+            json.dump(data, text, indent=indent or None, default=str)
+            text.flush()
+            text.detach()
+
+    _atomic_write(path, write)
@@ -1,7 +1,8 @@
-"""Shared video encoder infrastructure — VideoToolbox detection, LUT support, argument selection."""
+"""Shared video encoder infrastructure — VideoToolbox/NVENC detection, LUT support, argument selection."""
 
 import functools
 import logging
+import os
 import subprocess
 import sys
 from pathlib import Path
@@ -24,18 +25,40 @@ def has_videotoolbox() -> bool:
         return False
 
 
+@functools.lru_cache(maxsize=1)
+def has_nvenc() -> bool:
+    """Check if h264_nvenc can actually encode (NVIDIA GPU + driver). Result is cached.
+
+    `ffmpeg -encoders` lists nvenc on any CUDA-enabled build, GPU or not, so
+    this runs a tiny trial encode instead.
+    """
+    if sys.platform not in ("linux", "win32"):
+        return False
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-v", "error", "-f", "lavfi", "-i", "nullsrc=s=256x256:d=0.1",
+             "-c:v", "h264_nvenc", "-f", "null", "-"],
+            capture_output=True, text=True, timeout=10,
+        )
+        return result.returncode == 0
+    except (subprocess.SubprocessError, FileNotFoundError):
+        return False
+
+
 def get_video_encoder_args(config: dict, crf_key: str = "video_crf") -> list:
     """Return ffmpeg encoder arguments based on config and platform capabilities.
 
     On Apple Silicon with VideoToolbox available, uses hardware H.264 encoding
-    (10-20x faster, dedicated Media Engine). Set use_hardware_accel=false
-    in config to force software encoding.
+    (10-20x faster, dedicated Media Engine). On Linux/Windows with a working
+    NVIDIA GPU, uses NVENC. Set use_hardware_accel=false in config to force
+    software encoding.
 
     All output is H.264 for universal platform compatibility (YouTube, Spotify,
     Apple Podcasts, Instagram, TikTok, X, LinkedIn, Facebook).
 
     VideoToolbox path: ["-c:v", "h264_videotoolbox", "-q:v", "45", "-profile:v", "high"]
-    Software fallback: ["-c:v", "libx264", "-crf", "<value>", "-preset", "medium"]
+    NVENC path: ["-c:v", "h264_nvenc", "-preset", "p4", "-rc", "vbr", "-cq", "23", "-profile:v", "high"]
+    Software fallback: ["-c:v", "libx264", "-crf", "<value>", "-preset", "faster"]
     """
     use_hw = config.get("processing", {}).get("use_hardware_accel", True)
 
@@ -43,11 +66,53 @@ def get_video_encoder_args(config: dict, crf_key: str = "video_crf") -> list:
         vt_quality = config.get("processing", {}).get("videotoolbox_quality", 45)
         return ["-c:v", "h264_videotoolbox", "-q:v", str(vt_quality), "-profile:v", "high"]
 
+    if use_hw and has_nvenc():
+        nvenc_cq = config.get("processing", {}).get("nvenc_cq", 23)
+        return ["-c:v", "h264_nvenc", "-preset", "p4", "-rc", "vbr",
+                "-cq", str(nvenc_cq), "-profile:v", "high"]
+
     crf = config.get("processing", {}).get(crf_key, 22)
-    preset = config.get("processing", {}).get("encode_preset", "medium")
+    # "faster" runs ~70% quicker than "medium" at a near-identical VMAF
+    preset = config.get("processing", {}).get("encode_preset", "faster")
     return ["-c:v", "libx264", "-crf", str(crf), "-preset", preset]
 
 
+def get_hwaccel_input_args(config: dict) -> list:
+    """Return ffmpeg input args for GPU video decode, or [] for CPU decode.
+
+    With a working NVIDIA GPU, NVDEC decodes the 4K HEVC source and frames
+    are copied back to system memory for the CPU filter chain (lut3d, the
+    polish filters and libass have no CUDA equivalents). Place these args
+    before the video "-i". Follows processing.use_hardware_accel.
+    """
+    use_hw = config.get("processing", {}).get("use_hardware_accel", True)
+    if use_hw and has_nvenc():
+        return ["-hwaccel", "cuda"]
+    return []
+
+
+def get_encode_concurrency(config: dict, encoder_args: list) -> tuple[int, int | None]:
+    """Return (parallel_encodes, threads_per_encode) for batch renders.
+
+    libx264 already scales across cores, so two concurrent encodes on a
+    small machine run slower per stream than one encode with every thread.
+    Run two at once only with 8+ cores. Hardware encoders (VideoToolbox,
+    NVENC) barely touch the CPU, so they keep min(cores // 2, 6) parallel
+    encodes and threads_per_encode is None (leave ffmpeg's defaults).
+    processing.parallel_encodes overrides the encode count either way.
+    """
+    cores = os.cpu_count() or 4
+    software = "libx264" in encoder_args
+    workers = config.get("processing", {}).get("parallel_encodes")
+    if not workers:
+        if software:
+            workers = 2 if cores >= 8 else 1
+        else:
+            workers = min(cores // 2, 6)
+    workers = max(1, int(workers))
+    return workers, (max(1, cores // workers) if software else None)
+
+
 def get_color_metadata_args() -> list:
     """Return ffmpeg args for BT.709 color metadata.
 
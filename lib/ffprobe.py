@@ -1,10 +1,19 @@
 """FFprobe wrapper -- single source of truth for media file probing."""
 
+import copy
+import functools
 import json
+import os
 import subprocess
 from pathlib import Path
 from typing import Tuple
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional — stdlib json parses the same output
+    _loads = json.loads
+
 
 def probe(path: Path) -> dict:
     """Run ffprobe and return parsed JSON with format + streams info.
@@ -18,12 +27,52 @@ def probe(path: Path) -> dict:
         str(path),
     ]
     result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-    return json.loads(result.stdout)
+    return _loads(result.stdout)
+
+
+@functools.lru_cache(maxsize=256)
+def _probe_keyed(path: str, mtime_ns: int, size: int) -> dict:
+    # mtime_ns/size are only part of the cache key: a rewritten file misses
+    return probe(Path(path))
+
+
+def probe_cached(path: Path) -> dict:
+    """probe(), memoized on (path, mtime_ns, size).
+
+    A file that is re-rendered or re-copied gets a fresh probe; an unchanged
+    one skips the ffprobe spawn. Returns a copy, so callers may mutate it.
+    Paths that can't be stat'ed fall through to an uncached probe().
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return probe(path)
+    return copy.deepcopy(_probe_keyed(str(path), st.st_mtime_ns, st.st_size))
+
+
+def probe_audio(path: Path) -> dict:
+    """Probe only the first audio stream: {"streams": [{codec_type, channels, sample_rate}]}.
+
+    Same shape as probe() so callers can search "streams" unchanged, but
+    ffprobe skips the container/format section and every other stream.
+    "streams" is empty when the file has no audio.
+    """
+    cmd = [
+        "ffprobe", "-v", "quiet",
+        "-select_streams", "a:0",
+        "-show_entries", "stream=codec_type,channels,sample_rate",
+        "-print_format", "json",
+        str(path),
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    data = _loads(result.stdout)
+    data.setdefault("streams", [])
+    return data
 
 
 def get_duration(path: Path) -> float:
     """Get media file duration in seconds."""
-    data = probe(path)
+    data = probe_cached(path)
     return float(data.get("format", {}).get("duration", 0))
 
 
@@ -32,7 +81,7 @@ def get_dimensions(path: Path) -> Tuple[int, int]:
 
     Raises StopIteration if no video stream found.
     """
-    data = probe(path)
+    data = probe_cached(path)
     video_stream = next(
         s for s in data["streams"] if s["codec_type"] == "video"
     )
@@ -45,7 +94,7 @@ def get_video_properties(path: Path) -> dict:
     Parses r_frame_rate (e.g. "30000/1001" for 29.97) into a float.
     Used by ingest to capture source properties for downstream agents.
     """
-    data = probe(path)
+    data = probe_cached(path)
     vs = next(s for s in data["streams"] if s["codec_type"] == "video")
 
     # Parse fractional frame rate
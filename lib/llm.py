@@ -0,0 +1,30 @@
+"""Shared Anthropic client and helpers for parsing Claude responses."""
+
+import functools
+import re
+
+from lib.atomic_write import loads_json
+
+# ```lang\n ... ``` — the closing fence is optional (truncated responses)
+_FENCE_RE = re.compile(r"\A```[^\n]*\n(.*?)(?:\n?```)?\Z", re.DOTALL)
+
+
+@functools.cache
+def anthropic_client(api_key: str):
+    """One client (and its HTTP connection pool) per API key, shared by every
+    agent in the process so later calls skip the TLS handshake."""
+    import anthropic
+
+    return anthropic.Anthropic(api_key=api_key)
+
+
+def strip_code_fence(text: str) -> str:
+    """Unwrap a markdown code fence around a response, if present."""
+    text = text.strip()
+    fenced = _FENCE_RE.match(text)
+    return fenced.group(1).strip() if fenced else text
+
+
+def parse_json_response(text: str):
+    """Parse a JSON response that may be wrapped in a markdown code fence."""
+    return loads_json(strip_code_fence(text))
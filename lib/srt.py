@@ -6,10 +6,10 @@ from pathlib import Path
 def fmt_timecode(seconds: float) -> str:
     """Format seconds as SRT timecode: HH:MM:SS,mmm"""
     seconds = max(0, seconds)
-    h = int(seconds // 3600)
-    m = int((seconds % 3600) // 60)
-    s = int(seconds % 60)
-    ms = int((seconds % 1) * 1000)
+    whole = int(seconds)
+    ms = int((seconds - whole) * 1000)  # == (seconds % 1) for seconds >= 0
+    m, s = divmod(whole, 60)
+    h, m = divmod(m, 60)
     return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
 
 
@@ -0,0 +1,82 @@
+"""Preflattened word index over diarized_transcript.json.
+
+Render agents only need each word's (start, end, text) to build captions,
+but diarized_transcript.json nests them under utterances and costs a full
+JSON parse per agent. The flattened, start-sorted arrays are cached next
+to the transcript as work/diarized_index.npz and rebuilt whenever the
+transcript is newer (e.g. after a transcript edit).
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+
+import numpy as np
+
+from lib.atomic_write import read_json
+
+logger = logging.getLogger("cascade")
+
+INDEX_NAME = "diarized_index.npz"
+
+WordIndex = tuple[np.ndarray, np.ndarray, list]
+
+
+def build_word_index(diarized: dict) -> WordIndex:
+    """Flatten all words once into (starts, ends, texts), stably sorted by start."""
+    words = [w for utt in diarized.get("utterances", []) for w in utt.get("words", [])]
+    starts = np.fromiter((w.get("start", 0) for w in words), dtype=np.float64, count=len(words))
+    ends = np.fromiter((w.get("end", 0) for w in words), dtype=np.float64, count=len(words))
+    order = np.argsort(starts, kind="stable")
+    texts = [words[i].get("word", "") for i in order]
+    return starts[order], ends[order], texts
+
+
+def write_word_index(episode_dir: Path, diarized: dict) -> WordIndex:
+    """Build the index from an in-memory transcript and cache it on disk."""
+    index = build_word_index(diarized)
+    path = Path(episode_dir) / "work" / INDEX_NAME
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    starts, ends, texts = index
+    with open(tmp, "wb") as f:
+        np.savez(f, starts=starts, ends=ends, texts=np.array(texts, dtype=np.str_))
+    tmp.replace(path)
+    return index
+
+
+def load_word_index(episode_dir: Path) -> WordIndex:
+    """Load the cached index, rebuilding it if missing or older than the transcript."""
+    episode_dir = Path(episode_dir)
+    src = episode_dir / "diarized_transcript.json"
+    path = episode_dir / "work" / INDEX_NAME
+    try:
+        if path.stat().st_mtime_ns >= src.stat().st_mtime_ns:
+            with np.load(path, allow_pickle=False) as data:
+                return data["starts"], data["ends"], data["texts"].tolist()
+    except (OSError, KeyError, ValueError) as e:
+        if path.exists():
+            logger.warning(f"Ignoring unreadable {path.name}: {e}")
+    return write_word_index(episode_dir, read_json(src))
+
+
+def words_in_range(index: WordIndex, start: float, end: float) -> list[int]:
+    """Indices of words fully inside [start, end], in time order.
+
+    Skips words that start before the previous kept word ends (multichannel
+    bleed: the same speech picked up on another speaker's channel).
+    """
+    starts, ends, _ = index
+    lo = int(np.searchsorted(starts, start, side="left"))
+    hi = int(np.searchsorted(starts, end, side="right"))
+    inside = np.flatnonzero(ends[lo:hi] <= end) + lo
+
+    keep = []
+    last_end = -1.0
+    for i in inside.tolist():
+        if starts[i] < last_end - 0.05:
+            continue
+        keep.append(i)
+        last_end = ends[i]
+    return keep
@@ -21,6 +21,13 @@ router = APIRouter(prefix="/api/episodes", tags=["pipeline"])
 
 OUTPUT_DIR = get_episodes_dir()
 
+try:
+    import h2  # noqa: F401 — enables HTTP/2 in httpx
+
+    _HAS_H2 = True
+except ImportError:
+    _HAS_H2 = False
+
 # Track running pipelines and cancellation
 _running = {}  # type: dict
 _cancel_requested = set()  # type: set
@@ -569,83 +576,82 @@ async def check_upload_urls(episode_id: str) -> CheckUploadUrlsResponse:
                         return yt[key]
         return None
 
-    # Longform check
-    longform_res = publish_data.get("longform") or {}
-    longform_status = longform_res.get("status")
-    longform_request_id = longform_res.get("request_id")
-    existing_url = episode.get("youtube_longform_url", "")
-
-    if existing_url:
-        result.longform = {"status": "live", "url": existing_url}
-    elif longform_status == "submitted" and longform_request_id:
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
+    # One client for every status call, so the longform and per-clip checks
+    # share a kept-alive connection (HTTP/2 when h2 is installed)
+    async with httpx.AsyncClient(
+        timeout=10.0,
+        headers={"Authorization": f"Apikey {api_key}"},
+        http2=_HAS_H2,
+    ) as client:
+        # Longform check
+        longform_res = publish_data.get("longform") or {}
+        longform_status = longform_res.get("status")
+        longform_request_id = longform_res.get("request_id")
+        existing_url = episode.get("youtube_longform_url", "")
+
+        if existing_url:
+            result.longform = {"status": "live", "url": existing_url}
+        elif longform_status == "submitted" and longform_request_id:
+            try:
                 resp = await client.get(
-                    status_url,
-                    params={"request_id": longform_request_id},
-                    headers={"Authorization": f"Apikey {api_key}"},
+                    status_url, params={"request_id": longform_request_id}
                 )
                 resp.raise_for_status()
                 data = resp.json()
-        except httpx.HTTPError as e:
-            logger.warning(
-                "Upload-Post status check failed for %s longform: %s",
-                episode_id,
-                e,
-            )
-            result.longform = {"status": "pending", "url": None, "error": str(e)}
-        else:
-            url = _extract_youtube_url(data)
-            if url:
-                episode["youtube_longform_url"] = url
-                episode["youtube_longform_url_captured_at"] = datetime.now(
-                    timezone.utc
-                ).isoformat()
-                atomic_write_json(episode_file, episode)
-                result.longform = {"status": "live", "url": url}
+            except httpx.HTTPError as e:
+                logger.warning(
+                    "Upload-Post status check failed for %s longform: %s",
+                    episode_id,
+                    e,
+                )
+                result.longform = {"status": "pending", "url": None, "error": str(e)}
             else:
-                result.longform = {
-                    "status": "pending",
-                    "url": None,
-                    "upload_post_state": data.get("status") or data.get("state"),
-                }
-    else:
-        result.longform = {"status": longform_status or "not_submitted", "url": None}
-
-    # Per-clip checks (best-effort; failures don't error the endpoint)
-    for clip_result in publish_data.get("shorts", []):
-        clip_id = clip_result.get("clip_id", "")
-        clip_request_id = clip_result.get("request_id")
-        if clip_result.get("status") != "submitted" or not clip_request_id:
-            result.shorts.append(
-                {
-                    "clip_id": clip_id,
-                    "status": clip_result.get("status", "unknown"),
-                    "url": None,
-                }
-            )
-            continue
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get(
-                    status_url,
-                    params={"request_id": clip_request_id},
-                    headers={"Authorization": f"Apikey {api_key}"},
+                url = _extract_youtube_url(data)
+                if url:
+                    episode["youtube_longform_url"] = url
+                    episode["youtube_longform_url_captured_at"] = datetime.now(
+                        timezone.utc
+                    ).isoformat()
+                    atomic_write_json(episode_file, episode)
+                    result.longform = {"status": "live", "url": url}
+                else:
+                    result.longform = {
+                        "status": "pending",
+                        "url": None,
+                        "upload_post_state": data.get("status") or data.get("state"),
+                    }
+        else:
+            result.longform = {"status": longform_status or "not_submitted", "url": None}
+
+        # Per-clip checks (best-effort; failures don't error the endpoint)
+        for clip_result in publish_data.get("shorts", []):
+            clip_id = clip_result.get("clip_id", "")
+            clip_request_id = clip_result.get("request_id")
+            if clip_result.get("status") != "submitted" or not clip_request_id:
+                result.shorts.append(
+                    {
+                        "clip_id": clip_id,
+                        "status": clip_result.get("status", "unknown"),
+                        "url": None,
+                    }
                 )
+                continue
+            try:
+                resp = await client.get(status_url, params={"request_id": clip_request_id})
                 resp.raise_for_status()
                 data = resp.json()
-            url = _extract_youtube_url(data)
-            result.shorts.append(
-                {
-                    "clip_id": clip_id,
-                    "status": "live" if url else "pending",
-                    "url": url,
-                }
-            )
-        except httpx.HTTPError as e:
-            result.shorts.append(
-                {"clip_id": clip_id, "status": "pending", "url": None, "error": str(e)}
-            )
+                url = _extract_youtube_url(data)
+                result.shorts.append(
+                    {
+                        "clip_id": clip_id,
+                        "status": "live" if url else "pending",
+                        "url": url,
+                    }
+                )
+            except httpx.HTTPError as e:
+                result.shorts.append(
+                    {"clip_id": clip_id, "status": "pending", "url": None, "error": str(e)}
+                )
 
     return result
 
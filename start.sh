@@ -45,6 +45,9 @@ fi
 echo "Installing dependencies..."
 uv pip install -r requirements.txt
 
+# ── Warm compiled-kernel caches (no-op unless numba is installed) ──────────
+.venv/bin/python -c "import agents.audio_analysis" || echo "WARNING: kernel warm-up failed (continuing)."
+
 # ── Load .env if present ────────────────────────────────────────────────────
 if [[ -f ".env" ]]; then
     echo "Loading .env..."
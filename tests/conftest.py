@@ -5,6 +5,8 @@ import os
 import pytest
 from pathlib import Path
 
+from lib.llm import anthropic_client
+
 
 @pytest.fixture
 def tmp_episode_dir(tmp_path):
@@ -160,3 +162,11 @@ def episode_with_clips(tmp_episode_dir, sample_episode_json, sample_clips):
     with open(tmp_episode_dir / "clips.json", "w") as f:
         json.dump({"clips": sample_clips}, f)
     return tmp_episode_dir
+
+
+@pytest.fixture(autouse=True)
+def _fresh_anthropic_client():
+    """lib.llm caches one client per API key — reset it so each test's mock is used."""
+    anthropic_client.cache_clear()
+    yield
+    anthropic_client.cache_clear()
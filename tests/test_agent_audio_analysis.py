@@ -6,9 +6,36 @@ import numpy as np
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
+from agents import audio_analysis
 from agents.audio_analysis import AudioAnalysisAgent
 
 
+@pytest.fixture(autouse=True)
+def _no_pyav(request):
+    """Exercise the ffprobe/ffmpeg path regardless of whether PyAV is installed."""
+    if "pyav" in request.node.name:
+        yield
+        return
+    with patch.object(AudioAnalysisAgent, "_decode_pyav", return_value=None):
+        yield
+
+
+def _write_stereo_mp4(path, left, right, sample_rate=48000):
+    import av
+
+    with av.open(str(path), "w") as out:
+        stream = out.add_stream("aac", rate=sample_rate)
+        stream.layout = "stereo"
+        frame = av.AudioFrame.from_ndarray(
+            np.stack([left, right], axis=1).reshape(1, -1), format="s16", layout="stereo"
+        )
+        frame.sample_rate = sample_rate
+        for packet in stream.encode(frame):
+            out.mux(packet)
+        for packet in stream.encode(None):
+            out.mux(packet)
+
+
 class TestAudioAnalysisAgent:
     def _setup_merged(self, episode_dir):
         """Create a dummy source_merged.mp4 (just needs to exist for path checks)."""
@@ -44,13 +71,12 @@ class TestAudioAnalysisAgent:
             ],
         }
 
-        # Create identical WAV data
-        samples = np.random.randint(-32768, 32767, 48000, dtype=np.int16)
+        # Create identical channel data
+        samples = np.random.randint(-32768, 32767, 48000, dtype=np.int16).astype(np.float32)
 
         agent = AudioAnalysisAgent(tmp_episode_dir, sample_config)
         with patch("agents.audio_analysis.ffprobe", return_value=mock_probe), \
-             patch.object(agent, "_extract_channels"), \
-             patch.object(agent, "_load_wav", return_value=samples.astype(np.float32)):
+             patch.object(agent, "_extract_channels", return_value=(samples, samples)):
             result = agent.execute()
 
         assert result["classification"] == "audio_channels_identical"
@@ -73,20 +99,116 @@ class TestAudioAnalysisAgent:
         left = rng.randint(-32768, 32767, 48000).astype(np.float32)
         right = rng.randint(-32768, 32767, 48000).astype(np.float32)
 
-        call_count = [0]
-        def mock_load_wav(path):
-            call_count[0] += 1
-            return left if call_count[0] == 1 else right
-
         agent = AudioAnalysisAgent(tmp_episode_dir, sample_config)
         with patch("agents.audio_analysis.ffprobe", return_value=mock_probe), \
-             patch.object(agent, "_extract_channels"), \
-             patch.object(agent, "_load_wav", side_effect=mock_load_wav):
+             patch.object(agent, "_extract_channels", return_value=(left, right)):
             result = agent.execute()
 
         assert result["classification"] == "true_stereo"
         assert result["audio_channels_identical"] is False
 
+    def test_channels_saved_as_npy(self, tmp_episode_dir, sample_config):
+        self._setup_merged(tmp_episode_dir)
+
+        mock_probe = {
+            "format": {"duration": "60"},
+            "streams": [{"codec_type": "audio", "channels": 2, "sample_rate": "48000"}],
+        }
+
+        rng = np.random.RandomState(7)
+        left = rng.randint(-32768, 32767, 16000).astype(np.float32)
+        right = rng.randint(-32768, 32767, 16000).astype(np.float32)
+
+        agent = AudioAnalysisAgent(tmp_episode_dir, sample_config)
+        with patch("agents.audio_analysis.ffprobe", return_value=mock_probe), \
+             patch.object(agent, "_extract_channels", return_value=(left, right)):
+            agent.execute()
+
+        work = tmp_episode_dir / "work"
+        np.testing.assert_array_equal(np.load(work / "left_channel.npy"), left)
+        np.testing.assert_array_equal(np.load(work / "right_channel.npy"), right)
+
+    def test_extract_channels_deinterleaves_stdout(self, tmp_episode_dir, sample_config):
+        interleaved = np.array([1, -1, 2, -2, 3, -3], dtype=np.int16)
+        completed = MagicMock(returncode=0, stdout=interleaved.tobytes(), stderr=b"")
+
+        agent = AudioAnalysisAgent(tmp_episode_dir, sample_config)
+        with patch("agents.audio_analysis.subprocess.run", return_value=completed):
+            left, right = agent._extract_channels(tmp_episode_dir / "source_merged.mp4")
+
+        assert left.tolist() == [1, 2, 3]
+        assert right.tolist() == [-1, -2, -3]
+        assert left.dtype == np.int16 and right.dtype == np.int16
+
+    def test_channel_stats_matches_numpy(self):
+        rng = np.random.RandomState(3)
+        left = rng.normal(0, 3000, 20000).astype(np.float32)
+        right = (0.5 * left + rng.normal(0, 2000, 20000)).astype(np.float32)
+
+        corr, left_rms, right_rms = AudioAnalysisAgent._channel_stats(left, right)
+
+        assert corr == pytest.approx(np.corrcoef(left, right)[0, 1], abs=1e-4)
+        assert left_rms == pytest.approx(np.sqrt(np.mean(left.astype(np.float64) ** 2)), rel=1e-4)
+        assert right_rms == pytest.approx(np.sqrt(np.mean(right.astype(np.float64) ** 2)), rel=1e-4)
+
+    def test_numba_kernel_matches_numpy_fallback(self):
+        pytest.importorskip("numba")
+        rng = np.random.RandomState(5)
+        left = rng.randint(-32768, 32767, 10000).astype(np.int16)
+        right = rng.randint(-32768, 32767, 10000).astype(np.int16)
+
+        fused = audio_analysis._accumulate_stats_numba(left, right)
+        blocked = audio_analysis._accumulate_stats_numpy(left, right)
+
+        assert fused == pytest.approx(blocked, rel=1e-5)
+
+    def test_pyav_decode_path(self, tmp_episode_dir, sample_config):
+        pytest.importorskip("av")
+        t = np.arange(96000) / 48000
+        left = (np.sin(2 * np.pi * 440 * t) * 10000).astype(np.int16)
+        right = (np.sin(2 * np.pi * 700 * t) * 3000).astype(np.int16)
+        _write_stereo_mp4(tmp_episode_dir / "source_merged.mp4", left, right)
+
+        agent = AudioAnalysisAgent(tmp_episode_dir, sample_config)
+        with patch("agents.audio_analysis.ffprobe") as probe, \
+             patch.object(agent, "_extract_channels") as extract:
+            result = agent.execute()
+
+        probe.assert_not_called()
+        extract.assert_not_called()
+        assert result["channels"] == 2
+        assert result["classification"] == "true_stereo"
+        # ~10 dB louder on the left (10000 vs 3000 amplitude)
+        assert result["rms_delta_db"] == pytest.approx(20 * np.log10(10000 / 3000), abs=0.5)
+        saved = np.load(tmp_episode_dir / "work" / "left_channel.npy")
+        assert saved.dtype == np.int16 and len(saved) == pytest.approx(32000, rel=0.05)
+
+    @pytest.mark.parametrize("codec,fmt", [("pcm_s16le", "wav"), ("aac", "mp4")])
+    def test_pyav_multichannel_uses_first_two_channels(
+        self, tmp_episode_dir, sample_config, codec, fmt
+    ):
+        av = pytest.importorskip("av")
+        t = np.arange(48000) / 48000
+        tone = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16)
+        noise = np.random.default_rng(0).integers(-20000, 20000, t.size, dtype=np.int16)
+        # Channels 0/1 identical; channels 2/3 loud and unrelated
+        quad = np.stack([tone, tone, noise, -noise], axis=1)
+        with av.open(str(tmp_episode_dir / "source_merged.mp4"), "w", format=fmt) as out:
+            stream = out.add_stream(codec, rate=48000)
+            stream.layout = "quad"
+            frame = av.AudioFrame.from_ndarray(quad.reshape(1, -1), format="s16", layout="quad")
+            frame.sample_rate = 48000
+            for packet in stream.encode(frame):
+                out.mux(packet)
+            for packet in stream.encode(None):
+                out.mux(packet)
+
+        result = AudioAnalysisAgent(tmp_episode_dir, sample_config).execute()
+
+        assert result["channels"] == 4
+        assert result["correlation"] == pytest.approx(1.0, abs=1e-3)
+        assert result["rms_delta_db"] == pytest.approx(0.0, abs=0.1)
+
     def test_no_audio_stream_raises(self, tmp_episode_dir, sample_config):
         self._setup_merged(tmp_episode_dir)
 
@@ -144,15 +266,9 @@ class TestAudioAnalysisAgent:
         left = base
         right = base + noise  # Correlated but with significant noise
 
-        call_count = [0]
-        def mock_load_wav(path):
-            call_count[0] += 1
-            return left if call_count[0] == 1 else right
-
         agent = AudioAnalysisAgent(tmp_episode_dir, sample_config)
         with patch("agents.audio_analysis.ffprobe", return_value=mock_probe), \
-             patch.object(agent, "_extract_channels"), \
-             patch.object(agent, "_load_wav", side_effect=mock_load_wav):
+             patch.object(agent, "_extract_channels", return_value=(left, right)):
             result = agent.execute()
 
         # With strict thresholds, this should be classified as true_stereo
@@ -0,0 +1,43 @@
+"""Tests for the backup agent."""
+
+from unittest.mock import patch, MagicMock
+
+from agents.backup import BackupAgent, _humanize
+
+
+RSYNC_STATS = """
+Number of files: 42 (reg: 40, dir: 2)
+Number of regular files transferred: 3
+Total file size: 5,368,709,120 bytes
+Total transferred file size: 1,048,576 bytes
+"""
+
+
+class TestBackupAgent:
+    def test_humanize(self):
+        assert _humanize(512) == "512B"
+        assert _humanize(4096) == "4.0K"
+        assert _humanize(5 * 1024 ** 3) == "5.0G"
+
+    def test_backup_size_from_rsync_stats(self, tmp_episode_dir, sample_config, tmp_path):
+        sample_config["paths"]["backup_dir"] = str(tmp_path / "backup")
+        rsync = MagicMock(returncode=0, stdout=RSYNC_STATS, stderr="")
+
+        agent = BackupAgent(tmp_episode_dir, sample_config)
+        with patch("agents.backup.subprocess.run", return_value=rsync) as mock_run:
+            result = agent.execute()
+
+        # One rsync call only — no du walk
+        assert mock_run.call_count == 1
+        assert "--stats" in mock_run.call_args[0][0]
+        assert result["backup_size"] == "5.0G"
+
+    def test_backup_size_unknown_without_stats(self, tmp_episode_dir, sample_config, tmp_path):
+        sample_config["paths"]["backup_dir"] = str(tmp_path / "backup")
+        rsync = MagicMock(returncode=0, stdout="", stderr="")
+
+        agent = BackupAgent(tmp_episode_dir, sample_config)
+        with patch("agents.backup.subprocess.run", return_value=rsync):
+            result = agent.execute()
+
+        assert result["backup_size"] == "unknown"
@@ -3,9 +3,16 @@
 import json
 from unittest.mock import patch, MagicMock
 
+from agents import clip_miner
 from agents.clip_miner import ClipMinerAgent
 
 
+def _set_stream_text(mock_client, text):
+    """Make mock_client.messages.stream(...) yield text as a single chunk."""
+    stream = mock_client.messages.stream.return_value.__enter__.return_value
+    stream.text_stream = iter([text])
+
+
 class TestClipMinerAgent:
     def _setup_inputs(self, episode_dir):
         """Create required input files."""
@@ -63,6 +70,13 @@ class TestClipMinerAgent:
         assert "Speaker 1" in result
         assert "nuclear power" in result
 
+    def test_format_transcript_missing_keys(self, tmp_episode_dir, sample_config):
+        agent = ClipMinerAgent(tmp_episode_dir, sample_config)
+        result = agent._format_transcript(
+            {"utterances": [{"start": 1.0, "end": 2.0, "speaker": 0, "text": "hi"}, {"text": "bare"}]}
+        )
+        assert result == "[1.0s - 2.0s] Speaker 0: hi\n[0.0s - 0.0s] Speaker ?: bare"
+
     def test_get_dominant_speaker(self, tmp_episode_dir, sample_config):
         self._setup_inputs(tmp_episode_dir)
         agent = ClipMinerAgent(tmp_episode_dir, sample_config)
@@ -78,6 +92,24 @@ class TestClipMinerAgent:
         # No overlap
         assert agent._get_dominant_speaker(100.0, 110.0, segments) == "BOTH"
 
+    def test_get_dominant_speakers_batch(self, tmp_episode_dir, sample_config):
+        agent = ClipMinerAgent(tmp_episode_dir, sample_config)
+        segments = [
+            {"start": 0.0, "end": 30.0, "speaker": "R"},
+            {"start": 30.0, "end": 60.0, "speaker": "L"},
+            {"start": 60.0, "end": 90.0, "speaker": "R"},
+        ]
+        clips = [
+            {"start_seconds": 20.0, "end_seconds": 70.0},   # R 20s vs L 30s
+            {"start_seconds": 10.0, "end_seconds": 80.0},   # R 40s vs L 30s
+            {"start_seconds": 20.0, "end_seconds": 40.0},   # tie → first overlapping (R)
+            {"start_seconds": 95.0, "end_seconds": 99.0},   # no overlap
+            {"start_seconds": 50.0, "end_seconds": 70.0},   # tie → first overlapping (L)
+        ]
+
+        assert agent._get_dominant_speakers(clips, segments) == ["L", "R", "R", "BOTH", "L"]
+        assert agent._get_dominant_speakers(clips, []) == ["BOTH"] * 5
+
     def test_snap_to_silence_no_rms(self, tmp_episode_dir, sample_config):
         self._setup_inputs(tmp_episode_dir)
         agent = ClipMinerAgent(tmp_episode_dir, sample_config)
@@ -88,6 +120,65 @@ class TestClipMinerAgent:
         # Without RMS data, should return unchanged
         assert result[0]["start_seconds"] == 30.0
 
+    def test_snap_to_silence_npy(self, tmp_episode_dir, sample_config):
+        import numpy as np
+
+        self._setup_inputs(tmp_episode_dir)
+        work = tmp_episode_dir / "work"
+        rms = np.full(1200, -20.0)
+        rms[295] = -80.0  # quiet frame at 29.5s
+        rms[912] = -80.0  # quiet frame at 91.2s
+        np.save(work / "left_rms_db.npy", rms)
+        np.save(work / "right_rms_db.npy", rms)
+        (work / "rms_meta.json").write_text(json.dumps({"frame_seconds": 0.1}))
+
+        agent = ClipMinerAgent(tmp_episode_dir, sample_config)
+        clips = [{"start_seconds": 30.0, "end_seconds": 90.0}]
+        result = agent._snap_to_silence(clips, {})
+
+        assert result[0]["start_seconds"] == 29.5
+        assert result[0]["end_seconds"] == 91.2
+
+    def test_snap_to_silence_prefers_combined_npy(self, tmp_episode_dir, sample_config):
+        import numpy as np
+
+        self._setup_inputs(tmp_episode_dir)
+        work = tmp_episode_dir / "work"
+        combined = np.full(1200, -40.0)
+        combined[310] = -160.0  # quiet frame at 31.0s
+        np.save(work / "combined_rms_db.npy", combined)
+        # Stale per-channel files point elsewhere and must be ignored
+        stale = np.full(1200, -20.0)
+        stale[280] = -80.0
+        np.save(work / "left_rms_db.npy", stale)
+        np.save(work / "right_rms_db.npy", stale)
+        (work / "rms_meta.json").write_text(json.dumps({"frame_seconds": 0.1}))
+
+        agent = ClipMinerAgent(tmp_episode_dir, sample_config)
+        result = agent._snap_to_silence([{"start_seconds": 30.0, "end_seconds": 90.0}], {})
+
+        assert result[0]["start_seconds"] == 31.0
+
+    def test_legacy_rms_json_migrated_to_npy(self, tmp_episode_dir, sample_config):
+        import numpy as np
+
+        self._setup_inputs(tmp_episode_dir)
+        work = tmp_episode_dir / "work"
+        rms = [-20.0] * 1200
+        rms[295] = -80.0
+        (work / "rms_data.json").write_text(json.dumps(
+            {"frame_seconds": 0.1, "left_rms_db": rms, "right_rms_db": rms}
+        ))
+
+        agent = ClipMinerAgent(tmp_episode_dir, sample_config)
+        result = agent._snap_to_silence([{"start_seconds": 30.0, "end_seconds": 60.0}], {})
+
+        assert result[0]["start_seconds"] == 29.5
+        combined = np.load(work / "combined_rms_db.npy")
+        assert combined.dtype == np.float16
+        assert combined[295] == -160.0
+        assert json.loads((work / "rms_meta.json").read_text())["frame_seconds"] == 0.1
+
     @patch("anthropic.Anthropic")
     def test_execute_integration(
         self, mock_anthropic_cls, tmp_episode_dir, sample_config, monkeypatch
@@ -126,13 +217,17 @@ class TestClipMinerAgent:
             )
         ]
 
-        mock_client.messages.create.return_value = combined_response
+        _set_stream_text(mock_client, combined_response.content[0].text)
 
         agent = ClipMinerAgent(tmp_episode_dir, sample_config)
         result = agent.execute()
 
         assert result["clip_count"] == 1
         assert (tmp_episode_dir / "clips.json").exists()
+        # Episode info is returned for the pipeline to merge, but not persisted in clips.json
+        assert result["guest_name"] == "John"
+        assert result["episode_name"] == "Test"
+        assert "guest_name" not in json.loads((tmp_episode_dir / "clips.json").read_text())
 
     def test_clips_get_ids_and_ranks(self, tmp_episode_dir, sample_config, monkeypatch):
         monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
@@ -173,7 +268,7 @@ class TestClipMinerAgent:
                 )
             )
         ]
-        mock_client.messages.create.return_value = combined_response
+        _set_stream_text(mock_client, combined_response.content[0].text)
 
         with patch("anthropic.Anthropic", return_value=mock_client):
             agent = ClipMinerAgent(tmp_episode_dir, sample_config)
@@ -221,10 +316,95 @@ class TestClipMinerAgent:
                 + "\n```"
             )
         ]
-        mock_client.messages.create.return_value = combined_response
+        _set_stream_text(mock_client, combined_response.content[0].text)
 
         with patch("anthropic.Anthropic", return_value=mock_client):
             agent = ClipMinerAgent(tmp_episode_dir, sample_config)
             result = agent.execute()
 
         assert result["clip_count"] == 1
+
+    def test_episode_json_not_rewritten_when_unchanged(
+        self, tmp_episode_dir, sample_config, monkeypatch
+    ):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        monkeypatch.setenv("CASCADE_ALLOW_API_CLIP_MINER", "1")
+        self._setup_inputs(tmp_episode_dir)
+        info = {
+            "guest_name": "John",
+            "guest_title": "Engineer",
+            "episode_title": "Test",
+            "episode_description": "A test",
+        }
+        episode = {
+            "episode_id": "ep_test",
+            "guest_name": "John",
+            "guest_title": "Engineer",
+            "episode_name": "Test",
+            "episode_description": "A test",
+        }
+        (tmp_episode_dir / "episode.json").write_text(json.dumps(episode))
+
+        mock_client = MagicMock()
+        _set_stream_text(mock_client, json.dumps({"episode_info": info, "clips": []}))
+
+        with patch("anthropic.Anthropic", return_value=mock_client):
+            agent = ClipMinerAgent(tmp_episode_dir, sample_config)
+            with patch.object(agent, "save_json", wraps=agent.save_json) as save:
+                agent.execute()
+
+        saved = [c.args[0] for c in save.call_args_list]
+        assert "episode.json" not in saved
+        assert "clips.json" in saved
+
+    def test_batch_api_path(self, tmp_episode_dir, sample_config, monkeypatch):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        monkeypatch.setenv("CASCADE_ALLOW_API_CLIP_MINER", "1")
+        monkeypatch.setattr(clip_miner.time, "sleep", lambda _: None)
+        self._setup_inputs(tmp_episode_dir)
+        sample_config.setdefault("clip_mining", {})["use_batch_api"] = True
+
+        payload = json.dumps({
+            "episode_info": {"guest_name": "John"},
+            "clips": [{"start_seconds": 30.0, "end_seconds": 60.0, "title": "A"}],
+        })
+        mock_client = MagicMock()
+        batches = mock_client.messages.batches
+        batches.create.return_value = MagicMock(id="b1", processing_status="in_progress")
+        batches.retrieve.return_value = MagicMock(id="b1", processing_status="ended")
+        entry = MagicMock(custom_id="clip_mining")
+        entry.result.type = "succeeded"
+        entry.result.message.content = [MagicMock(type="text", text=payload)]
+        batches.results.return_value = iter([entry])
+
+        with patch("anthropic.Anthropic", return_value=mock_client):
+            result = ClipMinerAgent(tmp_episode_dir, sample_config).execute()
+
+        assert result["clip_count"] == 1
+        batches.retrieve.assert_called_once_with("b1")
+        mock_client.messages.stream.assert_not_called()
+
+    def test_transcript_block_is_cached_prefix(
+        self, tmp_episode_dir, sample_config, monkeypatch
+    ):
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        monkeypatch.setenv("CASCADE_ALLOW_API_CLIP_MINER", "1")
+        self._setup_inputs(tmp_episode_dir)
+
+        mock_client = MagicMock()
+        _set_stream_text(mock_client, json.dumps({"episode_info": {}, "clips": []}))
+        with patch("anthropic.Anthropic", return_value=mock_client):
+            ClipMinerAgent(tmp_episode_dir, sample_config).execute()
+
+        kwargs = mock_client.messages.stream.call_args.kwargs
+        content = kwargs["messages"][0]["content"]
+        assert content[0]["cache_control"] == {"type": "ephemeral"}
+        assert "nuclear power" in content[0]["text"]
+        assert "nuclear power" not in content[1]["text"]
+        assert "cache_control" not in content[1]
+
+        # Instructions carry no per-episode values, so they're shareable
+        system = kwargs["system"][0]
+        assert system["cache_control"] == {"type": "ephemeral"}
+        assert "120.0" not in system["text"]
+        assert "120.0" in content[1]["text"]
@@ -30,7 +30,7 @@ class TestIngestAgent:
         with pytest.raises(ValueError, match="source_path not set"):
             agent.execute()
 
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_single_file_ingest(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
         source_file = tmp_path / "test.MP4"
@@ -45,7 +45,7 @@ class TestIngestAgent:
         assert result["file_count"] == 1
         assert result["total_duration_seconds"] == pytest.approx(120.0, abs=1)
 
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_directory_ingest_filters_resource_forks(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
         source_dir = tmp_path / "DCIM"
@@ -74,7 +74,7 @@ class TestIngestAgent:
         with pytest.raises(FileNotFoundError, match="No MP4 files"):
             agent.execute()
 
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_duration_validation_mismatch(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
         source_file = tmp_path / "test.MP4"
@@ -92,7 +92,7 @@ class TestIngestAgent:
         with pytest.raises(RuntimeError, match="Duration mismatch"):
             agent.execute()
 
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_duration_validation_within_tolerance(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
         """A small duration difference (<1s) should not raise."""
@@ -111,7 +111,7 @@ class TestIngestAgent:
         assert result["file_count"] == 1
         assert result["files"][0]["copy_validated"] is True
 
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_files_sorted_by_creation_time(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
         source_dir = tmp_path / "DCIM"
@@ -136,7 +136,7 @@ class TestIngestAgent:
         assert "0001" in result["files"][0]["filename"]
         assert "0002" in result["files"][1]["filename"]
 
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_result_structure(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
         source_file = tmp_path / "test.MP4"
@@ -153,7 +153,7 @@ class TestIngestAgent:
         assert "total_size_bytes" in result
         assert "duration_seconds" in result
 
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_dest_path_set(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
         source_file = tmp_path / "test.MP4"
@@ -167,7 +167,7 @@ class TestIngestAgent:
         assert result["files"][0]["dest_path"] is not None
         assert result["files"][0]["copy_validated"] is True
 
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_multi_source_path_list(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
         """Test that source_path can be a list of paths."""
@@ -186,7 +186,7 @@ class TestIngestAgent:
 
         assert result["file_count"] == 2
 
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_lowercase_mp4_extension(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
         """Test that lowercase .mp4 files are also discovered."""
@@ -207,7 +207,7 @@ class TestAudioFileClassification:
     """Test audio track classification from Zoom H6E filenames."""
 
     @patch.object(IngestAgent, "_sync_audio", return_value={"status": "skipped"})
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_builtin_mic_classification(self, mock_probe, mock_copy, mock_sync, tmp_episode_dir, sample_config, tmp_path):
         """TrMic suffix should be classified as builtin_mic."""
@@ -230,7 +230,7 @@ class TestAudioFileClassification:
         assert tracks[0]["track_type"] == "builtin_mic"
 
     @patch.object(IngestAgent, "_sync_audio", return_value={"status": "skipped"})
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_stereo_mix_classification(self, mock_probe, mock_copy, mock_sync, tmp_episode_dir, sample_config, tmp_path):
         """TrLR suffix should be classified as stereo_mix."""
@@ -253,7 +253,7 @@ class TestAudioFileClassification:
         assert tracks[0]["track_type"] == "stereo_mix"
 
     @patch.object(IngestAgent, "_sync_audio", return_value={"status": "skipped"})
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_input_track_classification(self, mock_probe, mock_copy, mock_sync, tmp_episode_dir, sample_config, tmp_path):
         """TrN suffix should be classified as input with track_number."""
@@ -278,7 +278,7 @@ class TestAudioFileClassification:
             assert t["track_type"] == "input"
 
     @patch.object(IngestAgent, "_sync_audio", return_value={"status": "skipped"})
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_track_number_extraction(self, mock_probe, mock_copy, mock_sync, tmp_episode_dir, sample_config, tmp_path):
         """Track numbers should be extracted from TrN suffixes."""
@@ -302,7 +302,7 @@ class TestAudioFileClassification:
         assert track_numbers == [1, 2, 3, 4]
 
     @patch.object(IngestAgent, "_sync_audio", return_value={"status": "skipped"})
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_audio_resource_fork_filtered(self, mock_probe, mock_copy, mock_sync, tmp_episode_dir, sample_config, tmp_path):
         """macOS ._ resource fork WAV files should be filtered out."""
@@ -323,7 +323,7 @@ class TestAudioFileClassification:
 
         assert result["audio"]["track_count"] == 1
 
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_no_wav_files_raises(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
         """Empty audio directory should raise FileNotFoundError."""
@@ -342,7 +342,7 @@ class TestAudioFileClassification:
         with pytest.raises(FileNotFoundError, match="No WAV files"):
             agent.execute()
 
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_missing_audio_path_raises(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
         """Non-existent audio_path should raise FileNotFoundError."""
@@ -359,7 +359,7 @@ class TestAudioFileClassification:
             agent.execute()
 
     @patch.object(IngestAgent, "_sync_audio", return_value={"status": "skipped"})
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_mixed_track_types(self, mock_probe, mock_copy, mock_sync, tmp_episode_dir, sample_config, tmp_path):
         """All three track types should be correctly classified when mixed."""
@@ -386,7 +386,7 @@ class TestAudioFileClassification:
 class TestAudioSyncOffset:
     """Test the audio sync cross-correlation logic."""
 
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_sync_prefers_stereo_mix_and_result_fields(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
         """Sync should prefer stereo_mix and return all required fields."""
@@ -419,7 +419,7 @@ class TestAudioSyncOffset:
                        "video_file", "video_duration"):
             assert field in sync, f"Missing field: {field}"
 
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_sync_fallback_to_builtin_mic(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
         """If no stereo_mix, sync should fall back to builtin_mic."""
@@ -444,7 +444,7 @@ class TestAudioSyncOffset:
         assert result["audio_sync"]["status"] in ("ok", "low_confidence")
         assert result["audio_sync"]["sync_track"] == "260311_143505_TrMic.WAV"
 
-    @patch("shutil.copy2")
+    @patch("agents.ingest._copy_file")
     @patch("agents.ingest.ffprobe")
     def test_sync_short_audio_returns_too_short(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
         """Audio shorter than 2 seconds should return too_short status."""
@@ -473,3 +473,61 @@ class TestAudioSyncOffset:
             mock_run.return_value = MagicMock(returncode=1, stderr=b"error")
             with pytest.raises(RuntimeError, match="ffmpeg audio extraction failed"):
                 agent._extract_audio_pcm("/fake/path.mp4", 16000)
+
+
+class TestIngestProbeConcurrency:
+    @patch("agents.ingest._copy_file")
+    @patch("agents.ingest.ffprobe")
+    def test_probes_keep_input_order(self, mock_probe, mock_copy, tmp_episode_dir, sample_config, tmp_path):
+        import time
+
+        source_dir = tmp_path / "DCIM"
+        source_dir.mkdir()
+        for i in range(5):
+            (source_dir / f"MVI_000{i}.MP4").write_bytes(b"\x00" * 100)
+
+        def side_effect(path):
+            i = int(Path(path).stem[-1])
+            time.sleep(0.01 * (5 - i))  # later files finish first
+            return _mock_ffprobe(duration=10.0 * (i + 1), creation_time=f"2026-01-01T10:0{i}:00Z")
+
+        mock_probe.side_effect = side_effect
+
+        agent = IngestAgent(tmp_episode_dir, sample_config)
+        agent.source_path = str(source_dir)
+        result = agent.execute()
+
+        assert [f["duration_seconds"] for f in result["files"]] == [10.0, 20.0, 30.0, 40.0, 50.0]
+        assert mock_probe.call_count == 10
+
+
+class TestCopyFile:
+    def test_copies_content_and_mtime(self, tmp_path):
+        import os
+        from agents.ingest import _copy_file
+
+        src = tmp_path / "src.MP4"
+        src.write_bytes(os.urandom(3 * 1024 * 1024 + 17))
+        os.utime(src, (1_700_000_000, 1_700_000_000))
+        dst = tmp_path / "dst.MP4"
+
+        _copy_file(src, dst)
+
+        assert dst.read_bytes() == src.read_bytes()
+        assert dst.stat().st_mtime == src.stat().st_mtime
+
+    def test_falls_back_without_sendfile(self, tmp_path, monkeypatch):
+        import os
+        from agents.ingest import _copy_file
+
+        def no_sendfile(*args):
+            raise OSError("not supported")
+
+        monkeypatch.setattr(os, "sendfile", no_sendfile)
+        src = tmp_path / "src.WAV"
+        src.write_bytes(b"abc" * 1000)
+        dst = tmp_path / "dst.WAV"
+
+        _copy_file(src, dst)
+
+        assert dst.read_bytes() == src.read_bytes()
@@ -0,0 +1,91 @@
+"""Tests for the metadata generation agent."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from agents.metadata_gen import MetadataGenAgent
+
+
+@pytest.fixture
+def agent(tmp_episode_dir, sample_config):
+    return MetadataGenAgent(tmp_episode_dir, sample_config)
+
+
+def _linear_excerpt(diarized, start, end):
+    """Reference implementation: scan every utterance."""
+    return " ".join(
+        u["text"] for u in diarized["utterances"] if u["end"] > start and u["start"] < end
+    )
+
+
+class TestGetExcerpt:
+    def test_overlapping_utterances_only(self, agent):
+        diarized = {"utterances": [
+            {"start": 0.0, "end": 10.0, "text": "intro"},
+            {"start": 10.0, "end": 20.0, "text": "middle"},
+            {"start": 20.0, "end": 30.0, "text": "outro"},
+        ]}
+        assert agent._get_excerpt(diarized, 12.0, 18.0) == "middle"
+        assert agent._get_excerpt(diarized, 10.0, 20.0) == "middle"
+        assert agent._get_excerpt(diarized, 5.0, 25.0) == "intro middle outro"
+        assert agent._get_excerpt(diarized, 40.0, 50.0) == ""
+
+    def test_matches_linear_scan_with_overlapping_channels(self, agent):
+        import random
+
+        rng = random.Random(7)
+        utts = []
+        for i in range(300):
+            start = rng.uniform(0, 600)
+            utts.append({"start": start, "end": start + rng.uniform(0.5, 40), "text": f"u{i}"})
+        utts.sort(key=lambda u: u["start"])
+        diarized = {"utterances": utts}
+        index = agent._utterance_index(diarized)
+
+        for _ in range(50):
+            start = rng.uniform(0, 600)
+            end = start + rng.uniform(1, 90)
+            assert agent._get_excerpt(diarized, start, end, index=index) == \
+                _linear_excerpt(diarized, start, end)
+
+
+class TestTrimExcerpt:
+    def test_short_excerpt_unchanged(self, agent):
+        assert agent._trim_excerpt("a" * 300) == "a" * 300
+
+    def test_long_excerpt_keeps_hook_and_ending(self, agent):
+        excerpt = "h" * 150 + "m" * 500 + "e" * 150
+        assert agent._trim_excerpt(excerpt) == "h" * 150 + " ... " + "e" * 150
+
+
+class TestPromptLayout:
+    def test_static_rules_cached_in_system_and_compact_clips(
+        self, tmp_episode_dir, sample_config, monkeypatch
+    ):
+        monkeypatch.setenv("CASCADE_ALLOW_API_METADATA_GEN", "1")
+        monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+        (tmp_episode_dir / "clips.json").write_text(json.dumps({"clips": [{
+            "id": "clip_01", "title": "T", "hook_text": "H", "duration": 30,
+            "virality_score": 8, "start_seconds": 0.0, "end_seconds": 30.0,
+        }]}))
+        (tmp_episode_dir / "diarized_transcript.json").write_text(json.dumps({"utterances": [
+            {"start": 0.0, "end": 30.0, "text": "x" * 1000},
+        ]}))
+
+        response = MagicMock(stop_reason="end_turn")
+        response.content = [MagicMock(text='{"longform": {}, "clips": [], "schedule": []}')]
+        client = MagicMock()
+        client.messages.create.return_value = response
+        with patch("anthropic.Anthropic", return_value=client):
+            MetadataGenAgent(tmp_episode_dir, sample_config).execute()
+
+        kwargs = client.messages.create.call_args.kwargs
+        system = kwargs["system"][0]
+        assert system["cache_control"] == {"type": "ephemeral"}
+        assert "PLATFORM AUDIENCE GUIDANCE" in system["text"]
+        prompt = kwargs["messages"][0]["content"]
+        assert "PLATFORM AUDIENCE GUIDANCE" not in prompt
+        assert '"id":"clip_01"' in prompt
+        assert "x" * 151 not in prompt
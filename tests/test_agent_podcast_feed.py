@@ -9,10 +9,14 @@ The `_build_feed_xml` method is called directly with hand-built episode
 dicts so the test is hermetic.
 """
 
+import json
+import os
 import xml.etree.ElementTree as ET
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+from agents import podcast_feed
 from agents.podcast_feed import PodcastFeedAgent
 
 
@@ -80,7 +84,7 @@ def feed_xml(agent, podcast_cfg, episodes):
         podcast_cfg,
         sorted_eps,
         feed_url="https://example.r2.dev/feed.xml",
-    )
+    ).decode("utf-8")
 
 
 @pytest.fixture
@@ -247,6 +251,12 @@ class TestSerializationFormat:
         first_line = feed_xml.split("\n", 1)[0]
         assert first_line == '<?xml version="1.0" encoding="UTF-8"?>'
 
+    def test_returns_utf8_bytes(self, agent, podcast_cfg, episodes):
+        episodes[0]["title"] = "Café talk"
+        xml_bytes = agent._build_feed_xml(podcast_cfg, episodes)
+        assert isinstance(xml_bytes, bytes)
+        assert "Café talk".encode("utf-8") in xml_bytes
+
     def test_parses_as_xml(self, feed_xml):
         # Round-trip: parsing must succeed without exception.
         ET.fromstring(feed_xml)
@@ -265,3 +275,253 @@ class TestSerializationFormat:
         # And the round-tripped text must equal the original.
         titles = [it.findtext("title") for it in root.find("channel").findall("item")]
         assert "Q&A with <Sam>" in titles
+
+
+    def test_special_chars_in_attributes_escaped(self, agent, podcast_cfg, episodes):
+        podcast_cfg["artwork_url"] = 'https://x/art.png?a=1&b="2"'
+        episodes[0]["audio_url"] = "https://x/a.mp3?sig=a&b"
+        root = ET.fromstring(agent._build_feed_xml(podcast_cfg, episodes))
+        channel = root.find("channel")
+        assert channel.find("itunes:image", NS).get("href") == 'https://x/art.png?a=1&b="2"'
+        urls = [it.find("enclosure").get("url") for it in channel.findall("item")]
+        assert "https://x/a.mp3?sig=a&b" in urls
+
+    def test_owner_email_optional(self, agent, podcast_cfg, episodes):
+        podcast_cfg.pop("owner_email", None)
+        root = ET.fromstring(agent._build_feed_xml(podcast_cfg, episodes))
+        owner = root.find("channel").find("itunes:owner", NS)
+        assert owner.find("itunes:email", NS) is None
+        assert owner.find("itunes:name", NS) is not None
+
+
+class TestCollectAllEpisodes:
+    def _write_episode(self, root, ep_id, title):
+        ep_dir = root / ep_id
+        ep_dir.mkdir()
+        (ep_dir / "podcast_feed.json").write_text(json.dumps({
+            "episode_id": ep_id, "audio_url": f"https://x/{ep_id}.mp3",
+        }))
+        (ep_dir / "episode.json").write_text(json.dumps({"episode_name": title}))
+        return ep_dir
+
+    def test_unchanged_episodes_not_reparsed(self, agent, podcast_cfg):
+        root = agent.episode_dir.parent
+        self._write_episode(root, "ep_a", "First")
+        ep_b = self._write_episode(root, "ep_b", "Second")
+        (root / "ep_no_feed").mkdir()
+
+        first = agent._collect_all_episodes(root, podcast_cfg)
+        assert sorted(e["title"] for e in first) == ["First", "Second"]
+
+        # Touch only ep_b: ep_a comes from the cache
+        (ep_b / "episode.json").write_text(json.dumps({"episode_name": "Renamed"}))
+        st = (ep_b / "episode.json").stat()
+        os.utime(ep_b / "episode.json", ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        with patch("agents.podcast_feed.read_json", wraps=podcast_feed.read_json) as read:
+            second = agent._collect_all_episodes(root, podcast_cfg)
+        assert sorted(e["title"] for e in second) == ["First", "Renamed"]
+        # feed_index.json + ep_b's podcast_feed.json + episode.json
+        assert read.call_count == 3
+
+    def test_index_persisted_for_next_publish(self, agent, podcast_cfg):
+        root = agent.episode_dir.parent
+        self._write_episode(root, "ep_a", "First")
+
+        agent._collect_all_episodes(root, podcast_cfg)
+        index = json.loads((root / podcast_feed.FEED_INDEX_NAME).read_text())
+        assert index["ep_a"]["entry"]["title"] == "First"
+
+        # A fresh agent (new process) reuses the index without re-parsing ep_a
+        with patch("agents.podcast_feed.read_json", wraps=podcast_feed.read_json) as read:
+            again = agent._collect_all_episodes(root, podcast_cfg)
+        assert [e["title"] for e in again] == ["First"]
+        assert read.call_count == 1  # just feed_index.json
+
+    def test_removed_episode_dropped_from_index(self, agent, podcast_cfg):
+        import shutil
+
+        root = agent.episode_dir.parent
+        self._write_episode(root, "ep_a", "First")
+        ep_b = self._write_episode(root, "ep_b", "Second")
+        agent._collect_all_episodes(root, podcast_cfg)
+
+        shutil.rmtree(ep_b)
+        found = agent._collect_all_episodes(root, podcast_cfg)
+        assert [e["title"] for e in found] == ["First"]
+        index = json.loads((root / podcast_feed.FEED_INDEX_NAME).read_text())
+        assert set(index) == {"ep_a"}
+
+    def test_skips_files_and_symlinked_dirs(self, agent, podcast_cfg, tmp_path):
+        root = agent.episode_dir.parent
+        ep_a = self._write_episode(root, "ep_a", "First")
+        (root / "notes.txt").write_text("not an episode")
+        (root / "ep_link").symlink_to(ep_a)
+
+        found = agent._collect_all_episodes(root, podcast_cfg)
+        assert [e["title"] for e in found] == ["First"]
+
+
+class TestUploadFileToR2:
+    def test_streams_file_in_chunks_with_length(self, agent, tmp_path, monkeypatch):
+        monkeypatch.setenv("CLOUDFLARE_ACCOUNT_ID", "acct")
+        monkeypatch.setenv("CLOUDFLARE_API_TOKEN", "token")
+        monkeypatch.delenv("R2_ACCESS_KEY_ID", raising=False)
+        monkeypatch.setattr(podcast_feed, "_UPLOAD_CHUNK", 4)
+        audio = tmp_path / "audio.mp3"
+        audio.write_bytes(b"0123456789")
+
+        sent = {}
+
+        def fake_put(url, content, headers):
+            sent["chunks"] = list(content)  # consumed while the file is open
+            sent["headers"] = headers
+            return MagicMock(status_code=200)
+
+        client = MagicMock()
+        client.put.side_effect = fake_put
+        with patch("agents.podcast_feed._r2_client", return_value=client):
+            agent._upload_file_to_r2("bucket", audio, "audio/ep.mp3", "audio/mpeg")
+
+        assert sent["chunks"] == [b"0123", b"4567", b"89"]
+        assert sent["headers"]["Content-Length"] == "10"
+        assert sent["headers"]["Content-Type"] == "audio/mpeg"
+
+
+    def test_s3_credentials_use_multipart_upload(self, agent, tmp_path, monkeypatch):
+        monkeypatch.setenv("CLOUDFLARE_ACCOUNT_ID", "acct")
+        monkeypatch.setenv("R2_ACCESS_KEY_ID", "key")
+        monkeypatch.setenv("R2_SECRET_ACCESS_KEY", "secret")
+        audio = tmp_path / "audio.mp3"
+        audio.write_bytes(b"0123456789")
+
+        s3 = MagicMock()
+        with patch("boto3.client", return_value=s3) as client, \
+             patch.object(agent, "_upload_to_r2") as rest:
+            agent._upload_file_to_r2("bucket", audio, "audio/ep.mp3", "audio/mpeg")
+
+        rest.assert_not_called()
+        assert client.call_args.kwargs["endpoint_url"] == "https://acct.r2.cloudflarestorage.com"
+        args, kwargs = s3.upload_file.call_args
+        assert args == (str(audio), "bucket", "audio/ep.mp3")
+        assert kwargs["ExtraArgs"] == {"ContentType": "audio/mpeg"}
+        assert kwargs["Config"].max_concurrency == 8
+
+
+class TestR2Client:
+    def test_client_shared_across_uploads(self):
+        podcast_feed._r2_client.cache_clear()
+        try:
+            assert podcast_feed._r2_client() is podcast_feed._r2_client()
+        finally:
+            podcast_feed._r2_client().close()
+            podcast_feed._r2_client.cache_clear()
+
+
+class TestExecuteUploadOrder:
+    def test_feed_uploaded_after_mp3(self, agent, podcast_cfg):
+        ep_dir = agent.episode_dir
+        (ep_dir / "episode.json").write_text(json.dumps({
+            "episode_id": "ep_test", "episode_name": "Test", "created_at": "2026-01-01",
+        }))
+        (ep_dir / "longform.mp4").write_bytes(b"\x00")
+        (ep_dir / "podcast_audio.mp3").write_bytes(b"\x00" * 10)
+        agent.config = {"podcast": {**podcast_cfg, "r2": {"bucket": "b", "public_url": "https://x"}}}
+
+        calls = []
+        with patch("agents.podcast_feed.get_duration", return_value=60.0), \
+             patch.object(agent, "_upload_file_to_r2",
+                          side_effect=lambda *a, **k: calls.append("mp3")), \
+             patch.object(agent, "_upload_to_r2",
+                          side_effect=lambda *a, **k: calls.append("feed")):
+            result = agent.execute()
+
+        assert calls == ["mp3", "feed"]
+        assert result["total_episodes_in_feed"] == 1
+        assert (ep_dir / "feed.xml").exists()
+
+
+class TestExecuteExtraction:
+    def _setup(self, agent, podcast_cfg, episode_name="Test"):
+        ep_dir = agent.episode_dir
+        (ep_dir / "episode.json").write_text(json.dumps({
+            "episode_id": "ep_test", "episode_name": episode_name, "created_at": "2026-01-01",
+        }))
+        (ep_dir / "longform.mp4").write_bytes(b"\x00")
+        agent.config = {"podcast": {**podcast_cfg, "r2": {"bucket": "b", "public_url": "https://x"}}}
+        return ep_dir
+
+    def test_episodes_collected_while_audio_extracts(self, agent, podcast_cfg):
+        import threading
+
+        ep_dir = self._setup(agent, podcast_cfg)
+        collecting = threading.Event()
+
+        def fake_extract(video_path, audio_path):
+            # Only finishes once the main thread has reached episode collection
+            assert collecting.wait(timeout=5)
+            audio_path.write_bytes(b"\x00" * 10)
+
+        def fake_collect(root, cfg):
+            collecting.set()
+            return []
+
+        with patch("agents.podcast_feed.get_duration", return_value=60.0), \
+             patch.object(agent, "_extract_audio", side_effect=fake_extract), \
+             patch.object(agent, "_collect_all_episodes", side_effect=fake_collect), \
+             patch.object(agent, "_upload_file_to_r2"), \
+             patch.object(agent, "_upload_to_r2"):
+            result = agent.execute()
+
+        assert result["audio_size_bytes"] == 10
+        assert (ep_dir / "podcast_audio.mp3").exists()
+
+    def test_missing_episode_name_fails_before_extraction(self, agent, podcast_cfg):
+        self._setup(agent, podcast_cfg, episode_name="")
+        with patch.object(agent, "_extract_audio") as extract, \
+             pytest.raises(RuntimeError, match="Episode name is required"):
+            agent.execute()
+        extract.assert_not_called()
+
+
+class TestExecuteDuration:
+    def test_duration_from_longform_probe(self, agent, podcast_cfg):
+        ep_dir = agent.episode_dir
+        (ep_dir / "episode.json").write_text(json.dumps({
+            "episode_id": "ep_test", "episode_name": "Test", "created_at": "2026-01-01",
+        }))
+        (ep_dir / "longform.mp4").write_bytes(b"\x00")
+        (ep_dir / "podcast_audio.mp3").write_bytes(b"\x00" * 10)
+        agent.config = {"podcast": {**podcast_cfg, "r2": {"bucket": "b", "public_url": "https://x"}}}
+
+        with patch("agents.podcast_feed.get_duration", return_value=3600.4) as duration, \
+             patch.object(agent, "_upload_file_to_r2"), \
+             patch.object(agent, "_upload_to_r2"):
+            result = agent.execute()
+
+        duration.assert_called_once_with(ep_dir / "longform.mp4")
+        assert result["duration_seconds"] == 3600
+
+
+class TestExtractAudio:
+    def _run(self, agent, tmp_path, audio_stream):
+        probe = {"streams": [{"codec_type": "video"}, audio_stream]}
+        with patch("agents.podcast_feed.ffprobe", return_value=probe), \
+             patch("agents.podcast_feed.subprocess.run",
+                   return_value=MagicMock(returncode=0)) as run:
+            agent._extract_audio(tmp_path / "in.mp4", tmp_path / "out.mp3")
+        return run.call_args[0][0]
+
+    def test_high_bitrate_mp3_is_stream_copied(self, agent, tmp_path):
+        cmd = self._run(agent, tmp_path, {"codec_type": "audio", "codec_name": "mp3",
+                                          "bit_rate": "192000"})
+        assert cmd[cmd.index("-c:a") + 1] == "copy"
+
+    def test_aac_is_reencoded(self, agent, tmp_path):
+        cmd = self._run(agent, tmp_path, {"codec_type": "audio", "codec_name": "aac",
+                                          "bit_rate": "192000"})
+        assert cmd[cmd.index("-c:a") + 1] == "libmp3lame"
+
+    def test_low_bitrate_mp3_is_reencoded(self, agent, tmp_path):
+        cmd = self._run(agent, tmp_path, {"codec_type": "audio", "codec_name": "mp3",
+                                          "bit_rate": "96000"})
+        assert cmd[cmd.index("-c:a") + 1] == "libmp3lame"
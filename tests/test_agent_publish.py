@@ -19,6 +19,7 @@ patched in every test. We never make a real network call.
 """
 
 import json
+import time
 from types import SimpleNamespace
 from unittest.mock import patch
 
@@ -456,6 +457,85 @@ class TestRejectedClips:
             assert "clip_1.mp4" not in " ".join(cmd)
 
 
+# ── concurrent short uploads ────────────────────────────────────────────────
+
+
+class TestConcurrentUploads:
+    def _clips(self, n):
+        return [
+            {
+                "id": "clip_%d" % i,
+                "title": "c%d" % i,
+                "status": "approved",
+                "start_seconds": 0,
+                "end_seconds": 30,
+                "metadata": {},
+            }
+            for i in range(n)
+        ]
+
+    def test_shorts_upload_in_parallel_and_keep_order(self, env, episode_dir):
+        import threading
+
+        _seed_episode(episode_dir, clips=self._clips(3), longform=False)
+        agent = _make_agent(episode_dir)
+        agent.config["publish"] = {"concurrency": 3}
+        # All three uploads must be in flight at once to get past the barrier
+        barrier = threading.Barrier(3, timeout=5)
+
+        def _upload(cmd, **_kwargs):
+            barrier.wait()
+            clip = next(a for a in cmd if a.startswith("video=@")).rsplit("/", 1)[1]
+            # Finish in reverse order so result order can't come from timing
+            time.sleep(0.01 * (3 - int(clip[5])))
+            return _mock_proc(stdout=json.dumps({"request_id": "r_" + clip}))
+
+        with patch("agents.publish.subprocess.run", side_effect=_upload):
+            result = agent.execute()
+
+        assert [r["clip_id"] for r in result["shorts"]] == ["clip_0", "clip_1", "clip_2"]
+        assert [r["request_id"] for r in result["shorts"]] == [
+            "r_clip_0.mp4", "r_clip_1.mp4", "r_clip_2.mp4",
+        ]
+        assert result["shorts_submitted"] == 3
+
+    def test_shared_fields_not_accumulated_across_clips(self, env, episode_dir):
+        _seed_episode(episode_dir, clips=self._clips(3), longform=False)
+        agent = _make_agent(episode_dir)
+        cmds = []
+
+        def _upload(cmd, **_kwargs):
+            cmds.append(cmd)
+            return _mock_proc(stdout=json.dumps({"request_id": "r"}))
+
+        with patch("agents.publish.subprocess.run", side_effect=_upload):
+            agent.execute()
+
+        assert len(cmds) == 3
+        for cmd in cmds:
+            assert cmd.count("platform[]=youtube") == 1
+            assert cmd.count("user=test_user") == 1
+            assert sum(a.startswith("video=@") for a in cmd) == 1
+
+    def test_concurrency_one_uploads_serially(self, env, episode_dir):
+        import threading
+
+        _seed_episode(episode_dir, clips=self._clips(3), longform=False)
+        agent = _make_agent(episode_dir)
+        agent.config["publish"] = {"concurrency": 1}
+        threads = set()
+
+        def _upload(cmd, **_kwargs):
+            threads.add(threading.get_ident())
+            return _mock_proc(stdout=json.dumps({"request_id": "r"}))
+
+        with patch("agents.publish.subprocess.run", side_effect=_upload):
+            result = agent.execute()
+
+        assert result["shorts_submitted"] == 3
+        assert len(threads) == 1
+
+
 # ── schedule conversion ─────────────────────────────────────────────────────
 
 
@@ -473,6 +553,16 @@ class TestScheduleConversion:
         dt = agent._schedule_to_datetime(sched, "America/Los_Angeles")
         assert dt.hour == 18
 
+    def test_schedule_to_datetime_uses_given_now(self, env, episode_dir):
+        from datetime import datetime, timezone
+
+        agent = _make_agent(episode_dir)
+        now = datetime(2026, 3, 2, 23, 59, 59, tzinfo=timezone.utc)
+        dt = agent._schedule_to_datetime(
+            {"day_offset": 1, "time_slot": "afternoon"}, "America/Los_Angeles", now=now
+        )
+        assert dt == datetime(2026, 3, 3, 14, 0, tzinfo=timezone.utc)
+
     def test_generate_schedule_distributes_clips_across_days(self, env, episode_dir):
         agent = _make_agent(episode_dir)
         clips = [{"id": f"clip_{i}"} for i in range(5)]
@@ -134,3 +134,57 @@ class TestQAAgent:
             agent.execute()
 
         assert (tmp_episode_dir / "qa" / "qa.json").exists()
+
+    def test_each_media_file_probed_once(self, tmp_episode_dir, sample_config, sample_clips):
+        self._setup_full_episode(tmp_episode_dir, sample_clips)
+
+        def fake_probe(path):
+            # source_merged has audio, longform a distinct duration
+            if path.name == "source_merged.mp4":
+                return {"format": {"duration": "3600.0"}, "streams": [{"codec_type": "audio"}]}
+            return {"format": {"duration": "1800.0"}, "streams": []}
+
+        agent = QAAgent(tmp_episode_dir, sample_config)
+        with patch("agents.qa.ffprobe", side_effect=fake_probe) as probe:
+            result = agent.execute()
+
+        probed = sorted(call.args[0].name for call in probe.call_args_list)
+        assert probed == ["longform.mp4", "source_merged.mp4"]
+        checks = {c["name"]: c for c in result["checks"]}
+        assert checks["source_merged_has_audio"]["pass"]
+        assert checks["longform_exists"]["detail"].startswith("Duration: 1800.0s")
+
+    def test_probe_results_reused_across_runs(self, tmp_episode_dir, sample_config, sample_clips):
+        self._setup_full_episode(tmp_episode_dir, sample_clips)
+        mock_probe = {"format": {"duration": "3600.0"}, "streams": [{"codec_type": "audio"}]}
+
+        with patch("agents.qa.ffprobe", return_value=mock_probe) as probe:
+            first = QAAgent(tmp_episode_dir, sample_config).execute()
+            assert probe.call_count == 2
+            second = QAAgent(tmp_episode_dir, sample_config).execute()
+            assert probe.call_count == 2  # both files unchanged: no new probes
+        assert first["checks"] == second["checks"]
+
+    def test_changed_file_reprobed(self, tmp_episode_dir, sample_config, sample_clips):
+        self._setup_full_episode(tmp_episode_dir, sample_clips)
+        mock_probe = {"format": {"duration": "3600.0"}, "streams": [{"codec_type": "audio"}]}
+
+        with patch("agents.qa.ffprobe", return_value=mock_probe) as probe:
+            QAAgent(tmp_episode_dir, sample_config).execute()
+            (tmp_episode_dir / "longform.mp4").write_bytes(b"\x00" * 200)
+            QAAgent(tmp_episode_dir, sample_config).execute()
+
+        assert [c.args[0].name for c in probe.call_args_list[2:]] == ["longform.mp4"]
+
+    def test_missing_shorts_dir_reports_all_missing(self, tmp_episode_dir, sample_config, sample_clips):
+        import shutil
+
+        self._setup_full_episode(tmp_episode_dir, sample_clips)
+        shutil.rmtree(tmp_episode_dir / "shorts")
+        mock_probe = {"format": {"duration": "3600.0"}, "streams": [{"codec_type": "audio"}]}
+
+        with patch("agents.qa.ffprobe", return_value=mock_probe):
+            result = QAAgent(tmp_episode_dir, sample_config).execute()
+
+        shorts_check = next(c for c in result["checks"] if c["name"] == "all_shorts_rendered")
+        assert shorts_check["detail"].startswith(f"0/{len(sample_clips)} rendered")
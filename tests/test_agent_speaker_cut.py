@@ -116,3 +116,15 @@ def test_segments_json_saved_with_fields(tmp_episode_dir, sample_config):
     assert (tmp_episode_dir / "segments.json").exists()
     for seg in result["segments"]:
         assert all(k in seg for k in ("start", "end", "speaker", "duration"))
+
+
+def test_combined_rms_saved(tmp_episode_dir, sample_config):
+    tracks = _tracks(2, 20000, [[(0.1, 0.5)], [(0.6, 0.9)]])
+    agent = _agent(tmp_episode_dir, sample_config)
+    with patch.object(agent, "_load_tracks", return_value=(tracks, "lr")):
+        agent.execute()
+    work = tmp_episode_dir / "work"
+    combined = np.load(work / "combined_rms_db.npy")
+    expected = np.load(work / "speaker_0_rms_db.npy") + np.load(work / "speaker_1_rms_db.npy")
+    assert combined.dtype == np.float16
+    np.testing.assert_allclose(combined, expected, rtol=1e-3, atol=0.5)
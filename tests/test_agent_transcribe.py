@@ -121,3 +121,27 @@ class TestExecute:
         params = mock_post.call_args.kwargs.get("params") or mock_post.call_args[1].get("params")
         assert params["diarize"] == "true"
         assert "multichannel" not in params
+
+    def test_audio_streamed_in_chunks(self, tmp_episode_dir, sample_config, monkeypatch):
+        from agents import transcribe
+
+        monkeypatch.setenv("DEEPGRAM_API_KEY", "test-key")
+        monkeypatch.setattr(transcribe, "UPLOAD_CHUNK", 20)
+        (tmp_episode_dir / "work" / "audio.m4a").write_bytes(b"\x01" * 50)
+        with open(tmp_episode_dir / "episode.json", "w") as f:
+            json.dump({"episode_id": "test"}, f)
+
+        sent = {}
+
+        def fake_post(url, params, headers, content, timeout):
+            sent["chunks"] = list(content)  # consumed while the file is open
+            sent["headers"] = headers
+            resp = MagicMock()
+            resp.json.return_value = MONO_RESPONSE
+            return resp
+
+        with patch("httpx.post", side_effect=fake_post):
+            TranscribeAgent(tmp_episode_dir, sample_config).execute()
+
+        assert [len(c) for c in sent["chunks"]] == [20, 20, 10]
+        assert sent["headers"]["Content-Length"] == "50"
@@ -1,10 +1,13 @@
 """Tests for BaseAgent helpers."""
 
 import json
+import logging
+import subprocess
+import sys
 import pytest
 from pathlib import Path
 
-from agents.base import BaseAgent
+from agents.base import BaseAgent, stream_ffmpeg
 
 
 class ConcreteAgent(BaseAgent):
@@ -79,3 +82,90 @@ class TestGetConfig:
     def test_none_default(self, tmp_episode_dir, sample_config):
         agent = ConcreteAgent(tmp_episode_dir, sample_config)
         assert agent.get_config("nonexistent") is None
+
+
+class TestSaveJson:
+    def test_round_trips_numpy_and_non_json_values(self, tmp_episode_dir, sample_config):
+        import numpy as np
+
+        agent = ConcreteAgent(tmp_episode_dir, sample_config)
+        agent.save_json("out.json", {
+            "rms": np.float64(-12.5),
+            "frames": np.int64(7),
+            "path": tmp_episode_dir / "x.mp4",
+            1: "int key",
+        })
+
+        data = json.loads((tmp_episode_dir / "out.json").read_text())
+        assert data["rms"] == -12.5
+        assert data["frames"] == 7
+        assert data["path"] == str(tmp_episode_dir / "x.mp4")
+        assert data["1"] == "int key"
+
+    def test_run_writes_agent_output(self, tmp_episode_dir, sample_config):
+        agent = ConcreteAgent(tmp_episode_dir, sample_config)
+        agent.run()
+
+        data = json.loads((tmp_episode_dir / "test_agent.json").read_text())
+        assert data["ok"] is True
+        assert data["_status"] == "completed"
+
+    def test_stdlib_fallback_streams_to_file(self, tmp_episode_dir, sample_config, monkeypatch):
+        import lib.atomic_write
+
+        monkeypatch.setattr(lib.atomic_write, "orjson", None)
+        agent = ConcreteAgent(tmp_episode_dir, sample_config)
+        clips = [{"id": f"clip_{i:02d}", "score": i / 3} for i in range(50)]
+        agent.save_json("clips.json", {"clips": clips, "path": tmp_episode_dir})
+
+        data = json.loads((tmp_episode_dir / "clips.json").read_text())
+        assert data["clips"] == clips
+        assert data["path"] == str(tmp_episode_dir)
+        assert not list(tmp_episode_dir.glob("*.tmp"))
+
+
+class TestReadJson:
+    def test_read_json_matches_stdlib(self, tmp_path):
+        from lib.atomic_write import read_json
+
+        doc = {"title": "Café ☕", "n": 3, "nested": [1.5, None, True]}
+        path = tmp_path / "doc.json"
+        path.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+        assert read_json(path) == doc
+
+    def test_invalid_json_raises_stdlib_error(self, tmp_path):
+        from lib.atomic_write import read_json
+
+        path = tmp_path / "bad.json"
+        path.write_text("{not json")
+        with pytest.raises(json.JSONDecodeError):
+            read_json(path)
+
+
+class TestStreamFfmpeg:
+    def _cmd(self, code):
+        return [sys.executable, "-c", code]
+
+    def test_success_logs_stderr_at_debug(self, caplog):
+        with caplog.at_level(logging.DEBUG, logger="cascade"):
+            stream_ffmpeg(self._cmd("import sys; sys.stderr.write('frame=1\\n')"))
+        assert "frame=1" in caplog.text
+
+    def test_progress_lines_go_to_callback(self, caplog):
+        code = (
+            "import sys\n"
+            "sys.stderr.write('out_time_us=N/A\\nout_time_us=2500000\\nframe=9\\n')"
+        )
+        seen = []
+        with caplog.at_level(logging.DEBUG, logger="cascade"):
+            stream_ffmpeg(self._cmd(code), on_progress=seen.append)
+        assert seen == [2.5]
+        assert "out_time_us" not in caplog.text
+        assert "frame=9" in caplog.text
+
+    def test_failure_raises_with_stderr_tail(self):
+        code = "import sys\nfor i in range(100): sys.stderr.write(f'line {i}\\n')\nsys.exit(3)"
+        with pytest.raises(subprocess.CalledProcessError) as exc:
+            stream_ffmpeg(self._cmd(code), tail_lines=5)
+        assert exc.value.returncode == 3
+        assert exc.value.stderr.splitlines() == [f"line {i}" for i in range(95, 100)]
@@ -7,8 +7,11 @@ from unittest.mock import patch, MagicMock
 import pytest
 
 from lib.encoding import (
+    has_nvenc,
     has_videotoolbox,
     get_video_encoder_args,
+    get_encode_concurrency,
+    get_hwaccel_input_args,
     get_color_metadata_args,
     get_lut_filter,
     get_scale_filter,
@@ -20,8 +23,10 @@ from lib.encoding import (
 def clear_cache():
     """Clear the lru_cache before each test."""
     has_videotoolbox.cache_clear()
+    has_nvenc.cache_clear()
     yield
     has_videotoolbox.cache_clear()
+    has_nvenc.cache_clear()
 
 
 class TestHasVideoToolbox:
@@ -71,6 +76,34 @@ class TestHasVideoToolbox:
             assert has_videotoolbox() is False
 
 
+class TestHasNvenc:
+    def test_returns_false_on_macos(self):
+        with patch("lib.encoding.sys") as mock_sys:
+            mock_sys.platform = "darwin"
+            assert has_nvenc() is False
+
+    def test_trial_encode_succeeds(self):
+        with patch("lib.encoding.sys") as mock_sys, \
+             patch("lib.encoding.subprocess.run") as mock_run:
+            mock_sys.platform = "linux"
+            mock_run.return_value = MagicMock(returncode=0)
+            assert has_nvenc() is True
+            assert "h264_nvenc" in mock_run.call_args[0][0]
+
+    def test_trial_encode_fails_without_gpu(self):
+        with patch("lib.encoding.sys") as mock_sys, \
+             patch("lib.encoding.subprocess.run") as mock_run:
+            mock_sys.platform = "linux"
+            mock_run.return_value = MagicMock(returncode=1)
+            assert has_nvenc() is False
+
+    def test_returns_false_without_ffmpeg(self):
+        with patch("lib.encoding.sys") as mock_sys, \
+             patch("lib.encoding.subprocess.run", side_effect=FileNotFoundError):
+            mock_sys.platform = "linux"
+            assert has_nvenc() is False
+
+
 class TestGetVideoEncoderArgs:
     def test_software_fallback_when_hw_disabled(self):
         config = {"processing": {"use_hardware_accel": False, "video_crf": 22}}
@@ -91,11 +124,11 @@ class TestGetVideoEncoderArgs:
         args = get_video_encoder_args(config)
         assert "22" in args
 
-    def test_default_preset_medium(self):
-        """Default encode preset should be 'medium'."""
+    def test_default_preset_faster(self):
+        """Default encode preset should be 'faster'."""
         config = {"processing": {"use_hardware_accel": False}}
         args = get_video_encoder_args(config)
-        assert "medium" in args
+        assert args[args.index("-preset") + 1] == "faster"
 
     def test_custom_preset(self):
         config = {"processing": {"use_hardware_accel": False, "encode_preset": "ultrafast"}}
@@ -147,6 +180,20 @@ class TestGetVideoEncoderArgs:
             args = get_video_encoder_args(config)
             assert args[0:2] == ["-c:v", "h264_videotoolbox"]
 
+    def test_nvenc_when_available(self):
+        config = {"processing": {"nvenc_cq": 25}}
+        with patch("lib.encoding.has_videotoolbox", return_value=False), \
+             patch("lib.encoding.has_nvenc", return_value=True):
+            args = get_video_encoder_args(config)
+        assert args[0:2] == ["-c:v", "h264_nvenc"]
+        assert args[args.index("-cq") + 1] == "25"
+
+    def test_nvenc_skipped_when_hw_accel_disabled(self):
+        config = {"processing": {"use_hardware_accel": False}}
+        with patch("lib.encoding.has_nvenc", return_value=True):
+            args = get_video_encoder_args(config)
+        assert args[0:2] == ["-c:v", "libx264"]
+
     def test_empty_config_no_hw(self):
         """Empty config without VideoToolbox should use software defaults."""
         with patch("lib.encoding.has_videotoolbox", return_value=False):
@@ -155,6 +202,49 @@ class TestGetVideoEncoderArgs:
             assert "libx264" in args
 
 
+class TestGetHwaccelInputArgs:
+    def test_cuda_decode_with_nvenc(self):
+        with patch("lib.encoding.has_nvenc", return_value=True):
+            assert get_hwaccel_input_args({}) == ["-hwaccel", "cuda"]
+
+    def test_cpu_decode_without_gpu(self):
+        with patch("lib.encoding.has_nvenc", return_value=False):
+            assert get_hwaccel_input_args({}) == []
+
+    def test_disabled_by_config(self):
+        config = {"processing": {"use_hardware_accel": False}}
+        with patch("lib.encoding.has_nvenc", return_value=True):
+            assert get_hwaccel_input_args(config) == []
+
+
+class TestGetEncodeConcurrency:
+    X264 = ["-c:v", "libx264", "-crf", "22", "-preset", "faster"]
+    VT = ["-c:v", "h264_videotoolbox", "-q:v", "45", "-profile:v", "high"]
+
+    def test_small_machine_runs_one_encode_on_all_cores(self):
+        with patch("lib.encoding.os.cpu_count", return_value=4):
+            assert get_encode_concurrency({}, self.X264) == (1, 4)
+
+    def test_large_machine_splits_cores_across_two(self):
+        with patch("lib.encoding.os.cpu_count", return_value=12):
+            assert get_encode_concurrency({}, self.X264) == (2, 6)
+
+    def test_config_override(self):
+        config = {"processing": {"parallel_encodes": 3}}
+        with patch("lib.encoding.os.cpu_count", return_value=12):
+            assert get_encode_concurrency(config, self.X264) == (3, 4)
+
+    def test_unknown_core_count(self):
+        with patch("lib.encoding.os.cpu_count", return_value=None):
+            assert get_encode_concurrency({}, self.X264) == (1, 4)
+
+    def test_hardware_encoder_keeps_parallel_workers_without_threads(self):
+        with patch("lib.encoding.os.cpu_count", return_value=12):
+            assert get_encode_concurrency({}, self.VT) == (6, None)
+        with patch("lib.encoding.os.cpu_count", return_value=2):
+            assert get_encode_concurrency({}, self.VT) == (1, None)
+
+
 class TestGetColorMetadataArgs:
     def test_returns_bt709_flags(self):
         args = get_color_metadata_args()
@@ -49,6 +49,24 @@ class TestProbe:
                 probe(Path("/fake/video.mp4"))
 
 
+class TestProbeAudio:
+    def test_probe_audio_selects_first_audio_stream(self):
+        from lib.ffprobe import probe_audio
+        payload = {"streams": [{"codec_type": "audio", "channels": 2, "sample_rate": "48000"}]}
+        with patch("subprocess.run", return_value=_mock_ffprobe_run(payload)) as mock_run:
+            result = probe_audio(Path("/fake/video.mp4"))
+        args = mock_run.call_args[0][0]
+        assert args[args.index("-select_streams") + 1] == "a:0"
+        assert "-show_format" not in args
+        assert result["streams"][0]["channels"] == 2
+
+    def test_probe_audio_no_audio_stream(self):
+        from lib.ffprobe import probe_audio
+        with patch("subprocess.run", return_value=_mock_ffprobe_run({})):
+            result = probe_audio(Path("/fake/video.mp4"))
+        assert result["streams"] == []
+
+
 class TestGetDuration:
     def test_get_duration_normal(self, mock_ffprobe_result):
         from lib.ffprobe import get_duration
@@ -84,3 +102,31 @@ class TestGetDimensions:
         with patch("subprocess.run", return_value=_mock_ffprobe_run(result)):
             with pytest.raises(StopIteration):
                 get_dimensions(Path("/fake/audio.mp3"))
+
+
+class TestProbeCached:
+    def test_reuses_result_until_file_changes(self, tmp_path, mock_ffprobe_result):
+        import os
+        from lib.ffprobe import probe_cached
+
+        media = tmp_path / "video.mp4"
+        media.write_bytes(b"\x00" * 10)
+        with patch("subprocess.run", return_value=_mock_ffprobe_run(mock_ffprobe_result)) as mock_run:
+            first = probe_cached(media)
+            first["format"]["duration"] = "mutated"
+            second = probe_cached(media)
+            assert mock_run.call_count == 1
+            assert second["format"]["duration"] != "mutated"
+
+            media.write_bytes(b"\x00" * 20)
+            os.utime(media, ns=(1, 1))
+            probe_cached(media)
+            assert mock_run.call_count == 2
+
+    def test_missing_file_is_not_cached(self, mock_ffprobe_result):
+        from lib.ffprobe import probe_cached
+
+        with patch("subprocess.run", return_value=_mock_ffprobe_run(mock_ffprobe_result)) as mock_run:
+            probe_cached(Path("/fake/missing.mp4"))
+            probe_cached(Path("/fake/missing.mp4"))
+        assert mock_run.call_count == 2
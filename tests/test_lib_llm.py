@@ -0,0 +1,40 @@
+"""Tests for lib/llm.py — Claude response parsing."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from lib.llm import anthropic_client, parse_json_response, strip_code_fence
+
+
+class TestAnthropicClient:
+    def test_reused_per_key(self):
+        with patch("anthropic.Anthropic") as mock_cls:
+            first = anthropic_client("test-key")
+            second = anthropic_client("test-key")
+        assert first is second
+        mock_cls.assert_called_once_with(api_key="test-key")
+
+
+class TestStripCodeFence:
+    def test_plain_text_unchanged(self):
+        assert strip_code_fence('  {"a": 1}\n') == '{"a": 1}'
+
+    def test_json_fence(self):
+        assert strip_code_fence('```json\n{"a": 1}\n```') == '{"a": 1}'
+
+    def test_bare_fence_with_trailing_whitespace(self):
+        assert strip_code_fence('\n```\n{"a": 1}\n```  \n') == '{"a": 1}'
+
+    def test_unclosed_fence(self):
+        assert strip_code_fence('```json\n{"a": 1}') == '{"a": 1}'
+
+
+class TestParseJsonResponse:
+    def test_fenced_json(self):
+        assert parse_json_response('```JSON\n{"clips": [1, 2]}\n```') == {"clips": [1, 2]}
+
+    def test_invalid_json_raises(self):
+        with pytest.raises(json.JSONDecodeError):
+            parse_json_response("```json\nnot json\n```")
@@ -0,0 +1,72 @@
+"""Tests for lib/transcript_index.py — cached flat word index."""
+
+import json
+import os
+
+from lib.transcript_index import (
+    INDEX_NAME,
+    build_word_index,
+    load_word_index,
+    words_in_range,
+)
+
+DIARIZED = {"utterances": [
+    {"words": [
+        {"word": "one", "start": 11.0, "end": 12.0},
+        {"word": "three", "start": 13.0, "end": 13.5},
+    ]},
+    {"words": [
+        {"word": "bleed", "start": 11.5, "end": 11.9},
+        {"word": "late", "start": 19.5, "end": 20.5},
+    ]},
+]}
+
+
+def _write(episode_dir, diarized):
+    (episode_dir / "diarized_transcript.json").write_text(json.dumps(diarized))
+
+
+class TestBuildWordIndex:
+    def test_sorted_by_start(self):
+        starts, ends, texts = build_word_index(DIARIZED)
+        assert starts.tolist() == [11.0, 11.5, 13.0, 19.5]
+        assert texts == ["one", "bleed", "three", "late"]
+
+    def test_empty(self):
+        starts, ends, texts = build_word_index({})
+        assert len(starts) == 0 and texts == []
+
+
+class TestWordsInRange:
+    def test_drops_bleed_and_overhanging_words(self):
+        index = build_word_index(DIARIZED)
+        _, _, texts = index
+        assert [texts[i] for i in words_in_range(index, 10.0, 20.0)] == ["one", "three"]
+
+
+class TestLoadWordIndex:
+    def test_builds_and_caches(self, tmp_episode_dir):
+        _write(tmp_episode_dir, DIARIZED)
+        _, _, texts = load_word_index(tmp_episode_dir)
+        assert texts == ["one", "bleed", "three", "late"]
+        assert (tmp_episode_dir / "work" / INDEX_NAME).exists()
+
+        # Cached copy is served without touching the JSON again
+        (tmp_episode_dir / "diarized_transcript.json").write_text("not json")
+        cache = tmp_episode_dir / "work" / INDEX_NAME
+        future = os.stat(cache).st_mtime_ns + 10**9
+        os.utime(cache, ns=(future, future))
+        starts, _, texts = load_word_index(tmp_episode_dir)
+        assert texts == ["one", "bleed", "three", "late"]
+        assert starts.tolist() == [11.0, 11.5, 13.0, 19.5]
+
+    def test_rebuilds_when_transcript_is_newer(self, tmp_episode_dir):
+        _write(tmp_episode_dir, DIARIZED)
+        load_word_index(tmp_episode_dir)
+
+        _write(tmp_episode_dir, {"utterances": [{"words": [{"word": "edited", "start": 1.0, "end": 2.0}]}]})
+        src = tmp_episode_dir / "diarized_transcript.json"
+        future = os.stat(tmp_episode_dir / "work" / INDEX_NAME).st_mtime_ns + 10**9
+        os.utime(src, ns=(future, future))
+        _, _, texts = load_word_index(tmp_episode_dir)
+        assert texts == ["edited"]
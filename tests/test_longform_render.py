@@ -6,6 +6,7 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 from agents.longform_render import LongformRenderAgent
+from lib.transcript_index import build_word_index
 
 
 @pytest.fixture
@@ -252,3 +253,187 @@ class TestApplyEdits:
 
         # Original should be unchanged
         assert [s["start"] for s in segments] == original_starts
+
+
+class TestFilterGraph:
+    """Test _build_filter_graph renders every segment in one graph."""
+
+    def _segments(self):
+        return [
+            {"start": 10.0, "end": 20.0, "speaker": "L"},
+            {"start": 20.0, "end": 35.0, "speaker": "R"},
+            {"start": 50.0, "end": 60.0, "speaker": "BOTH"},
+        ]
+
+    def test_one_branch_per_segment(self, agent, crop_config):
+        graph = agent._build_filter_graph(
+            self._segments(), 3840, 2160, crop_config, t0=10.0
+        )
+        assert "[0:v]split=3[s0][s1][s2]" in graph
+        assert "trim=start=0.000000:end=10.000000" in graph
+        assert "trim=start=40.000000:end=50.000000" in graph
+        assert "[v0][v1][v2]concat=n=3:v=1:a=0,format=yuv420p" in graph
+        assert graph.rstrip().endswith("[aout]")
+
+    def test_audio_merges_contiguous_spans(self, agent, crop_config):
+        graph = agent._build_filter_graph(
+            self._segments(), 3840, 2160, crop_config, t0=10.0
+        )
+        # 10-35 is one span, 50-60 another
+        assert "[1:a]asplit=2" in graph
+        assert "atrim=start=0.000000:end=25.000000" in graph
+        assert "atrim=start=40.000000:end=50.000000" in graph
+
+    def test_unedited_audio_is_single_trim(self, agent, crop_config):
+        segments = self._segments()[:2]
+        graph = agent._build_filter_graph(segments, 3840, 2160, crop_config, t0=10.0)
+        assert "asplit" not in graph
+        assert "[1:a]atrim=start=0.000000:end=25.000000,asetpts=PTS-STARTPTS[aout]" in graph
+
+    def test_subtitles_after_concat(self, agent, crop_config, tmp_path):
+        srt = tmp_path / "longform.srt"
+        srt.write_text("1\n00:00:00,000 --> 00:00:01,000\nhi\n")
+        graph = agent._build_filter_graph(
+            self._segments(), 3840, 2160, crop_config, srt_path=srt, t0=10.0
+        )
+        concat_line = next(line for line in graph.splitlines() if "concat=n=3:v=1" in line)
+        assert "subtitles=" in concat_line
+
+
+class TestTimelineSrt:
+    def test_offsets_onto_output_timeline(self, agent, tmp_path):
+        diarized = {"utterances": [{"words": [
+            {"word": "a", "start": 11.0, "end": 11.5},
+            {"word": "b", "start": 52.0, "end": 52.5},
+        ]}]}
+        segments = [
+            {"start": 10.0, "end": 20.0, "speaker": "L"},
+            {"start": 50.0, "end": 60.0, "speaker": "R"},
+        ]
+        srt = tmp_path / "out.srt"
+        agent._generate_timeline_srt(build_word_index(diarized), segments, srt)
+        text = srt.read_text()
+        assert "00:00:01,000 --> 00:00:01,500\na" in text
+        # second segment starts at 10s on the output timeline
+        assert "00:00:12,000 --> 00:00:12,500\nb" in text
+
+    def test_drops_channel_bleed_and_out_of_segment_words(self, agent, tmp_path):
+        diarized = {"utterances": [
+            {"words": [
+                {"word": "early", "start": 9.5, "end": 10.2},
+                {"word": "one", "start": 11.0, "end": 12.0},
+                {"word": "three", "start": 13.0, "end": 13.5},
+            ]},
+            {"words": [{"word": "bleed", "start": 11.5, "end": 11.9}]},
+        ]}
+        srt = tmp_path / "out.srt"
+        agent._generate_timeline_srt(build_word_index(diarized), [{"start": 10.0, "end": 20.0}], srt)
+        text = srt.read_text()
+        assert "one three" in text
+        assert "bleed" not in text
+        assert "early" not in text
+
+
+class TestFilterGraphCropReuse:
+    def test_crop_filter_computed_once_per_speaker(self, agent, crop_config):
+        segments = [
+            {"start": float(i), "end": float(i + 1), "speaker": "L" if i % 2 else "R"}
+            for i in range(10)
+        ]
+        with patch.object(agent, "_get_crop_filter", wraps=agent._get_crop_filter) as crop:
+            graph = agent._build_filter_graph(segments, 3840, 2160, crop_config, "lut3d=x")
+        assert crop.call_count == 2
+        # One LUT instance on the source, ahead of the split
+        assert graph.count("lut3d=x") == 1
+        assert "[0:v]lut3d=x,split=10" in graph
+
+
+class TestExecuteRender:
+    def _setup(self, episode_dir, crop_config):
+        (episode_dir / "segments.json").write_text(json.dumps({"segments": [
+            {"start": 0.0, "end": 5.0, "speaker": "L"},
+            {"start": 5.0, "end": 9.0, "speaker": "R"},
+        ]}))
+        (episode_dir / "diarized_transcript.json").write_text(json.dumps({"utterances": []}))
+        (episode_dir / "episode.json").write_text(json.dumps({"crop_config": crop_config}))
+
+    def _probe(self):
+        return {
+            "streams": [{"codec_type": "video", "width": 3840, "height": 2160,
+                         "r_frame_rate": "30/1"}],
+            "format": {"duration": "9.0"},
+        }
+
+    def test_single_ffmpeg_call_and_stderr_on_failure(self, agent, crop_config, tmp_episode_dir):
+        import subprocess
+
+        self._setup(tmp_episode_dir, crop_config)
+        failed = subprocess.CalledProcessError(1, ["ffmpeg"], stderr="Invalid filter")
+        with patch("agents.longform_render.generate_audio_mix", return_value=None), \
+             patch("agents.longform_render.ffprobe", return_value=self._probe()), \
+             patch("agents.longform_render.stream_ffmpeg", side_effect=failed) as run:
+            with pytest.raises(subprocess.CalledProcessError) as exc:
+                agent.execute()
+
+        assert run.call_count == 1
+        cmd = run.call_args[0][0]
+        assert "-filter_complex_script" in cmd
+        assert "-nostats" in cmd
+        assert "-filter_complex_threads" in cmd
+        assert exc.value.stderr == "Invalid filter"
+
+    def test_empty_segments_raise_value_error(self, agent, crop_config, tmp_episode_dir):
+        self._setup(tmp_episode_dir, crop_config)
+        (tmp_episode_dir / "segments.json").write_text(json.dumps({"segments": []}))
+        with patch("agents.longform_render.generate_audio_mix", return_value=None), \
+             patch("agents.longform_render.ffprobe", return_value=self._probe()), \
+             patch("agents.longform_render.stream_ffmpeg") as run:
+            with pytest.raises(ValueError, match="No segments"):
+                agent.execute()
+        run.assert_not_called()
+
+    def test_reports_progress_from_ffmpeg_out_time(self, agent, crop_config, tmp_episode_dir):
+        self._setup(tmp_episode_dir, crop_config)
+        (tmp_episode_dir / "longform.mp4").write_bytes(b"\x00" * 1000)
+        seen = []
+
+        def fake_stream(cmd, agent_logger=None, on_progress=None):
+            assert cmd[cmd.index("-progress") + 1] == "pipe:2"
+            on_progress(4.6)
+            seen.append(json.loads((tmp_episode_dir / "progress.json").read_text()))
+
+        with patch("agents.longform_render.generate_audio_mix", return_value=None), \
+             patch("agents.longform_render.ffprobe", return_value=self._probe()), \
+             patch("agents.longform_render.stream_ffmpeg", side_effect=fake_stream), \
+             patch("agents.longform_render.measure_loudness", return_value=None):
+            agent.execute()
+
+        assert (seen[0]["current"], seen[0]["total"]) == (5, 9)
+
+    def test_duration_from_segments_without_reprobe(self, agent, crop_config, tmp_episode_dir):
+        self._setup(tmp_episode_dir, crop_config)
+        (tmp_episode_dir / "longform.mp4").write_bytes(b"\x00" * 1000)
+        with patch("agents.longform_render.generate_audio_mix", return_value=None), \
+             patch("agents.longform_render.ffprobe", return_value=self._probe()) as probe, \
+             patch("agents.longform_render.stream_ffmpeg"), \
+             patch("agents.longform_render.measure_loudness", return_value=None):
+            result = agent.execute()
+
+        assert probe.call_count == 1  # source only
+        assert result["duration_seconds"] == 9.0
+        assert result["segment_count"] == 2
+
+
+class TestCoalesceSegments:
+    def test_merges_contiguous_same_speaker(self, agent):
+        segments = [
+            {"start": 0.0, "end": 5.0, "speaker": "L"},
+            {"start": 5.0, "end": 8.0, "speaker": "L"},
+            {"start": 8.0, "end": 12.0, "speaker": "R"},
+            {"start": 20.0, "end": 25.0, "speaker": "R"},  # gap from a cut
+        ]
+        runs = agent._coalesce_segments(segments)
+        assert [(r["start"], r["end"], r["speaker"]) for r in runs] == [
+            (0.0, 8.0, "L"), (8.0, 12.0, "R"), (20.0, 25.0, "R"),
+        ]
+        assert segments[0]["end"] == 5.0  # input untouched
@@ -2,6 +2,7 @@
 
 import json
 import pytest
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
@@ -146,6 +147,26 @@ class TestHasNameSlug:
     def test_episode_id_with_multi_word_slug(self):
         assert _has_name_slug("ep_2026-01-01_120000_todd-laura") is True
 
+    def test_custom_episode_id_not_renamed(self):
+        assert _has_name_slug("pilot_episode") is True
+
+
+class TestIsCancelled:
+    def test_consumes_pending_cancel(self):
+        from agents.pipeline import _is_cancelled
+
+        pending = {"ep_1"}
+        with patch("agents.pipeline._cancel_set", return_value=pending):
+            assert _is_cancelled("ep_1") is True
+            assert _is_cancelled("ep_1") is False
+        assert pending == set()
+
+    def test_no_server_means_not_cancelled(self):
+        from agents.pipeline import _is_cancelled
+
+        with patch("agents.pipeline._cancel_set", return_value=None):
+            assert _is_cancelled("ep_1") is False
+
 
 class TestSaveEpisode:
     def test_save_creates_json(self, tmp_path):
@@ -169,6 +190,57 @@ class TestSaveEpisode:
         assert loaded["path"] == "/some/path"
 
 
+class TestSaveEpisodeSkipsNoOps:
+    def test_unchanged_episode_not_rewritten(self, tmp_path):
+        path = tmp_path / "episode.json"
+        data = {"episode_id": "test", "status": "processing"}
+        _save_episode(path, data)
+        inode = path.stat().st_ino
+        _save_episode(path, dict(data))
+        assert path.stat().st_ino == inode  # os.replace would swap the inode
+
+    def test_changed_episode_rewritten(self, tmp_path):
+        path = tmp_path / "episode.json"
+        _save_episode(path, {"status": "processing"})
+        _save_episode(path, {"status": "error"})
+        assert json.loads(path.read_text())["status"] == "error"
+
+    def test_external_edit_is_overwritten(self, tmp_path):
+        import os
+
+        path = tmp_path / "episode.json"
+        data = {"status": "processing"}
+        _save_episode(path, data)
+        path.write_text('{"status": "edited elsewhere"}')
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        _save_episode(path, data)
+        assert json.loads(path.read_text())["status"] == "processing"
+
+
+class TestLoadConfig:
+    def test_cached_until_file_changes(self, tmp_path):
+        import os
+        from agents import pipeline
+
+        cfg = tmp_path / "config.toml"
+        cfg.write_text('[paths]\noutput_dir = "a"\n')
+        pipeline._parse_config.cache_clear()
+        with patch("agents.pipeline.CONFIG_PATH", cfg), \
+             patch("agents.pipeline.tomllib.load", wraps=pipeline.tomllib.load) as parse:
+            first = pipeline.load_config()
+            first["paths"]["output_dir"] = "mutated"
+            assert pipeline.load_config()["paths"]["output_dir"] == "a"
+            assert parse.call_count == 1
+
+            cfg.write_text('[paths]\noutput_dir = "bb"\n')
+            st = cfg.stat()
+            os.utime(cfg, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+            assert pipeline.load_config()["paths"]["output_dir"] == "bb"
+            assert parse.call_count == 2
+        pipeline._parse_config.cache_clear()
+
+
 class TestAgentRegistry:
     def test_all_pipeline_agents_registered(self):
         for name in PIPELINE_ORDER:
@@ -327,3 +399,113 @@ class TestPipelineNonCriticalFailure:
         # Pipeline should complete (not error) because thumbnail_gen is non-critical
         assert result["status"] == "ready_for_review"
         assert "thumbnail_gen" in result["pipeline"].get("errors", {})
+
+
+class TestPipelineEpisodeWrites:
+    """episode.json is rewritten once per state change, not once per agent start."""
+
+    def _mock_agents(self, fail=None):
+        mock_agents = {}
+        for name in PIPELINE_ORDER:
+            mock_cls = MagicMock()
+            mock_instance = MagicMock()
+            if name == fail:
+                mock_instance.run.side_effect = RuntimeError("boom")
+            else:
+                mock_instance.run.return_value = {}
+            mock_cls.return_value = mock_instance
+            mock_agents[name] = mock_cls
+        return mock_agents
+
+    def _episode(self, episodes_dir):
+        ep_id = "ep_2026-01-01_120000"
+        ep_dir = episodes_dir / ep_id
+        ep_dir.mkdir(parents=True)
+        (ep_dir / "episode.json").write_text(json.dumps({
+            "episode_id": ep_id,
+            "status": "processing",
+            "crop_config": {"speaker_l_center_x": 480},
+            "pipeline": {"agents_completed": []},
+        }))
+        return ep_id
+
+    @patch("agents.pipeline._is_cancelled", return_value=False)
+    @patch("agents.pipeline.load_config")
+    def test_agents_ready_together_share_one_write(self, mock_config, mock_cancel, tmp_path):
+        mock_config.return_value = {"paths": {"output_dir": str(tmp_path)}, "processing": {}}
+        from agents.pipeline import run_pipeline
+
+        ep_id = self._episode(tmp_path)
+        with patch("agents.pipeline.resolve_path", return_value=tmp_path), \
+             patch.dict("agents.pipeline.AGENT_REGISTRY", self._mock_agents()), \
+             patch("agents.pipeline._save_episode", wraps=_save_episode) as save:
+            result = run_pipeline(
+                source_path="/fake/source",
+                agents=["stitch", "audio_analysis", "transcribe"],
+                episode_id=ep_id,
+            )
+
+        assert result["status"] == "ready_for_review"
+        # initial + stitch start/done + one write for both starts + 2 done + final
+        assert save.call_count == 7
+
+    @patch("agents.pipeline._is_cancelled", return_value=False)
+    @patch("agents.pipeline.load_config")
+    def test_critical_failure_saved_once(self, mock_config, mock_cancel, tmp_path):
+        mock_config.return_value = {"paths": {"output_dir": str(tmp_path)}, "processing": {}}
+        from agents.pipeline import run_pipeline
+
+        ep_id = self._episode(tmp_path)
+        with patch("agents.pipeline.resolve_path", return_value=tmp_path), \
+             patch.dict("agents.pipeline.AGENT_REGISTRY", self._mock_agents(fail="stitch")), \
+             patch("agents.pipeline._save_episode", wraps=_save_episode) as save:
+            result = run_pipeline(
+                source_path="/fake/source", agents=["stitch"], episode_id=ep_id
+            )
+
+        assert result["status"] == "error"
+        assert save.call_count == 3  # initial + stitch start + failure
+        on_disk = json.loads((tmp_path / ep_id / "episode.json").read_text())
+        assert on_disk["status"] == "error"
+        assert on_disk["pipeline"]["errors"]["stitch"] == "boom"
+
+    @patch("agents.pipeline._is_cancelled", return_value=False)
+    @patch("agents.pipeline.load_config")
+    def test_clip_miner_updates_merged_without_reread(self, mock_config, mock_cancel, tmp_path):
+        mock_config.return_value = {"paths": {"output_dir": str(tmp_path)}, "processing": {}}
+        from agents.pipeline import run_pipeline
+
+        ep_id = self._episode(tmp_path)
+        agents = self._mock_agents()
+        agents["clip_miner"].return_value.run.return_value = {
+            "clips": [],
+            "guest_name": "Jane Doe",
+            "episode_name": "Hello",
+            "model_used": "not-merged",
+        }
+        with patch("agents.pipeline.resolve_path", return_value=tmp_path), \
+             patch.dict("agents.pipeline.AGENT_REGISTRY", agents):
+            result = run_pipeline(
+                source_path="/fake/source", agents=["clip_miner"], episode_id=ep_id
+            )
+
+        new_id = f"{ep_id}_jane-doe"
+        assert result["episode_id"] == new_id
+        on_disk = json.loads((tmp_path / new_id / "episode.json").read_text())
+        assert on_disk["guest_name"] == "Jane Doe"
+        assert on_disk["episode_name"] == "Hello"
+        assert "model_used" not in on_disk
+
+    @patch("agents.pipeline._is_cancelled", return_value=False)
+    @patch("agents.pipeline.load_config")
+    def test_new_episode_timestamps_agree(self, mock_config, mock_cancel, tmp_path):
+        mock_config.return_value = {"paths": {"output_dir": str(tmp_path)}, "processing": {}}
+        from agents.pipeline import run_pipeline
+
+        with patch("agents.pipeline.resolve_path", return_value=tmp_path), \
+             patch.dict("agents.pipeline.AGENT_REGISTRY", self._mock_agents()):
+            result = run_pipeline(source_path="/fake/source", agents=["ingest"])
+
+        assert result["created_at"] == result["pipeline"]["started_at"]
+        created = datetime.fromisoformat(result["created_at"])
+        assert result["episode_id"] == created.strftime("ep_%Y-%m-%d_%H%M%S")
@@ -106,3 +106,50 @@ class TestRunSingleAgent:
         client, _ = test_client
         resp = client.post("/api/episodes/nonexistent/run-agent/ingest", json={})
         assert resp.status_code == 404
+
+
+class TestCheckUploadUrls:
+    def test_status_checks_share_one_client(self, test_client, monkeypatch):
+        from unittest.mock import MagicMock, patch
+
+        client, episodes_dir = test_client
+        _create_episode(episodes_dir, "ep_001")
+        (episodes_dir / "ep_001" / "publish.json").write_text(json.dumps({
+            "longform": {"status": "submitted", "request_id": "lf"},
+            "shorts": [
+                {"clip_id": "clip_01", "status": "submitted", "request_id": "c1"},
+                {"clip_id": "clip_02", "status": "submitted", "request_id": "c2"},
+            ],
+        }))
+        monkeypatch.setenv("UPLOAD_POST_API_KEY", "k")
+
+        created = []
+
+        class FakeClient:
+            def __init__(self, **kwargs):
+                self.kwargs = kwargs
+                self.requested = []
+                created.append(self)
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def get(self, url, params):
+                self.requested.append(params["request_id"])
+                resp = MagicMock()
+                resp.json.return_value = {"video_url": "https://yt/" + params["request_id"]}
+                return resp
+
+        with patch("httpx.AsyncClient", FakeClient):
+            resp = client.post("/api/episodes/ep_001/check-upload-urls")
+
+        assert resp.status_code == 200
+        assert len(created) == 1
+        assert created[0].requested == ["lf", "c1", "c2"]
+        assert created[0].kwargs["headers"] == {"Authorization": "Apikey k"}
+        data = resp.json()
+        assert data["longform"] == {"status": "live", "url": "https://yt/lf"}
+        assert [s["url"] for s in data["shorts"]] == ["https://yt/c1", "https://yt/c2"]